@@ -0,0 +1,8 @@
+"""Allow ``python -m crypto``."""
+
+import sys
+
+from crypto.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
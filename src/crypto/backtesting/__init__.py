@@ -1,5 +1,32 @@
 """Backtesting utilities."""
 
-from .service import BacktestingService, BacktestResult, Trade
+from .montecarlo import MonteCarloResult, run_monte_carlo
+from .precision import PrecisionReport, validate_compact
+from .resumable import BacktestCheckpoint, ResumableBacktest
+from .service import (
+    BacktestingService,
+    BacktestResult,
+    PortfolioBacktestResult,
+)
+from .sweep import parameter_grid, run_sweep
+from .trades import Trade, TradeLog
+from .walkforward import WalkForwardResult, run_walk_forward, walk_forward_windows
 
-__all__ = ["BacktestingService", "BacktestResult", "Trade"]
+__all__ = [
+    "BacktestCheckpoint",
+    "BacktestingService",
+    "BacktestResult",
+    "MonteCarloResult",
+    "PortfolioBacktestResult",
+    "PrecisionReport",
+    "ResumableBacktest",
+    "Trade",
+    "TradeLog",
+    "WalkForwardResult",
+    "parameter_grid",
+    "run_monte_carlo",
+    "run_sweep",
+    "run_walk_forward",
+    "validate_compact",
+    "walk_forward_windows",
+]
@@ -0,0 +1,122 @@
+"""Monte Carlo resampling of backtest returns."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .service import BacktestResult
+
+METHODS = ("bootstrap", "permutation")
+SOURCES = ("trades", "equity")
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+@dataclass
+class MonteCarloResult:
+    total_return: np.ndarray
+    max_drawdown: np.ndarray
+    sharpe: np.ndarray
+
+    def percentiles(self, q: Sequence[float] = DEFAULT_PERCENTILES) -> pd.DataFrame:
+        """One row per metric, one column per percentile in ``q``."""
+        metrics = {
+            "total_return": self.total_return,
+            "max_drawdown": self.max_drawdown,
+            "sharpe": self.sharpe,
+        }
+        return pd.DataFrame(
+            {name: np.percentile(values, q) for name, values in metrics.items()},
+            index=pd.Index(q, name="percentile"),
+        ).T
+
+
+def trade_returns(result: BacktestResult, initial_balance: float) -> np.ndarray:
+    """Net return of every trade in ``result``, fees and slippage included.
+
+    The strategy is flat between trades, so the balance at each exit divided
+    by the balance at the previous exit is the trade's net growth.
+    """
+    trades = result.trades
+    if not len(trades):
+        return np.empty(0)
+    balances = result.equity_curve.reindex(trades.exit_time).to_numpy(dtype=float)
+    previous = np.concatenate(([initial_balance], balances[:-1]))
+    return balances / previous - 1
+
+
+def equity_returns(result: BacktestResult) -> np.ndarray:
+    """Bar-to-bar returns of the equity curve."""
+    return result.equity_curve.pct_change().to_numpy()[1:]
+
+
+def run_monte_carlo(
+    returns: BacktestResult | Sequence[float] | np.ndarray,
+    n_paths: int = 10_000,
+    method: str = "bootstrap",
+    source: str = "trades",
+    initial_balance: float = 1000.0,
+    seed: Optional[int] = None,
+    max_memory: int = 256 * 2 ** 20,
+) -> MonteCarloResult:
+    """Resample ``returns`` into ``n_paths`` alternative return sequences.
+
+    ``returns`` is either a :class:`BacktestResult`, reduced to its
+    per-trade or per-bar returns according to ``source``, or an array of
+    returns. ``"bootstrap"`` draws every step with replacement;
+    ``"permutation"`` shuffles the observed order, which keeps the total
+    return and varies only the path, i.e. the drawdown.
+
+    Paths are evaluated as 2-D ``(paths, steps)`` arrays in chunks of at
+    most ``max_memory`` bytes per intermediate. Sharpe ratios are annualized
+    with ``sqrt(252)`` like :class:`BacktestResult` for equity returns and
+    left per trade for trade returns.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown Monte Carlo method: {method!r}")
+    if isinstance(returns, BacktestResult):
+        if source not in SOURCES:
+            raise ValueError(f"Unknown return source: {source!r}")
+        annualize = source == "equity"
+        returns = (
+            equity_returns(returns) if annualize
+            else trade_returns(returns, initial_balance)
+        )
+    else:
+        annualize = False
+    log_growth = np.log1p(np.asarray(returns, dtype=np.float64))
+    steps = len(log_growth)
+    if steps == 0:
+        raise ValueError("No returns to resample")
+
+    rng = np.random.default_rng(seed)
+    chunk = max(1, max_memory // (8 * steps))
+    total_return = np.empty(n_paths)
+    max_drawdown = np.empty(n_paths)
+    sharpe = np.empty(n_paths)
+    for lo in range(0, n_paths, chunk):
+        hi = min(lo + chunk, n_paths)
+        if method == "bootstrap":
+            paths = log_growth[rng.integers(0, steps, (hi - lo, steps))]
+        else:
+            paths = rng.permuted(np.broadcast_to(log_growth, (hi - lo, steps)), axis=1)
+
+        step_returns = np.expm1(paths)
+        mean = step_returns.mean(axis=1)
+        std = step_returns.std(axis=1, ddof=1) if steps > 1 else np.zeros(hi - lo)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe[lo:hi] = np.where(std > 0, mean / std, 0.0)
+
+        # Work in log space so the running peak and drawdown reuse one buffer
+        np.cumsum(paths, axis=1, out=paths)
+        total_return[lo:hi] = np.expm1(paths[:, -1])
+        peak = np.maximum.accumulate(np.maximum(paths, 0.0), axis=1)
+        np.subtract(paths, peak, out=paths)
+        max_drawdown[lo:hi] = np.expm1(paths.min(axis=1))
+
+    if annualize:
+        sharpe *= np.sqrt(252)
+    return MonteCarloResult(total_return, max_drawdown, sharpe)
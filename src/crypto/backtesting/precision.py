@@ -0,0 +1,103 @@
+"""Checks that compact float32 bars reproduce float64 backtests."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from crypto.data.history import COMPACT_DTYPES, compact_ohlcv
+from crypto.strategy.engine import GalaxyScore
+from .service import BacktestingService
+
+# Largest RSI difference accepted, in RSI points (0-100 scale)
+RSI_TOLERANCE = 0.01
+# Largest relative difference accepted for each metric
+METRIC_TOLERANCE = 1e-4
+PRECISION_METRICS = (
+    "total_return",
+    "sharpe",
+    "max_drawdown",
+    "volatility",
+    "win_rate",
+    "profit_factor",
+)
+
+
+def _relative_error(reference: float, value: float) -> float:
+    if reference == value:
+        return 0.0
+    if not np.isfinite(reference) or not np.isfinite(value):
+        return np.inf
+    return abs(value - reference) / (abs(reference) or 1.0)
+
+
+@dataclass
+class PrecisionReport:
+    rsi_error: float  # largest absolute RSI difference
+    signal_mismatches: int  # bars whose signal differs
+    trades: int  # trades of the float64 run
+    compact_trades: int
+    metric_errors: Dict[str, float]  # relative difference per metric
+
+    def within(
+        self, rsi_tolerance: float = RSI_TOLERANCE, metric_tolerance: float = METRIC_TOLERANCE
+    ) -> bool:
+        return self.rsi_error <= rsi_tolerance and all(
+            e <= metric_tolerance for e in self.metric_errors.values()
+        )
+
+
+def compare_precision(
+    df: pd.DataFrame,
+    engine,
+    galaxy_score: GalaxyScore = 0.0,
+    service: Optional[BacktestingService] = None,
+) -> PrecisionReport:
+    """Run ``engine`` on ``df`` as float64 and as compact float32 bars."""
+    service = service or BacktestingService()
+    full = df.astype({c: np.float64 for c in COMPACT_DTYPES if c in df.columns})
+    compact = compact_ohlcv(df)
+    signals = engine.generate_signal_series(full, galaxy_score)
+    compact_signals = engine.generate_signal_series(compact, galaxy_score)
+    reference = service.run_backtest(full, engine, galaxy_score)
+    result = service.run_backtest(compact, engine, galaxy_score)
+
+    return PrecisionReport(
+        rsi_error=float(np.nanmax(np.abs(signals["rsi"] - compact_signals["rsi"]), initial=0.0)),
+        signal_mismatches=int((signals["signal"].to_numpy() != compact_signals["signal"].to_numpy()).sum()),
+        trades=len(reference.trades),
+        compact_trades=len(result.trades),
+        metric_errors={
+            m: _relative_error(float(getattr(reference, m)), float(getattr(result, m)))
+            for m in PRECISION_METRICS
+        },
+    )
+
+
+def validate_compact(
+    df: pd.DataFrame,
+    engine,
+    galaxy_score: GalaxyScore = 0.0,
+    service: Optional[BacktestingService] = None,
+    rsi_tolerance: float = RSI_TOLERANCE,
+    metric_tolerance: float = METRIC_TOLERANCE,
+) -> PrecisionReport:
+    """Check that compact bars keep ``engine``'s results within tolerance.
+
+    Raises ValueError when the RSI moves by more than ``rsi_tolerance``
+    points or any metric by more than ``metric_tolerance`` relative to the
+    float64 run. An RSI sitting within rounding of a threshold can flip a
+    signal and with it whole trades; such data should stay float64.
+    """
+    report = compare_precision(df, engine, galaxy_score, service)
+    if not report.within(rsi_tolerance, metric_tolerance):
+        worst = max(report.metric_errors, key=report.metric_errors.get)
+        raise ValueError(
+            f"Compact bars exceed tolerance: RSI off by {report.rsi_error:.2g}, "
+            f"{worst} off by {report.metric_errors[worst]:.2g}, "
+            f"{report.signal_mismatches} signals changed"
+        )
+    return report
@@ -0,0 +1,230 @@
+"""Backtests that can be continued bar by bar instead of rerun."""
+
+from __future__ import annotations
+
+import math
+import pickle
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from crypto.strategy.engine import IncrementalStrategyEngine, align_galaxy_score
+from .service import BacktestingService, BacktestResult
+from .trades import EXIT_REASONS, TradeLog
+
+_END_OF_DATA = EXIT_REASONS.index("end_of_data")
+
+
+def _append(buffer: np.ndarray, used: int, values: np.ndarray) -> np.ndarray:
+    """Write ``values`` after the first ``used`` slots, growing geometrically."""
+    needed = used + len(values)
+    if needed > len(buffer):
+        grown = np.empty(max(needed, 2 * len(buffer), 64), dtype=buffer.dtype)
+        grown[:used] = buffer[:used]
+        buffer = grown
+    buffer[used:needed] = values
+    return buffer
+
+
+@dataclass
+class BacktestCheckpoint:
+    """Everything :class:`ResumableBacktest` needs to continue a run."""
+
+    fee: float
+    slippage: float
+    galaxy_score: float | pd.Series
+    initial_balance: float
+    max_curve: Optional[int]
+    engine: IncrementalStrategyEngine
+    balance: float
+    position: float = 0.0
+    entry_price: float = 0.0
+    entry_bar: int = -1
+    # Open times (epoch ns) of every bar seen; bar numbers index into it
+    bars: int = 0
+    times: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    # Equity from bar ``rsi_period`` on, of which the last ``curve`` points
+    # before ``curve_end`` are kept; the final point is marked to market
+    curve_end: int = 0
+    curve: int = 0
+    equity: np.ndarray = field(default_factory=lambda: np.empty(0))
+    # (entry_bar, exit_bar, entry_price, exit_price) of closed trades
+    trades: List[Tuple[int, int, float, float]] = field(default_factory=list)
+    # Running return and drawdown statistics of all but the final point
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    peak: float = -math.inf
+    max_drawdown: float = 0.0
+    previous: float = math.nan
+
+
+class ResumableBacktest:
+    """Long-only backtest that advances by new bars instead of rerunning.
+
+    Signals come from an :class:`IncrementalStrategyEngine`, so each bar
+    costs O(1) however long the history is. The simulation follows
+    :meth:`BacktestingService.run_backtest` step for step, and the return,
+    volatility, Sharpe and drawdown statistics are kept as running sums
+    rather than recomputed from the equity curve.
+
+    :attr:`result` is what a full rerun over every bar seen so far reports,
+    so an open position is shown closed at the last close. That close is
+    provisional: :meth:`extend` continues with the position still open.
+    ``max_curve`` keeps only the most recent equity points in memory; the
+    metrics still cover the whole run. ``galaxy_score`` is a constant or a
+    time series of observations, as-of joined to each batch of new bars;
+    assign a longer series to ``state.galaxy_score`` as observations arrive.
+    """
+
+    def __init__(
+        self,
+        service: BacktestingService,
+        engine,
+        galaxy_score: float | pd.Series = 0.0,
+        initial_balance: float = 1000.0,
+        max_curve: Optional[int] = None,
+    ) -> None:
+        self.state = BacktestCheckpoint(
+            fee=service.fee,
+            slippage=service.slippage,
+            galaxy_score=galaxy_score,
+            initial_balance=initial_balance,
+            max_curve=max_curve,
+            engine=IncrementalStrategyEngine(engine.config),
+            balance=initial_balance,
+        )
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint: BacktestCheckpoint) -> "ResumableBacktest":
+        self = cls.__new__(cls)
+        self.state = checkpoint
+        return self
+
+    def checkpoint(self) -> BacktestCheckpoint:
+        return self.state
+
+    def save(self, path: Path) -> None:
+        from crypto.data.store import _atomic_write
+
+        payload = pickle.dumps(self.state)
+        _atomic_write(Path(path), lambda p: p.write_bytes(payload))
+
+    @classmethod
+    def load(cls, path: Path) -> "ResumableBacktest":
+        return cls.from_checkpoint(pickle.loads(Path(path).read_bytes()))
+
+    def _confirm(self, value: float) -> None:
+        """Fold a point that is no longer the final one into the statistics."""
+        s = self.state
+        ret = 0.0 if s.count == 0 else value / s.previous - 1
+        s.count += 1
+        delta = ret - s.mean
+        s.mean += delta / s.count
+        s.m2 += delta * (ret - s.mean)
+        s.peak = max(s.peak, value)
+        s.max_drawdown = min(s.max_drawdown, value / s.peak - 1)
+        s.previous = value
+
+    def extend(self, bars: pd.DataFrame) -> Optional[BacktestResult]:
+        """Advance by ``bars``, which must all be newer than the last bar.
+
+        Returns the updated :attr:`result`, or None until more bars than
+        the RSI period have been seen.
+        """
+        s = self.state
+        times = pd.DatetimeIndex(bars.index).asi8
+        if len(times) and s.bars and times[0] <= s.times[s.bars - 1]:
+            raise ValueError("New bars must start after the last processed bar")
+        start_idx = s.engine.config.rsi_period
+        scores = np.broadcast_to(align_galaxy_score(s.galaxy_score, bars.index), len(times))
+        equity = np.empty(len(times))
+        points = 0
+        for price, score in zip(bars["close"].to_numpy(dtype=float), scores):
+            signal = s.engine.update(price, float(score))["signal"]
+            bar = s.bars
+            s.bars += 1
+            if bar < start_idx:
+                continue
+
+            if signal == "buy" and s.position == 0:
+                s.entry_price = price * (1 + s.slippage)
+                s.position = s.balance / s.entry_price
+                s.balance -= s.position * s.entry_price * (1 + s.fee)
+                s.entry_bar = bar
+            elif signal == "sell" and s.position > 0:
+                exit_price = price * (1 - s.slippage)
+                s.balance += s.position * exit_price * (1 - s.fee)
+                s.trades.append((s.entry_bar, bar, s.entry_price, exit_price))
+                s.position = 0.0
+
+            if s.curve_end or points:
+                self._confirm(equity[points - 1] if points else s.equity[s.curve_end - 1])
+            equity[points] = s.balance + s.position * price
+            points += 1
+
+        s.times = _append(s.times, s.bars - len(times), times)
+        s.equity = _append(s.equity, s.curve_end, equity[:points])
+        s.curve_end += points
+        s.curve += points
+        if s.max_curve is not None and s.curve > s.max_curve:
+            s.curve = s.max_curve
+            if s.curve_end > 2 * s.max_curve:
+                # Compact so the kept tail stays bounded
+                s.equity[:s.curve] = s.equity[s.curve_end - s.curve:s.curve_end]
+                s.curve_end = s.curve
+        return self.result if s.curve_end else None
+
+    @property
+    def result(self) -> BacktestResult:
+        s = self.state
+        if not s.curve_end:
+            raise ValueError(
+                f"Insufficient data: need at least {s.engine.config.rsi_period} periods for RSI"
+            )
+        index = pd.DatetimeIndex(s.times[:s.bars].view("datetime64[ns]"))
+        equity = s.equity[s.curve_end - s.curve:s.curve_end].copy()
+        entry_bar, exit_bar, entry_price, exit_price = (
+            list(column) for column in zip(*s.trades)
+        ) if s.trades else ([], [], [], [])
+        reasons = [0] * len(s.trades)
+        if s.position > 0:
+            # A full run ending here closes the position at the last close
+            last_close = s.engine.last_close
+            equity[-1] = s.balance + s.position * last_close * (1 - s.fee)
+            entry_bar.append(s.entry_bar)
+            exit_bar.append(s.bars - 1)
+            entry_price.append(s.entry_price)
+            exit_price.append(last_close)
+            reasons.append(_END_OF_DATA)
+        trades = TradeLog.from_arrays(
+            index, entry_bar, exit_bar, entry_price, exit_price, np.asarray(reasons, dtype=np.int8)
+        )
+
+        # Fold the final point into copies of the running statistics
+        value = float(equity[-1])
+        ret = 0.0 if s.count == 0 else value / s.previous - 1
+        count = s.count + 1
+        delta = ret - s.mean
+        mean = s.mean + delta / count
+        m2 = s.m2 + delta * (ret - mean)
+        std = math.sqrt(m2 / (count - 1)) if count > 1 else math.nan
+        max_dd = min(s.max_drawdown, value / max(s.peak, value) - 1)
+        total_return = (value - s.initial_balance) / s.initial_balance
+
+        return BacktestResult(
+            sharpe=mean / std * np.sqrt(252) if std > 0 else 0.0,
+            max_drawdown=float(max_dd),
+            win_rate=trades.win_rate,
+            total_return=total_return,
+            volatility=std * np.sqrt(252),
+            calmar_ratio=total_return / abs(max_dd) if max_dd < 0 else np.inf,
+            trades=trades,
+            equity_curve=pd.Series(equity, index=index[s.bars - s.curve:]),
+            profit_factor=trades.profit_factor,
+            expectancy=trades.expectancy,
+            average_hold=trades.average_hold,
+        )
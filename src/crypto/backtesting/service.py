@@ -1,18 +1,13 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List
+from typing import Any, Dict, List, Mapping, Optional
 
 import numpy as np
 import pandas as pd
 
-
-@dataclass
-class Trade:
-    entry_time: pd.Timestamp
-    exit_time: pd.Timestamp
-    entry_price: float
-    exit_price: float
-    profit_pct: float
+from crypto.monitoring.metrics import timed
+from crypto.strategy.engine import GalaxyScore, align_galaxy_score
+from .trades import EXIT_REASONS, Trade, TradeLog
 
 
 @dataclass
@@ -23,8 +18,18 @@ class BacktestResult:
     total_return: float
     volatility: float
     calmar_ratio: float
-    trades: List[Trade]
+    trades: TradeLog
     equity_curve: pd.Series
+    profit_factor: float = 0.0
+    expectancy: float = 0.0
+    average_hold: Optional[Any] = None
+
+
+@dataclass
+class PortfolioBacktestResult:
+    portfolio: BacktestResult
+    trades: Dict[str, TradeLog]
+    allocations: pd.Series
 
 
 class BacktestingService:
@@ -32,32 +37,74 @@ class BacktestingService:
         self.fee = fee
         self.slippage = slippage
 
+    @timed("backtesting.run_backtest")
     def run_backtest(
         self,
         df: pd.DataFrame,
         engine,
-        galaxy_score: float = 0.0,
+        galaxy_score: GalaxyScore = 0.0,
         initial_balance: float = 1000.0,
+        vectorized: bool = True,
+        risk_manager=None,
     ) -> BacktestResult:
+        """Simulate ``engine`` over ``df``.
+
+        Engines exposing ``generate_signal_series`` are evaluated once over the
+        whole frame and simulated with array operations; otherwise (or when
+        ``vectorized`` is False) ``generate_signals`` is called per bar.
+
+        With a ``risk_manager`` every open position is also closed intrabar
+        when the bar's ``low``/``high`` reaches its stop-loss or take-profit
+        level; see :meth:`_risk_exits`.
+
+        ``galaxy_score`` is a constant or varies per bar: an array with one
+        value per row of ``df`` or a time series of observations, which is
+        as-of joined to the bars once up front (see
+        :func:`~crypto.strategy.engine.align_galaxy_score`).
+        """
+        galaxy_score = align_galaxy_score(galaxy_score, df.index)
         rsi_period = getattr(getattr(engine, "config", None), "rsi_period", 14)
         if len(df) < rsi_period:
             raise ValueError(
                 f"Insufficient data: need at least {rsi_period} periods for RSI"
             )
 
+        # Start processing from when we have enough data for indicators
+        start_idx = rsi_period
+
+        if risk_manager is not None:
+            equity_series, trades = self._run_with_risk(
+                df, engine, galaxy_score, initial_balance, start_idx,
+                risk_manager, vectorized,
+            )
+        elif vectorized and hasattr(engine, "generate_signal_series"):
+            equity_series, trades = self._run_vectorized(
+                df, engine, galaxy_score, initial_balance, start_idx
+            )
+        else:
+            equity_series, trades = self._run_per_bar(
+                df, engine, galaxy_score, initial_balance, start_idx
+            )
+        return self._compute_result(equity_series, trades, initial_balance)
+
+    def _run_per_bar(
+        self,
+        df: pd.DataFrame,
+        engine,
+        galaxy_score: float | np.ndarray,
+        initial_balance: float,
+        start_idx: int,
+    ) -> tuple[pd.Series, TradeLog]:
         balance = initial_balance
         position = 0.0
         entry_price = 0.0
         equity_curve = []
         trades: List[Trade] = []
 
-        # Start processing from when we have enough data for indicators
-        start_idx = rsi_period
-        
         for i in range(start_idx, len(df)):
             # Use expanding window from start to current index
             window_data = df.iloc[:i + 1]
-            signal_data = engine.generate_signals(window_data, galaxy_score)
+            signal_data = engine.generate_signals(window_data, _score_at(galaxy_score, i))
             price = float(df.iloc[i]["close"])
             idx = df.index[i]
 
@@ -96,13 +143,322 @@ class BacktestingService:
                     entry_price=entry_price,
                     exit_price=exit_price,
                     profit_pct=profit_pct,
+                    exit_reason="end_of_data",
                 )
             )
             position = 0.0
             equity_curve[-1] = balance
 
         # Create equity series with correct index
-        equity_series = pd.Series(equity_curve, index=df.index[start_idx:])
+        return (
+            pd.Series(equity_curve, index=df.index[start_idx:]),
+            TradeLog.from_trades(trades, df.index),
+        )
+
+    def _run_vectorized(
+        self,
+        df: pd.DataFrame,
+        engine,
+        galaxy_score: float | np.ndarray,
+        initial_balance: float,
+        start_idx: int,
+    ) -> tuple[pd.Series, TradeLog]:
+        signals = engine.generate_signal_series(df, galaxy_score)["signal"].to_numpy()
+        close = df["close"].to_numpy(dtype=float)
+        entries, exits = _signal_transitions(signals[start_idx:])
+        return self._simulate(
+            df.index, close, entries + start_idx, exits + start_idx,
+            initial_balance, start_idx,
+        )
+
+    def _run_with_risk(
+        self,
+        df: pd.DataFrame,
+        engine,
+        galaxy_score: float | np.ndarray,
+        initial_balance: float,
+        start_idx: int,
+        risk_manager,
+        vectorized: bool,
+    ) -> tuple[pd.Series, TradeLog]:
+        if vectorized and hasattr(engine, "generate_signal_series"):
+            signals = engine.generate_signal_series(df, galaxy_score)["signal"].to_numpy()
+        else:
+            signals = np.full(len(df), None, dtype=object)
+            for i in range(start_idx, len(df)):
+                signals[i] = engine.generate_signals(
+                    df.iloc[:i + 1], _score_at(galaxy_score, i)
+                )["signal"]
+
+        close = df["close"].to_numpy(dtype=float)
+        entries, exits, levels, reasons = self._risk_exits(
+            df, close, signals, start_idx, risk_manager
+        )
+        return self._simulate(
+            df.index, close, entries, exits, initial_balance, start_idx,
+            exit_levels=levels, exit_reasons=reasons,
+        )
+
+    def _risk_exits(
+        self,
+        df: pd.DataFrame,
+        close: np.ndarray,
+        signals: np.ndarray,
+        start_idx: int,
+        risk_manager,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, List[str]]:
+        """Find entries and exits when positions carry a stop and a target.
+
+        A position opened at the close of bar ``e`` is checked from bar
+        ``e + 1`` on. It exits at the first bar whose ``low`` reaches the stop
+        or whose ``high`` reaches the take-profit, or at the close of the next
+        "sell" signal, whichever comes first. If both levels are hit in one
+        bar the stop is assumed to have filled first, and a bar that opens
+        beyond a level fills at the open. The next entry is looked up from a
+        precomputed next-"buy" index and each first hit is found by scanning
+        array slices of growing size, so the work is linear in the number of
+        bars with one Python iteration per trade.
+        """
+        n = len(close)
+        high = df["high"].to_numpy(dtype=float) if "high" in df else close
+        low = df["low"].to_numpy(dtype=float) if "low" in df else close
+        open_ = df["open"].to_numpy(dtype=float) if "open" in df else None
+        next_buy = _next_true(signals == "buy")
+        next_sell = _next_true(signals == "sell")
+
+        entries, exits, levels, reasons = [], [], [], []
+        i = start_idx
+        while i < n and next_buy[i] < n:
+            entry = next_buy[i]
+            entry_price = close[entry] * (1 + self.slippage)
+            stop = risk_manager.stop_loss_price(entry_price)
+            target = risk_manager.take_profit_price(entry_price)
+            sell = next_sell[entry + 1]
+            hit = _first_hit(low, high, stop, target, entry + 1, min(sell + 1, n))
+
+            entries.append(entry)
+            if hit is not None:
+                if low[hit] <= stop:
+                    level = stop if open_ is None else min(open_[hit], stop)
+                    reasons.append("stop_loss")
+                else:
+                    level = target if open_ is None else max(open_[hit], target)
+                    reasons.append("take_profit")
+                exits.append(hit)
+                levels.append(level)
+                # Intrabar exits leave the bar's close free for a new entry
+                i = hit
+            elif sell < n:
+                exits.append(sell)
+                levels.append(close[sell])
+                reasons.append("signal")
+                i = sell + 1
+            else:
+                break
+
+        return (
+            np.asarray(entries, dtype=int),
+            np.asarray(exits, dtype=int),
+            np.asarray(levels, dtype=float),
+            reasons,
+        )
+
+    def _simulate(
+        self,
+        index: pd.Index,
+        close: np.ndarray,
+        entries: np.ndarray,
+        exits: np.ndarray,
+        initial_balance: float,
+        start_idx: int,
+        exit_levels: np.ndarray | None = None,
+        exit_reasons: List[str] | None = None,
+    ) -> tuple[pd.Series, TradeLog]:
+        """Build the equity curve for a set of entry/exit bars.
+
+        Trades exit at the close unless ``exit_levels`` gives another price
+        for that exit (before slippage). Only the per-trade cash bookkeeping is
+        a Python loop; the equity of the bars in between is filled with
+        slices. The arithmetic mirrors :meth:`_run_per_bar` operation for
+        operation so both give identical floats.
+        """
+        is_open = len(entries) > len(exits)
+        entry_prices = close[entries] * (1 + self.slippage)
+        levels = close[exits] if exit_levels is None else exit_levels
+        exit_prices = levels * (1 - self.slippage)
+        exit_bars = exits
+        reasons = ["signal"] * len(exits) if exit_reasons is None else list(exit_reasons)
+        if is_open:
+            # Handle any open position at the end
+            exit_prices = np.append(exit_prices, close[-1])
+            exit_bars = np.append(exits, len(close) - 1)
+            reasons.append("end_of_data")
+
+        equity = np.empty(len(close) - start_idx)
+        balance = initial_balance
+        cursor = start_idx
+        for n, entry in enumerate(entries):
+            equity[cursor - start_idx:entry - start_idx] = balance
+
+            entry_price = entry_prices[n]
+            position = balance / entry_price
+            balance -= position * entry_price * (1 + self.fee)
+            stop = len(close) if n >= len(exits) else exits[n]
+            equity[entry - start_idx:stop - start_idx] = balance + position * close[entry:stop]
+
+            balance += position * exit_prices[n] * (1 - self.fee)
+            if n >= len(exits):
+                equity[-1] = balance
+                cursor = len(close)
+            else:
+                equity[stop - start_idx] = balance
+                cursor = stop + 1
+
+        equity[cursor - start_idx:] = balance
+        trades = TradeLog.from_arrays(
+            index, entries, exit_bars, entry_prices, exit_prices, reasons
+        )
+        return pd.Series(equity, index=index[start_idx:]), trades
+
+    def run_portfolio_backtest(
+        self,
+        closes: pd.DataFrame,
+        engine,
+        risk_manager,
+        galaxy_score: GalaxyScore | Mapping[str, GalaxyScore] = 0.0,
+        initial_balance: float = 1000.0,
+        symbol_chunk: int = 16,
+    ) -> PortfolioBacktestResult:
+        """Backtest a time x symbol panel of closes as one portfolio.
+
+        Each symbol trades its own sleeve of capital, sized with
+        ``risk_manager.position_size`` on the first tradable bar and scaled
+        down if the sleeves would exceed ``initial_balance``. A sleeve follows
+        the same rules as :meth:`run_backtest` and compounds its own P&L;
+        unallocated capital stays in cash. ``galaxy_score`` applies to every
+        symbol or is a mapping by column, constant or per bar. Signals come from
+        ``engine.generate_signal_panel`` and the simulation runs on 2-D
+        arrays, ``symbol_chunk`` columns at a time so intermediate memory is
+        bounded by ``len(closes) * symbol_chunk``.
+        """
+        rsi_period = getattr(getattr(engine, "config", None), "rsi_period", 14)
+        if len(closes) <= rsi_period:
+            raise ValueError(
+                f"Insufficient data: need more than {rsi_period} periods for RSI"
+            )
+        if closes.isna().to_numpy().any():
+            raise ValueError("Close panel contains missing values")
+        start_idx = rsi_period
+
+        first = closes.iloc[start_idx].to_numpy(dtype=float)
+        sleeves = risk_manager.position_size(initial_balance, first) * first
+        if sleeves.sum() > initial_balance:
+            sleeves *= initial_balance / sleeves.sum()
+
+        equity = np.full(len(closes) - start_idx, initial_balance - sleeves.sum())
+        trades: Dict[str, TradeLog] = {}
+        for lo in range(0, closes.shape[1], symbol_chunk):
+            block = closes.iloc[:, lo:lo + symbol_chunk]
+            codes = engine.generate_signal_panel(block, galaxy_score).to_numpy()
+            block_equity, block_trades = self._simulate_panel(
+                block.index,
+                block.to_numpy(dtype=float),
+                codes,
+                sleeves[lo:lo + symbol_chunk],
+                start_idx,
+            )
+            equity += block_equity
+            trades.update(zip(block.columns, block_trades))
+
+        equity_series = pd.Series(equity, index=closes.index[start_idx:])
+        all_trades = TradeLog.concat(list(trades.values()), closes.index)
+        return PortfolioBacktestResult(
+            portfolio=self._compute_result(equity_series, all_trades, initial_balance),
+            trades=trades,
+            allocations=pd.Series(sleeves, index=closes.columns),
+        )
+
+    def _simulate_panel(
+        self,
+        index: pd.Index,
+        close: np.ndarray,
+        codes: np.ndarray,
+        sleeves: np.ndarray,
+        start_idx: int,
+    ) -> tuple[np.ndarray, List[TradeLog]]:
+        """Vectorized sleeve simulation for a block of symbols.
+
+        Trade ``k`` of a sleeve turns its value ``V`` into ``V * g_k`` with
+        ``g_k = exit * (1 - fee) / entry - fee`` (the cash arithmetic of
+        :meth:`_simulate`), so sleeve values are a per-symbol cumulative product
+        and the equity on every bar is ``cash + qty * close`` with ``cash`` and
+        ``qty`` forward-filled from the trade boundaries.
+        """
+        close = close[start_idx:]
+        codes = codes[start_idx:]
+        rows, cols = close.shape
+
+        state = np.where(codes == 1, 1.0, np.where(codes == -1, 0.0, np.nan))
+        state = pd.DataFrame(state).ffill().fillna(0.0).to_numpy()
+        prev = np.vstack([np.zeros((1, cols)), state[:-1]])
+        # Transposed so the events come out ordered by symbol, then time
+        entry_sym, entry_row = np.nonzero(((state == 1.0) & (prev == 0.0)).T)
+        exit_sym, exit_row = np.nonzero(((state == 0.0) & (prev == 1.0)).T)
+
+        # Exits alternate with entries, so the k-th exit of a symbol closes its
+        # k-th entry; entries without an exit are closed on the last bar.
+        exit_rows = np.full(len(entry_row), rows - 1)
+        is_open = np.ones(len(entry_row), dtype=bool)
+        n_entries = np.bincount(entry_sym, minlength=cols)
+        n_exits = np.bincount(exit_sym, minlength=cols)
+        entry_first = np.concatenate(([0], np.cumsum(n_entries)[:-1]))
+        exit_first = np.concatenate(([0], np.cumsum(n_exits)[:-1]))
+        matched = np.arange(len(exit_row)) - exit_first[exit_sym] + entry_first[exit_sym]
+        exit_rows[matched] = exit_row
+        is_open[matched] = False
+
+        entry_price = close[entry_row, entry_sym] * (1 + self.slippage)
+        exit_price = np.where(
+            is_open,
+            close[exit_rows, entry_sym],
+            close[exit_rows, entry_sym] * (1 - self.slippage),
+        )
+        growth = exit_price * (1 - self.fee) / entry_price - self.fee
+        value_after = pd.Series(growth).groupby(entry_sym).cumprod().to_numpy()
+        value_after = value_after * sleeves[entry_sym]
+        value_before = np.where(
+            np.arange(len(entry_row)) == entry_first[entry_sym],
+            sleeves[entry_sym],
+            np.concatenate(([np.nan], value_after[:-1])),
+        )
+
+        cash = np.full((rows, cols), np.nan)
+        qty = np.full((rows, cols), np.nan)
+        cash[0], qty[0] = sleeves, 0.0
+        cash[entry_row, entry_sym] = -value_before * self.fee
+        qty[entry_row, entry_sym] = value_before / entry_price
+        cash[exit_rows, entry_sym] = value_after
+        qty[exit_rows, entry_sym] = 0.0
+        cash = pd.DataFrame(cash).ffill().to_numpy()
+        qty = pd.DataFrame(qty).ffill().to_numpy()
+        equity = (cash + qty * close).sum(axis=1)
+
+        log = TradeLog.from_arrays(
+            index,
+            entry_row + start_idx,
+            exit_rows + start_idx,
+            entry_price,
+            exit_price,
+            np.where(is_open, EXIT_REASONS.index("end_of_data"), 0),
+        )
+        bounds = np.append(entry_first, len(entry_row))
+        trades = [log[bounds[c]:bounds[c + 1]] for c in range(cols)]
+        return equity, trades
+
+    @staticmethod
+    def _compute_result(
+        equity_series: pd.Series, trades: TradeLog, initial_balance: float
+    ) -> BacktestResult:
         returns = equity_series.pct_change().fillna(0)
         volatility = returns.std() * np.sqrt(252)
         sharpe = (
@@ -117,16 +473,61 @@ class BacktestingService:
             equity_series.iloc[-1] - initial_balance
         ) / initial_balance
         calmar = total_return / abs(max_dd) if max_dd < 0 else np.inf
-        wins = sum(1 for t in trades if t.profit_pct > 0)
-        win_rate = wins / len(trades) if trades else 0.0
 
         return BacktestResult(
             sharpe=sharpe,
             max_drawdown=float(max_dd),
-            win_rate=win_rate,
+            win_rate=trades.win_rate,
             total_return=total_return,
             volatility=volatility,
             calmar_ratio=calmar,
             trades=trades,
             equity_curve=equity_series,
+            profit_factor=trades.profit_factor,
+            expectancy=trades.expectancy,
+            average_hold=trades.average_hold,
         )
+
+
+def _score_at(galaxy_score: float | np.ndarray, i: int) -> float:
+    return galaxy_score if np.ndim(galaxy_score) == 0 else float(galaxy_score[i])
+
+
+def _next_true(mask: np.ndarray) -> np.ndarray:
+    """For each position, the index of the next True at or after it.
+
+    The result has one extra trailing element; ``len(mask)`` means none.
+    """
+    n = len(mask)
+    idx = np.where(mask, np.arange(n), n)
+    return np.append(np.minimum.accumulate(idx[::-1])[::-1], n)
+
+
+def _first_hit(
+    low: np.ndarray, high: np.ndarray, stop: float, target: float, lo: int, hi: int
+) -> int | None:
+    """First bar in ``[lo, hi)`` with ``low <= stop`` or ``high >= target``."""
+    chunk = 256
+    while lo < hi:
+        end = min(lo + chunk, hi)
+        mask = (low[lo:end] <= stop) | (high[lo:end] >= target)
+        k = int(np.argmax(mask))
+        if mask[k]:
+            return lo + k
+        lo = end
+        chunk *= 2
+    return None
+
+
+def _signal_transitions(signals: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return the bars where a long-only position is opened and closed.
+
+    A "buy" only opens a position when flat and a "sell" only closes one when
+    long, so the position after each bar is simply the last non-empty signal.
+    """
+    state = np.where(signals == "buy", 1.0, np.where(signals == "sell", 0.0, np.nan))
+    state = pd.Series(state).ffill().fillna(0.0).to_numpy()
+    prev = np.concatenate(([0.0], state[:-1]))
+    entries = np.flatnonzero((state == 1.0) & (prev == 0.0))
+    exits = np.flatnonzero((state == 0.0) & (prev == 1.0))
+    return entries, exits
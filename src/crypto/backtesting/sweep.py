@@ -0,0 +1,257 @@
+"""Parallel parameter sweeps over a single OHLCV frame."""
+
+from __future__ import annotations
+
+import functools
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from crypto.strategy.engine import (
+    GalaxyScore,
+    StrategyConfig,
+    StrategyEngine,
+    align_galaxy_score,
+)
+from crypto.strategy.indicators import INDICATOR_CACHE
+from .service import BacktestingService
+
+STRATEGY_PARAMS = ("rsi_period", "galaxy_score_threshold")
+SERVICE_PARAMS = ("fee", "slippage")
+METRICS = (
+    "sharpe",
+    "max_drawdown",
+    "win_rate",
+    "total_return",
+    "volatility",
+    "calmar_ratio",
+)
+
+
+@dataclass
+class _SharedLayout:
+    name: str
+    rows: int
+    columns: List[str]
+    dtype: str
+    index_dtype: str
+    index_name: Optional[str]
+    tz: Optional[str] = None
+    arrays: int = 0
+
+
+@dataclass(frozen=True)
+class _SharedArray:
+    """Stands in for the ``position``-th shared array in a task's arguments."""
+
+    position: int
+
+
+class _SharedFrame:
+    """Numeric frame copied once into a shared memory block.
+
+    The block holds the int64 index followed by a row-major matrix of the
+    columns, so workers can rebuild the frame without copying it. The
+    matrix is float32 when every column is (see
+    :func:`~crypto.data.history.compact_ohlcv`) and float64 otherwise.
+    A tz-aware index is stored as UTC epochs and its tz in the layout.
+    ``arrays`` are further float64 columns of per-bar values, such as an
+    aligned galaxy score, shared the same way.
+    """
+
+    def __init__(self, df: pd.DataFrame, arrays: Sequence[np.ndarray] = ()) -> None:
+        compact = len(df.columns) and all(t == np.float32 for t in df.dtypes)
+        values = df.to_numpy(dtype=np.float32 if compact else np.float64)
+        index, tz = df.index, None
+        if isinstance(index, pd.DatetimeIndex) and index.tz is not None:
+            index, tz = index.tz_convert(None), str(index.tz)
+        rows = len(df)
+        layout = _SharedLayout(
+            name="",
+            rows=rows,
+            columns=[str(c) for c in df.columns],
+            dtype=values.dtype.str,
+            index_dtype=index.dtype.str,
+            index_name=df.index.name,
+            tz=tz,
+            arrays=len(arrays),
+        )
+        self.shm = shared_memory.SharedMemory(create=True, size=max(_block_size(layout), 1))
+        try:
+            layout.name = self.shm.name
+            self.layout = layout
+            idx_view, val_view, array_views = _views(self.shm, layout)
+            idx_view[:] = np.asarray(index).view(np.int64)
+            val_view[:] = values
+            for view, array in zip(array_views, arrays):
+                view[:] = array
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+
+def _offsets(layout: _SharedLayout) -> Tuple[int, int]:
+    """Byte offsets of the value matrix and of the first shared array."""
+    values = 8 * layout.rows
+    itemsize = np.dtype(layout.dtype).itemsize
+    # Keep the float64 arrays 8-byte aligned after a float32 matrix
+    arrays = -(-(values + itemsize * layout.rows * len(layout.columns)) // 8) * 8
+    return values, arrays
+
+
+def _block_size(layout: _SharedLayout) -> int:
+    return _offsets(layout)[1] + 8 * layout.rows * layout.arrays
+
+
+def _views(shm: shared_memory.SharedMemory, layout: _SharedLayout):
+    values_at, arrays_at = _offsets(layout)
+    idx = np.ndarray((layout.rows,), dtype=np.int64, buffer=shm.buf)
+    values = np.ndarray(
+        (layout.rows, len(layout.columns)),
+        dtype=layout.dtype,
+        buffer=shm.buf,
+        offset=values_at,
+    )
+    arrays = [
+        np.ndarray((layout.rows,), dtype=np.float64, buffer=shm.buf,
+                   offset=arrays_at + 8 * layout.rows * i)
+        for i in range(layout.arrays)
+    ]
+    return idx, values, arrays
+
+
+_WORKER: Dict[str, Any] = {}
+
+
+def _init_worker(layout: _SharedLayout) -> None:
+    shm = shared_memory.SharedMemory(name=layout.name)
+    idx, values, arrays = _views(shm, layout)
+    index = pd.Index(idx.view(layout.index_dtype), name=layout.index_name)
+    if layout.tz is not None:
+        index = index.tz_localize("UTC").tz_convert(layout.tz)
+    _WORKER["shm"] = shm
+    _WORKER["df"] = pd.DataFrame(values, index=index, columns=layout.columns, copy=False)
+    _WORKER["arrays"] = arrays
+
+
+def _call(func: Callable[..., Any], task: Any, *args: Any) -> Any:
+    """Run ``func`` with shared array placeholders replaced by the arrays."""
+    arrays = _WORKER["arrays"]
+    return func(task, *(arrays[a.position] if isinstance(a, _SharedArray) else a for a in args))
+
+
+def _run_one(
+    params: Dict[str, Any], galaxy_score: float | np.ndarray, initial_balance: float
+) -> Dict[str, Any]:
+    df = _WORKER["df"]
+    strategy = StrategyConfig(**{k: params[k] for k in STRATEGY_PARAMS if k in params})
+    service = BacktestingService(**{k: params[k] for k in SERVICE_PARAMS if k in params})
+    # The shared frame is read-only for the whole map, so RSI can be memoized
+    engine = StrategyEngine(strategy, indicator_cache=INDICATOR_CACHE)
+    result = service.run_backtest(df, engine, galaxy_score, initial_balance)
+    row = dict(params)
+    row.update({m: float(getattr(result, m)) for m in METRICS})
+    row["trades"] = len(result.trades)
+    return row
+
+
+def _map_shared(
+    df: pd.DataFrame,
+    func: Callable[..., Any],
+    tasks: Sequence[Any],
+    max_workers: Optional[int],
+    *args: Any,
+) -> List[Any]:
+    """Call ``func(task, *args)`` for every task with ``df`` in shared memory.
+
+    Workers read the frame from ``_WORKER["df"]``. Arguments that are
+    per-bar arrays (one value per row of ``df``) go into the shared block
+    too instead of being pickled with every task. With a single worker the
+    tasks run in this process without starting a pool.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    workers = min(workers, len(tasks)) or 1
+
+    arrays: List[np.ndarray] = []
+    shared_args = []
+    for arg in args:
+        if isinstance(arg, np.ndarray) and arg.shape == (len(df),) and arg.dtype == np.float64:
+            shared_args.append(_SharedArray(len(arrays)))
+            arrays.append(arg)
+        else:
+            shared_args.append(arg)
+    func = functools.partial(_call, func)
+
+    shared = _SharedFrame(df.select_dtypes(include="number"), arrays)
+    try:
+        if workers == 1:
+            _init_worker(shared.layout)
+            try:
+                return [func(task, *shared_args) for task in tasks]
+            finally:
+                _WORKER.pop("df", None)
+                _WORKER.pop("arrays", None)
+                _WORKER.pop("shm").close()
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(shared.layout,),
+        ) as pool:
+            return list(
+                pool.map(
+                    func,
+                    tasks,
+                    *(itertools.repeat(a) for a in shared_args),
+                    chunksize=chunksize,
+                )
+            )
+    finally:
+        shared.close()
+
+
+def parameter_grid(grid: Mapping[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Expand ``{name: values}`` into the list of all combinations."""
+    unknown = set(grid) - set(STRATEGY_PARAMS) - set(SERVICE_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+    keys = list(grid)
+    return [dict(zip(keys, combo)) for combo in itertools.product(*grid.values())]
+
+
+def run_sweep(
+    df: pd.DataFrame,
+    grid: Mapping[str, Sequence[Any]],
+    galaxy_score: GalaxyScore = 0.0,
+    initial_balance: float = 1000.0,
+    max_workers: Optional[int] = None,
+    rank_by: str = "sharpe",
+) -> pd.DataFrame:
+    """Backtest every combination of ``grid`` on ``df`` across processes.
+
+    ``grid`` may contain the ``StrategyConfig`` fields ``rsi_period`` and
+    ``galaxy_score_threshold`` and the ``BacktestingService`` fields ``fee``
+    and ``slippage``. The OHLCV columns are placed in shared memory once and
+    every worker maps them instead of receiving a pickled copy per task.
+    Returns one row per combination, best ``rank_by`` first.
+    """
+    combos = parameter_grid(grid)
+    if rank_by not in METRICS and rank_by != "trades":
+        raise ValueError(f"Cannot rank by {rank_by!r}")
+    # Aligned once here rather than in every backtest
+    galaxy_score = align_galaxy_score(galaxy_score, df.index)
+    rows = _map_shared(
+        df, _run_one, combos, max_workers, galaxy_score, initial_balance
+    )
+    table = pd.DataFrame(rows)
+    return table.sort_values(rank_by, ascending=False, kind="stable").reset_index(drop=True)
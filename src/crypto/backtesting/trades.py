@@ -0,0 +1,197 @@
+"""Trade records and the columnar trade log backing backtest results."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, Optional, Sequence, overload
+
+import numpy as np
+import pandas as pd
+
+EXIT_REASONS = ("signal", "stop_loss", "take_profit", "end_of_data")
+
+TRADE_DTYPE = np.dtype([
+    ("entry_bar", np.int64),
+    ("exit_bar", np.int64),
+    ("entry_price", np.float64),
+    ("exit_price", np.float64),
+    ("profit_pct", np.float64),
+    ("exit_reason", np.int8),
+])
+
+
+@dataclass
+class Trade:
+    entry_time: pd.Timestamp
+    exit_time: pd.Timestamp
+    entry_price: float
+    exit_price: float
+    profit_pct: float
+    exit_reason: str = "signal"
+
+
+class TradeLog(Sequence[Trade]):
+    """Trades stored as one numpy structured array.
+
+    Entry and exit times are kept as bar positions into ``index``, which is
+    shared with the backtest rather than copied. Indexing or iterating yields
+    :class:`Trade` objects built on demand, so code written against a list
+    of trades keeps working; metrics and serialization use the columns
+    directly.
+    """
+
+    def __init__(self, records: np.ndarray, index: pd.Index) -> None:
+        self.records = records
+        self.index = index
+
+    @classmethod
+    def empty(cls, index: pd.Index) -> "TradeLog":
+        return cls(np.empty(0, dtype=TRADE_DTYPE), index)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        index: pd.Index,
+        entry_bar: Any,
+        exit_bar: Any,
+        entry_price: Any,
+        exit_price: Any,
+        exit_reason: Any = None,
+    ) -> "TradeLog":
+        """Build a log from per-field arrays; ``exit_reason`` holds names or codes."""
+        records = np.empty(len(entry_bar), dtype=TRADE_DTYPE)
+        records["entry_bar"] = entry_bar
+        records["exit_bar"] = exit_bar
+        records["entry_price"] = entry_price
+        records["exit_price"] = exit_price
+        records["profit_pct"] = (records["exit_price"] - records["entry_price"]) / records["entry_price"]
+        if exit_reason is None:
+            records["exit_reason"] = 0
+        else:
+            reasons = np.asarray(exit_reason)
+            if reasons.dtype.kind in "OUS":
+                reasons = np.array([EXIT_REASONS.index(r) for r in reasons], dtype=np.int8)
+            records["exit_reason"] = reasons
+        return cls(records, index)
+
+    @classmethod
+    def from_trades(cls, trades: Iterable[Trade], index: pd.Index) -> "TradeLog":
+        trades = list(trades)
+        return cls.from_arrays(
+            index,
+            index.get_indexer([t.entry_time for t in trades]),
+            index.get_indexer([t.exit_time for t in trades]),
+            [t.entry_price for t in trades],
+            [t.exit_price for t in trades],
+            [t.exit_reason for t in trades],
+        )
+
+    @classmethod
+    def concat(cls, logs: Sequence["TradeLog"], index: pd.Index) -> "TradeLog":
+        """Merge logs over the same ``index`` ordered by exit bar."""
+        if not logs:
+            return cls.empty(index)
+        records = np.concatenate([log.records for log in logs])
+        return cls(records[np.argsort(records["exit_bar"], kind="stable")], index)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @overload
+    def __getitem__(self, item: int) -> Trade: ...
+
+    @overload
+    def __getitem__(self, item: slice) -> "TradeLog": ...
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return TradeLog(self.records[item], self.index)
+        row = self.records[item]
+        return Trade(
+            entry_time=self.index[row["entry_bar"]],
+            exit_time=self.index[row["exit_bar"]],
+            entry_price=float(row["entry_price"]),
+            exit_price=float(row["exit_price"]),
+            profit_pct=float(row["profit_pct"]),
+            exit_reason=EXIT_REASONS[row["exit_reason"]],
+        )
+
+    def __iter__(self) -> Iterator[Trade]:
+        for i in range(len(self.records)):
+            yield self[i]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, TradeLog):
+            return (
+                np.array_equal(self.records, other.records)
+                and self.index[self.records["entry_bar"]].equals(other.index[other.records["entry_bar"]])
+                and self.index[self.records["exit_bar"]].equals(other.index[other.records["exit_bar"]])
+            )
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TradeLog({len(self)} trades)"
+
+    @property
+    def entry_time(self) -> pd.Index:
+        return self.index[self.records["entry_bar"]]
+
+    @property
+    def exit_time(self) -> pd.Index:
+        return self.index[self.records["exit_bar"]]
+
+    @property
+    def profit_pct(self) -> np.ndarray:
+        return self.records["profit_pct"]
+
+    @property
+    def exit_reason(self) -> np.ndarray:
+        return np.asarray(EXIT_REASONS, dtype=object)[self.records["exit_reason"]]
+
+    @property
+    def win_rate(self) -> float:
+        return float((self.profit_pct > 0).mean()) if len(self) else 0.0
+
+    @property
+    def profit_factor(self) -> float:
+        """Sum of winning over losing returns; inf when nothing was lost."""
+        gains = self.profit_pct[self.profit_pct > 0].sum()
+        losses = -self.profit_pct[self.profit_pct < 0].sum()
+        if losses > 0:
+            return float(gains / losses)
+        return float("inf") if gains > 0 else 0.0
+
+    @property
+    def expectancy(self) -> float:
+        """Mean return per trade."""
+        return float(self.profit_pct.mean()) if len(self) else 0.0
+
+    @property
+    def average_hold(self) -> Optional[Any]:
+        """Mean time (or index distance) between entry and exit."""
+        if not len(self):
+            return None
+        held = self.exit_time - self.entry_time
+        if isinstance(held, pd.TimedeltaIndex):
+            return held.mean()
+        return float(np.mean(held))
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            "entry_time": self.entry_time,
+            "exit_time": self.exit_time,
+            "entry_price": self.records["entry_price"],
+            "exit_price": self.records["exit_price"],
+            "profit_pct": self.records["profit_pct"],
+            "exit_reason": pd.Categorical.from_codes(self.records["exit_reason"], EXIT_REASONS),
+        })
+
+    def to_arrow(self):
+        import pyarrow as pa
+
+        return pa.Table.from_pandas(self.to_frame(), preserve_index=False)
+
+    def to_parquet(self, path) -> None:
+        self.to_frame().to_parquet(path, index=False)
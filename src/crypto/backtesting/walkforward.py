@@ -0,0 +1,166 @@
+"""Walk-forward optimization over rolling or anchored windows."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from crypto.strategy.engine import (
+    GalaxyScore,
+    StrategyConfig,
+    StrategyEngine,
+    align_galaxy_score,
+)
+from crypto.strategy.indicators import INDICATOR_CACHE
+from .service import BacktestingService, BacktestResult, _signal_transitions
+from .sweep import (
+    _WORKER,
+    METRICS,
+    SERVICE_PARAMS,
+    STRATEGY_PARAMS,
+    _map_shared,
+    parameter_grid,
+)
+from .trades import TradeLog
+
+# (train_start, test_start, test_end) as bar positions; train ends at test_start
+Window = Tuple[int, int, int]
+
+
+@dataclass
+class WalkForwardResult:
+    windows: pd.DataFrame
+    equity_curve: pd.Series
+    out_of_sample: BacktestResult
+
+
+def walk_forward_windows(
+    n: int, train_size: int, test_size: int, anchored: bool = False
+) -> List[Window]:
+    """Split ``n`` bars into consecutive train/test windows.
+
+    Test windows tile the bars after the first ``train_size`` without
+    overlapping; the last one may be shorter. Rolling windows train on the
+    ``train_size`` bars before each test window, anchored ones on every bar
+    since the start.
+    """
+    if train_size < 1 or test_size < 1:
+        raise ValueError("train_size and test_size must be positive")
+    return [
+        (0 if anchored else test_start - train_size, test_start, min(test_start + test_size, n))
+        for test_start in range(train_size, n, test_size)
+    ]
+
+
+def _evaluate(
+    params: Dict[str, Any],
+    galaxy_score: float | np.ndarray,
+    lo: int,
+    hi: int,
+    initial_balance: float,
+) -> BacktestResult:
+    """Backtest ``params`` on bars ``[lo, hi)`` of the worker's frame.
+
+    Signals come from the whole frame, so the RSI of the first bars of a
+    window is already warmed up and, through the indicator cache, computed
+    once per ``rsi_period`` for all windows handled by this worker.
+    """
+    df = _WORKER["df"]
+    engine = StrategyEngine(
+        StrategyConfig(**{k: params[k] for k in STRATEGY_PARAMS if k in params}),
+        indicator_cache=INDICATOR_CACHE,
+    )
+    service = BacktestingService(**{k: params[k] for k in SERVICE_PARAMS if k in params})
+    signals = engine.generate_signal_series(df, galaxy_score)["signal"].to_numpy()
+    close = df["close"].to_numpy(dtype=float)[:hi]
+    entries, exits = _signal_transitions(signals[lo:hi])
+    equity, trades = service._simulate(
+        df.index[:hi], close, entries + lo, exits + lo, initial_balance, lo
+    )
+    return service._compute_result(equity, trades, initial_balance)
+
+
+def _run_window(
+    window: Window,
+    combos: List[Dict[str, Any]],
+    galaxy_score: float | np.ndarray,
+    rank_by: str,
+) -> Dict[str, Any]:
+    train_start, test_start, test_end = window
+    best, best_score = combos[0], -np.inf
+    for params in combos:
+        score = float(getattr(_evaluate(params, galaxy_score, train_start, test_start, 1.0), rank_by))
+        if score > best_score:
+            best, best_score = params, score
+
+    # Simulated with a unit balance; the parent rescales it when stitching
+    result = _evaluate(best, galaxy_score, test_start, test_end, 1.0)
+    return {
+        "window": window,
+        "params": best,
+        "train_score": best_score,
+        "metrics": {m: float(getattr(result, m)) for m in METRICS},
+        "equity": result.equity_curve.to_numpy(),
+        "trades": result.trades.records,
+    }
+
+
+def run_walk_forward(
+    df: pd.DataFrame,
+    grid: Mapping[str, Sequence[Any]],
+    train_size: int,
+    test_size: int,
+    anchored: bool = False,
+    galaxy_score: GalaxyScore = 0.0,
+    initial_balance: float = 1000.0,
+    max_workers: Optional[int] = None,
+    rank_by: str = "sharpe",
+) -> WalkForwardResult:
+    """Optimize ``grid`` on each train window and trade it on the next test window.
+
+    Window sizes are in bars (see :func:`walk_forward_windows`); ``grid``
+    takes the same parameters as :func:`~crypto.backtesting.sweep.run_sweep`.
+    Windows run in parallel processes sharing ``df`` through shared memory.
+    The out-of-sample equity curves are chained so each test window starts
+    with the balance the previous one ended with.
+    """
+    combos = parameter_grid(grid)
+    if rank_by not in METRICS:
+        raise ValueError(f"Cannot rank by {rank_by!r}")
+    windows = walk_forward_windows(len(df), train_size, test_size, anchored)
+    if not windows:
+        raise ValueError(
+            f"Insufficient data: need more than {train_size} bars for walk-forward"
+        )
+
+    galaxy_score = align_galaxy_score(galaxy_score, df.index)
+    outcomes = _map_shared(df, _run_window, windows, max_workers, combos, galaxy_score, rank_by)
+
+    rows, curves, logs = [], [], []
+    balance = initial_balance
+    for outcome in outcomes:
+        train_start, test_start, test_end = outcome["window"]
+        row = {
+            "train_start": df.index[train_start],
+            "test_start": df.index[test_start],
+            "test_end": df.index[test_end - 1],
+            **outcome["params"],
+            f"train_{rank_by}": outcome["train_score"],
+            **outcome["metrics"],
+            "trades": len(outcome["trades"]),
+        }
+        rows.append(row)
+        curves.append(outcome["equity"] * balance)
+        balance = curves[-1][-1]
+        logs.append(TradeLog(outcome["trades"], df.index))
+
+    equity = pd.Series(np.concatenate(curves), index=df.index[windows[0][1]:])
+    trades = TradeLog.concat(logs, df.index)
+    return WalkForwardResult(
+        windows=pd.DataFrame(rows),
+        equity_curve=equity,
+        out_of_sample=BacktestingService._compute_result(equity, trades, initial_balance),
+    )
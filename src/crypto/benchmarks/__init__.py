@@ -0,0 +1,21 @@
+"""Performance benchmarks and synthetic market data."""
+
+from .suite import (
+    BENCHMARKS,
+    compare,
+    load_baseline,
+    memory_footprint,
+    run_suite,
+    save_baseline,
+)
+from .synthetic import synthetic_ohlcv
+
+__all__ = [
+    "BENCHMARKS",
+    "compare",
+    "load_baseline",
+    "memory_footprint",
+    "run_suite",
+    "save_baseline",
+    "synthetic_ohlcv",
+]
@@ -0,0 +1,55 @@
+"""Run the benchmark suite: ``python -m crypto.benchmarks``."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from loguru import logger
+
+from .suite import (
+    BENCHMARKS,
+    DEFAULT_SIZES,
+    compare,
+    load_baseline,
+    memory_footprint,
+    run_suite,
+    save_baseline,
+)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m crypto.benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", type=Path, default=Path("bench_baseline.json"))
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--update", action="store_true", help="overwrite the baseline")
+    parser.add_argument(
+        "--memory", action="store_true", help="also report float64 against compact bar sizes"
+    )
+    args = parser.parse_args(argv)
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    results = run_suite(args.sizes, args.only, args.repeat)
+    for name, seconds in results.items():
+        print(f"{name:40s} {seconds * 1000:12.3f} ms")
+    if args.memory:
+        print(memory_footprint(args.sizes).to_string())
+
+    if args.update or not args.baseline.exists():
+        save_baseline(results, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, load_baseline(args.baseline), args.threshold)
+    for name, base, current, ratio in regressions:
+        print(f"REGRESSION {name}: {base * 1000:.3f} ms -> {current * 1000:.3f} ms ({ratio:.2f}x)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
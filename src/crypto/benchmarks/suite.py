@@ -0,0 +1,203 @@
+"""Timing suite for the hot paths and JSON baseline comparison."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import platform
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, Iterable, Iterator, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from crypto.backtesting.montecarlo import run_monte_carlo
+from crypto.backtesting.service import BacktestingService
+from crypto.data.history import HistoricalDataManager, OHLCVConfig, compact_ohlcv
+from crypto.strategy.engine import StrategyConfig, StrategyEngine
+from .synthetic import synthetic_ohlcv
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000, 10_000_000)
+# Early enough that the largest size still ends in the past, so every bar
+# is closed and a cache hit never refetches the tail
+SYNTHETIC_START = "2000-01-01"
+# The per-bar backtest is quadratic; beyond this it would dominate the run
+PER_BAR_LIMIT = 10_000
+MONTE_CARLO_PATHS = 100_000
+
+
+class _StubbedHistory(HistoricalDataManager):
+    """History manager whose downloads are served from an in-memory frame."""
+
+    def __init__(self, source: pd.DataFrame) -> None:
+        super().__init__(session=None, requests_per_second=1e9)
+        self.source = source
+        self.calls = 0
+
+    async def _fetch_chunk(self, cfg: OHLCVConfig, start_ts: int, end_ts: int) -> pd.DataFrame:
+        self.calls += 1
+        lo = pd.Timestamp(start_ts, unit="s")
+        hi = pd.Timestamp(end_ts, unit="s")
+        return self.source.loc[lo:hi]
+
+
+def _bench_generate_signals(df: pd.DataFrame) -> Callable[[], Any]:
+    engine = StrategyEngine(StrategyConfig())
+    return lambda: engine.generate_signals(df, 75.0)
+
+
+def _bench_run_backtest(df: pd.DataFrame) -> Callable[[], Any]:
+    engine = StrategyEngine(StrategyConfig())
+    service = BacktestingService()
+    return lambda: service.run_backtest(df, engine, 75.0)
+
+
+def _bench_run_backtest_per_bar(df: pd.DataFrame) -> Callable[[], Any]:
+    engine = StrategyEngine(StrategyConfig())
+    service = BacktestingService()
+    return lambda: service.run_backtest(df, engine, 75.0, vectorized=False)
+
+
+def _fetch_cfg(df: pd.DataFrame, cache_dir: Path, compact: bool = False) -> OHLCVConfig:
+    return OHLCVConfig(
+        symbol="BENCH",
+        timeframe="1m",
+        start=df.index[0].to_pydatetime(),
+        end=df.index[-1].to_pydatetime(),
+        cache_dir=cache_dir,
+        compact=compact,
+    )
+
+
+def _bench_fetch_miss(df: pd.DataFrame) -> Callable[[], Any]:
+    def run() -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            asyncio.run(_StubbedHistory(df).fetch_ohlcv(_fetch_cfg(df, Path(tmp))))
+
+    return run
+
+
+@contextlib.contextmanager
+def _bench_fetch_hit(df: pd.DataFrame, compact: bool = False) -> Iterator[Callable[[], Any]]:
+    with tempfile.TemporaryDirectory() as tmp:
+        cfg = _fetch_cfg(df, Path(tmp), compact)
+        asyncio.run(_StubbedHistory(df).fetch_ohlcv(cfg))
+        yield lambda: asyncio.run(_StubbedHistory(df).fetch_ohlcv(cfg))
+
+
+def _bench_fetch_hit_compact(df: pd.DataFrame) -> ContextManager[Callable[[], Any]]:
+    return _bench_fetch_hit(df, compact=True)
+
+
+def _bench_run_backtest_compact(df: pd.DataFrame) -> Callable[[], Any]:
+    return _bench_run_backtest(compact_ohlcv(df))
+
+
+def _bench_metrics(df: pd.DataFrame) -> Callable[[], Any]:
+    equity = df["close"] * 10
+    trades = BacktestingService().run_backtest(df, StrategyEngine(StrategyConfig()), 75.0).trades
+    return lambda: BacktestingService._compute_result(equity, trades, 1000.0)
+
+
+def _bench_monte_carlo(df: pd.DataFrame) -> Callable[[], Any]:
+    result = BacktestingService().run_backtest(df, StrategyEngine(StrategyConfig()), 75.0)
+    return lambda: run_monte_carlo(result, n_paths=MONTE_CARLO_PATHS, seed=0)
+
+
+# A setup returns the timed callable, or a context manager yielding it when
+# it holds resources such as a cache directory
+Setup = Callable[[pd.DataFrame], Union[Callable[[], Any], ContextManager[Callable[[], Any]]]]
+UNLIMITED = 10 ** 12
+
+BENCHMARKS: Dict[str, Tuple[Setup, int, int]] = {
+    # name: (setup returning the timed callable, largest size, most repeats)
+    "generate_signals": (_bench_generate_signals, UNLIMITED, UNLIMITED),
+    "run_backtest": (_bench_run_backtest, UNLIMITED, UNLIMITED),
+    "run_backtest_per_bar": (_bench_run_backtest_per_bar, PER_BAR_LIMIT, 1),
+    "fetch_ohlcv_miss": (_bench_fetch_miss, UNLIMITED, UNLIMITED),
+    "fetch_ohlcv_hit": (_bench_fetch_hit, UNLIMITED, UNLIMITED),
+    "fetch_ohlcv_hit_compact": (_bench_fetch_hit_compact, UNLIMITED, UNLIMITED),
+    "run_backtest_compact": (_bench_run_backtest_compact, UNLIMITED, UNLIMITED),
+    "metrics": (_bench_metrics, UNLIMITED, UNLIMITED),
+    # Path count is fixed; the trade count grows with the bars
+    "monte_carlo": (_bench_monte_carlo, 100_000, UNLIMITED),
+}
+
+
+def run_suite(
+    sizes: Iterable[int] = DEFAULT_SIZES,
+    names: Iterable[str] | None = None,
+    repeat: int = 3,
+    seed: int = 0,
+) -> Dict[str, float]:
+    """Return the best-of-``repeat`` seconds for each ``name[size]``."""
+    selected = list(names or BENCHMARKS)
+    results: Dict[str, float] = {}
+    for size in sizes:
+        df = synthetic_ohlcv(size, seed=seed, start=SYNTHETIC_START)
+        for name in selected:
+            setup, max_size, max_repeat = BENCHMARKS[name]
+            if size > max_size:
+                continue
+            with contextlib.ExitStack() as stack:
+                func = setup(df)
+                if isinstance(func, contextlib.AbstractContextManager):
+                    func = stack.enter_context(func)
+                best = float("inf")
+                for _ in range(min(repeat, max_repeat)):
+                    started = time.perf_counter()
+                    func()
+                    best = min(best, time.perf_counter() - started)
+            results[f"{name}[{size}]"] = best
+    return results
+
+
+def memory_footprint(sizes: Iterable[int] = DEFAULT_SIZES, seed: int = 0) -> pd.DataFrame:
+    """Bytes of the bars in memory and in the cache, float64 against compact."""
+    rows = []
+    for size in sizes:
+        df = synthetic_ohlcv(size, seed=seed, start=SYNTHETIC_START)
+        row: Dict[str, Any] = {"size": size}
+        for label, compact in (("float64", False), ("compact", True)):
+            with tempfile.TemporaryDirectory() as tmp:
+                cfg = _fetch_cfg(df, Path(tmp), compact)
+                loaded = asyncio.run(_StubbedHistory(df).fetch_ohlcv(cfg))
+                row[f"{label}_memory"] = int(loaded.memory_usage(deep=True).sum())
+                row[f"{label}_cache"] = sum(p.stat().st_size for p in Path(tmp).rglob("*.parquet"))
+        row["memory_ratio"] = row["compact_memory"] / row["float64_memory"]
+        row["cache_ratio"] = row["compact_cache"] / row["float64_cache"]
+        rows.append(row)
+    return pd.DataFrame(rows).set_index("size")
+
+
+def save_baseline(results: Dict[str, float], path: Path) -> None:
+    payload = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+    Path(path).write_text(json.dumps(payload, indent=2, sort_keys=True))
+
+
+def load_baseline(path: Path) -> Dict[str, float]:
+    return json.loads(Path(path).read_text())["results"]
+
+
+def compare(
+    current: Dict[str, float], baseline: Dict[str, float], threshold: float = 0.2
+) -> List[Tuple[str, float, float, float]]:
+    """Return ``(name, baseline, current, ratio)`` for every slowdown above
+    ``threshold`` (0.2 = 20% slower than the baseline)."""
+    regressions = []
+    for name, seconds in sorted(current.items()):
+        base = baseline.get(name)
+        if base and seconds > base * (1 + threshold):
+            regressions.append((name, base, seconds, seconds / base))
+    return regressions
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+def synthetic_ohlcv(
+    n: int,
+    freq: str = "1min",
+    seed: int = 0,
+    start: str = "2024-01-01",
+    start_price: float = 100.0,
+    volatility: float = 0.001,
+) -> pd.DataFrame:
+    """Seeded geometric random walk with consistent OHLCV bars.
+
+    Each bar opens at the previous close; high and low extend beyond the
+    body by a random fraction of ``volatility`` and volume is log-normal.
+    """
+    rng = np.random.default_rng(seed)
+    log_returns = rng.normal(0.0, volatility, n)
+    close = start_price * np.exp(np.cumsum(log_returns))
+    open_ = np.concatenate(([start_price], close[:-1]))
+    body_high = np.maximum(open_, close)
+    body_low = np.minimum(open_, close)
+    high = body_high * (1 + np.abs(rng.normal(0.0, volatility / 2, n)))
+    low = body_low * (1 - np.abs(rng.normal(0.0, volatility / 2, n)))
+    volume = rng.lognormal(mean=3.0, sigma=1.0, size=n)
+    index = pd.date_range(start, periods=n, freq=freq, name="timestamp")
+    return pd.DataFrame(
+        {"open": open_, "high": high, "low": low, "close": close, "volume": volume},
+        index=index,
+    )
@@ -0,0 +1,278 @@
+"""Command line entry point: ``python -m crypto <command>``.
+
+Only the standard library is imported at module level. pandas, aiohttp,
+ccxt and the rest are imported inside the command that needs them, so
+``--help`` and short cron jobs do not pay for dependencies they never use.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import signal
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, List, Optional
+
+DEFAULT_CONFIG = Path(__file__).with_name("config.yaml")
+
+
+def _add_data_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--symbol", default="BTC_USDT")
+    parser.add_argument("--timeframe", default="1h")
+    parser.add_argument("--days", type=float, default=30.0, help="history length ending now")
+    parser.add_argument("--cache-dir", type=Path, default=Path("./data_cache"))
+    parser.add_argument(
+        "--data", type=Path,
+        help="read OHLCV from a .parquet or .csv file instead of downloading it",
+    )
+    parser.add_argument(
+        "--compact", action="store_true", help="cache and load bars as float32"
+    )
+
+
+def _read_frame(path: Path):
+    import pandas as pd
+
+    if path.suffix == ".csv":
+        return pd.read_csv(path, index_col=0, parse_dates=True)
+    return pd.read_parquet(path)
+
+
+async def _download(args: argparse.Namespace):
+    import aiohttp
+
+    from crypto.data.history import HistoricalDataManager, OHLCVConfig
+
+    end = datetime.now(timezone.utc)
+    cfg = OHLCVConfig(
+        symbol=args.symbol,
+        timeframe=args.timeframe,
+        start=end - timedelta(days=args.days),
+        end=end,
+        cache_dir=args.cache_dir,
+        compact=args.compact,
+    )
+    async with aiohttp.ClientSession() as session:
+        return await HistoricalDataManager(session).fetch_ohlcv(cfg)
+
+
+def _load_frame(args: argparse.Namespace):
+    if args.data is not None:
+        df = _read_frame(args.data)
+        if args.compact:
+            from crypto.data.history import compact_ohlcv
+
+            df = compact_ohlcv(df)
+        return df
+    return asyncio.run(_download(args))
+
+
+def _strategy_config(args: argparse.Namespace):
+    from crypto.config.loader import load_config
+    from crypto.strategy.engine import StrategyConfig
+
+    return StrategyConfig(**(load_config(args.config) or {}).get("strategies", {}))
+
+
+def _fetch(args: argparse.Namespace) -> int:
+    from loguru import logger
+
+    df = asyncio.run(_download(args))
+    logger.info(f"{len(df)} bars of {args.symbol} {args.timeframe} in {args.cache_dir}")
+    if args.output is not None:
+        if args.output.suffix == ".csv":
+            df.to_csv(args.output)
+        else:
+            df.to_parquet(args.output)
+    return 0 if len(df) else 1
+
+
+def _backtest(args: argparse.Namespace) -> int:
+    from loguru import logger
+
+    from crypto.backtesting.service import BacktestingService
+    from crypto.strategy.engine import StrategyEngine
+
+    df = _load_frame(args)
+    if df.empty:
+        logger.error("No historical data available")
+        return 1
+
+    risk_manager = None
+    if args.risk:
+        from crypto.config.loader import load_config
+        from crypto.risk.manager import RiskConfig, RiskManager
+
+        risk_conf = RiskConfig(**(load_config(args.config) or {}).get("risk", {}))
+        risk_manager = RiskManager(risk_conf)
+
+    galaxy_score = args.galaxy_score
+    if args.galaxy_history:
+        from crypto.data.social import GalaxyScoreStore
+
+        galaxy_score = GalaxyScoreStore(args.cache_dir, args.symbol).read(end=df.index[-1])
+        if galaxy_score.empty:
+            logger.warning(f"No recorded galaxy scores for {args.symbol} in {args.cache_dir}")
+
+    engine = StrategyEngine(_strategy_config(args))
+    service = BacktestingService(fee=args.fee, slippage=args.slippage)
+    result = service.run_backtest(df, engine, galaxy_score, risk_manager=risk_manager)
+    print(f"Total Return:   {result.total_return:.2%}")
+    print(f"Sharpe Ratio:   {result.sharpe:.2f}")
+    print(f"Max Drawdown:   {result.max_drawdown:.2%}")
+    print(f"Win Rate:       {result.win_rate:.2%}")
+    print(f"Profit Factor:  {result.profit_factor:.2f}")
+    print(f"Trades:         {len(result.trades)}")
+    if args.trades is not None:
+        result.trades.to_parquet(args.trades)
+    return 0
+
+
+def _sweep(args: argparse.Namespace) -> int:
+    from loguru import logger
+
+    from crypto.backtesting.sweep import run_sweep
+
+    df = _load_frame(args)
+    if df.empty:
+        logger.error("No historical data available")
+        return 1
+
+    grid = {
+        "rsi_period": args.rsi_period,
+        "galaxy_score_threshold": args.threshold,
+        "fee": args.fee,
+    }
+    table = run_sweep(
+        df, grid, args.galaxy_score, max_workers=args.workers, rank_by=args.rank_by
+    )
+    print(table.head(args.top).to_string(index=False))
+    return 0
+
+
+def _live(args: argparse.Namespace) -> int:
+    from crypto.config.loader import load_config
+    from crypto.live import LiveScheduler, SymbolTrader
+    from crypto.risk.manager import RiskConfig, RiskManager
+    from crypto.strategy.engine import StrategyEngine
+
+    config = load_config(args.config) or {}
+
+    monitor = None
+    if args.log_file is not None:
+        from crypto.monitoring.monitor import Monitor
+
+        monitor = Monitor(args.log_file)
+
+    async def trade(execution) -> None:
+        trader = SymbolTrader(
+            StrategyEngine(_strategy_config(args)),
+            RiskManager(RiskConfig(**config.get("risk", {}))),
+            timeframe=args.timeframe,
+            lunarcrush_key=config.get("lunarcrush", {}).get("api_key", ""),
+            execution=execution,
+            balance=args.balance,
+            cache_dir=args.cache_dir,
+            monitor=monitor,
+        )
+        scheduler = LiveScheduler(
+            args.symbols, trader, args.timeframe,
+            offset=args.offset, symbol_timeout=args.symbol_timeout,
+        )
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, scheduler.stop)
+        await scheduler.run(args.cycles)
+
+    async def run() -> None:
+        if args.dry_run:
+            await trade(None)
+            return
+        from crypto.execution.service import AsyncExecutionService
+
+        exchange = config.get("exchange", {})
+        async with AsyncExecutionService(
+            api_key=exchange.get("api_key", ""),
+            secret=exchange.get("secret", ""),
+            sandbox=exchange.get("sandbox", False),
+        ) as execution:
+            await trade(execution)
+
+    asyncio.run(run())
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m crypto")
+    parser.add_argument("--config", type=Path, default=DEFAULT_CONFIG)
+    parser.add_argument("--log-level", default="INFO")
+    parser.add_argument(
+        "--metrics-port", type=int,
+        help="serve Prometheus metrics on this port while the command runs",
+    )
+    parser.add_argument("--metrics-addr", default="127.0.0.1")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fetch = commands.add_parser("fetch", help="download OHLCV into the local cache")
+    _add_data_args(fetch)
+    fetch.add_argument("--output", type=Path, help="also write the bars to .parquet or .csv")
+    fetch.set_defaults(handler=_fetch)
+
+    backtest = commands.add_parser("backtest", help="backtest the configured strategy")
+    _add_data_args(backtest)
+    backtest.add_argument("--galaxy-score", type=float, default=75.0)
+    backtest.add_argument(
+        "--galaxy-history", action="store_true",
+        help="use the galaxy scores recorded in --cache-dir instead of --galaxy-score",
+    )
+    backtest.add_argument("--fee", type=float, default=0.001)
+    backtest.add_argument("--slippage", type=float, default=0.0005)
+    backtest.add_argument("--risk", action="store_true", help="apply the configured stop-loss/take-profit")
+    backtest.add_argument("--trades", type=Path, help="write the trade log to this parquet file")
+    backtest.set_defaults(handler=_backtest)
+
+    sweep = commands.add_parser("sweep", help="backtest a grid of strategy parameters")
+    _add_data_args(sweep)
+    sweep.add_argument("--galaxy-score", type=float, default=75.0)
+    sweep.add_argument("--rsi-period", type=int, nargs="+", default=[7, 14, 21])
+    sweep.add_argument("--threshold", type=float, nargs="+", default=[50.0, 70.0])
+    sweep.add_argument("--fee", type=float, nargs="+", default=[0.001])
+    sweep.add_argument("--rank-by", default="sharpe")
+    sweep.add_argument("--workers", type=int)
+    sweep.add_argument("--top", type=int, default=10)
+    sweep.set_defaults(handler=_sweep)
+
+    live = commands.add_parser("live", help="trade the configured strategy once per bar")
+    live.add_argument("--symbols", nargs="+", default=["BTC_USDT"])
+    live.add_argument("--timeframe", default="1h")
+    live.add_argument("--offset", type=float, default=2.0, help="seconds after the bar close to start a cycle")
+    live.add_argument("--symbol-timeout", type=float)
+    live.add_argument("--balance", type=float, default=1000.0)
+    live.add_argument("--cycles", type=int, help="stop after this many cycles")
+    live.add_argument("--cache-dir", type=Path, default=Path("./data_cache"))
+    live.add_argument("--dry-run", action="store_true", help="log signals without placing orders")
+    live.add_argument("--log-file", type=Path, help="also write JSON logs of signals and orders here")
+    live.set_defaults(handler=_live)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    from loguru import logger
+
+    logger.remove()
+    logger.add(sys.stderr, level=args.log_level.upper())
+    if args.metrics_port is not None:
+        from crypto.monitoring.metrics import start_metrics_server
+
+        try:
+            start_metrics_server(args.metrics_port, args.metrics_addr)
+        except (RuntimeError, OSError) as exc:
+            logger.error(f"Cannot serve metrics: {exc}")
+            return 1
+        logger.info(f"Serving metrics on http://{args.metrics_addr}:{args.metrics_port}/metrics")
+    handler: Callable[[argparse.Namespace], int] = args.handler
+    return handler(args)
+
@@ -1,6 +1,18 @@
 """Data utilities."""
 
+from .cache import AsyncTTLCache
 from .collector import DataCollector
 from .history import HistoricalDataManager, OHLCVConfig
+from .social import GalaxyScoreStore
+from .stream import Bar, BarAggregator, MarketDataStream
 
-__all__ = ["DataCollector", "HistoricalDataManager", "OHLCVConfig"]
+__all__ = [
+    "AsyncTTLCache",
+    "Bar",
+    "BarAggregator",
+    "DataCollector",
+    "GalaxyScoreStore",
+    "HistoricalDataManager",
+    "MarketDataStream",
+    "OHLCVConfig",
+]
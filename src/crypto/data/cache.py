@@ -0,0 +1,94 @@
+"""In-process cache for async API calls."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class AsyncTTLCache:
+    """Bounded LRU cache with per-entry TTL and request coalescing.
+
+    Concurrent :meth:`get_or_fetch` calls for a key that is being fetched
+    await the same in-flight request instead of issuing their own. The
+    request runs as its own task, so cancelling one caller leaves it running
+    for the others and its result is still cached. Failed fetches are not
+    cached.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 60.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "size": len(self._entries),
+        }
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    async def get_or_fetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[T]],
+        ttl: Optional[float] = None,
+    ) -> T:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(self._fetch(key, fetch, ttl))
+            task.add_done_callback(_retrieve)
+            self._inflight[key] = task
+        # A cancelled caller must not cancel the fetch the others wait for
+        return await asyncio.shield(task)
+
+    async def _fetch(
+        self, key: Hashable, fetch: Callable[[], Awaitable[T]], ttl: Optional[float]
+    ) -> T:
+        try:
+            value = await fetch()
+        finally:
+            del self._inflight[key]
+
+        ttl = self.ttl if ttl is None else ttl
+        if ttl > 0:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+
+def _retrieve(task: asyncio.Future) -> None:
+    # Mark a failure retrieved in case every caller was cancelled
+    if not task.cancelled():
+        task.exception()
@@ -1,30 +1,58 @@
 import asyncio
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 import aiohttp
 from loguru import logger
 
+from crypto.monitoring.metrics import timed
+from .cache import AsyncTTLCache
+
 
 class DataCollector:
-    """Fetch market and social data asynchronously."""
+    """Fetch market and social data asynchronously.
+
+    Responses are cached per endpoint for ``ttls`` seconds in ``cache`` and
+    concurrent requests for the same data share one outbound call.
+    """
 
     WHITEBIT_URL = "https://whitebit.com/api/v4/public/markets"
     LUNARCRUSH_URL = "https://api.lunarcrush.com/v2"
-
-    def __init__(self, session: aiohttp.ClientSession) -> None:
+    DEFAULT_TTLS = {"markets": 30.0, "lunarcrush": 300.0}
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        cache: Optional[AsyncTTLCache] = None,
+        ttls: Optional[Dict[str, float]] = None,
+    ) -> None:
         self.session = session
+        self.cache = cache if cache is not None else AsyncTTLCache()
+        self.ttls = {**self.DEFAULT_TTLS, **(ttls or {})}
 
-    async def fetch_whitebit_markets(self) -> Dict[str, Any]:
-        logger.debug("Fetching WhiteBIT markets")
-        async with self.session.get(self.WHITEBIT_URL) as resp:
+    async def _get_json(self, url: str, params: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        async with self.session.get(url, params=params) as resp:
+            # Error responses raise, so the cache never keeps them
+            resp.raise_for_status()
             return await resp.json()
 
+    async def fetch_whitebit_markets(self) -> Dict[str, Any]:
+        async def fetch() -> Dict[str, Any]:
+            logger.debug("Fetching WhiteBIT markets")
+            return await self._get_json(self.WHITEBIT_URL)
+
+        return await self.cache.get_or_fetch(("markets",), fetch, self.ttls["markets"])
+
     async def fetch_lunarcrush_data(self, symbol: str, api_key: str) -> Dict[str, Any]:
-        logger.debug("Fetching LunarCrush data for %s", symbol)
-        params = {"symbol": symbol, "key": api_key}
-        async with self.session.get(f"{self.LUNARCRUSH_URL}/assets", params=params) as resp:
-            return await resp.json()
+        async def fetch() -> Dict[str, Any]:
+            logger.debug("Fetching LunarCrush data for %s", symbol)
+            params = {"symbol": symbol, "key": api_key}
+            return await self._get_json(f"{self.LUNARCRUSH_URL}/assets", params)
+
+        return await self.cache.get_or_fetch(
+            ("lunarcrush", symbol), fetch, self.ttls["lunarcrush"]
+        )
 
+    @timed("collector.collect")
     async def collect(self, symbol: str, api_key: str) -> Dict[str, Any]:
         market_task = self.fetch_whitebit_markets()
         lunar_task = self.fetch_lunarcrush_data(symbol, api_key)
@@ -2,15 +2,144 @@ from __future__ import annotations
 
 """Historical data management utilities."""
 
-from dataclasses import dataclass
-from datetime import datetime
+import asyncio
+import re
+import struct
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
 
 import aiohttp
+import numpy as np
 import pandas as pd
 from loguru import logger
 
+from crypto.monitoring.metrics import timed
+from crypto.ratelimit import AsyncTokenBucket
+from .store import PartitionedOHLCVStore, Range, _atomic_write
+
+_TIMEFRAME_UNITS = {"m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def timeframe_seconds(timeframe: str) -> int:
+    """Return the length of a timeframe such as ``"15m"`` or ``"4h"`` in seconds."""
+    match = re.fullmatch(r"(\d+)([mhdw])", timeframe)
+    if not match:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    return int(match.group(1)) * _TIMEFRAME_UNITS[match.group(2)]
+
+
+# Weekly bars open on Monday; the epoch fell on a Thursday
+_WEEK_ORIGIN = 4 * 86400
+_AGGREGATION = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+
+
+def _bucket_origin(step: int) -> int:
+    return _WEEK_ORIGIN if step % 604800 == 0 else 0
+
+
+def bar_start(ts: int, step: int) -> int:
+    """Open time of the ``step``-second bar containing epoch second ``ts``."""
+    origin = _bucket_origin(step)
+    return (ts - origin) // step * step + origin
+
+
+def resample_ohlcv(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """Aggregate OHLCV bars into ``timeframe`` bars.
+
+    Bars are grouped by the open time of the higher-timeframe bar they fall
+    in: first open, highest high, lowest low, last close and summed volume.
+    Periods without any input bar produce no output bar.
+    """
+    if df.empty:
+        return df
+    step = timeframe_seconds(timeframe)
+    seconds = pd.DatetimeIndex(df.index).asi8 // 10 ** 9
+    buckets = pd.to_datetime(bar_start(seconds, step), unit="s")
+    columns = {c: how for c, how in _AGGREGATION.items() if c in df.columns}
+    out = df[list(columns)].groupby(buckets).agg(columns)
+    return out.rename_axis(df.index.name)
+
+
+# About seven significant digits: below a tick for typical prices, and
+# volumes stay fractional (base-asset amounts) so they are not integers
+COMPACT_DTYPES = {c: np.float32 for c in _AGGREGATION}
+
+
+def compact_ohlcv(df: pd.DataFrame) -> pd.DataFrame:
+    """Return ``df`` with its OHLCV columns as float32.
+
+    The index stays a ``DatetimeIndex``, which is already stored as int64
+    epoch nanoseconds. Halves the memory of a frame of bars; indicators
+    and backtests still compute in float64 internally.
+    """
+    columns = {c: t for c, t in COMPACT_DTYPES.items() if c in df.columns}
+    return df.astype(columns, copy=False) if columns else df
+
+
+def _epoch(dt: datetime) -> int:
+    """Epoch seconds of ``dt``; naive datetimes are UTC, not local time."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def _naive_utc(dt: datetime) -> datetime:
+    """``dt`` as a naive UTC datetime, the convention of the cached index."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _merge_ranges(ranges: List[Range]) -> List[Range]:
+    """Merge overlapping or touching inclusive ``(start, end)`` ranges."""
+    merged: List[Range] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _concat_bars(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame()
+    df = pd.concat(frames).sort_index()
+    return df[~df.index.duplicated(keep="last")]
+
+
+def _missing_ranges(covered: List[Range], start: int, end: int, step: int) -> List[Range]:
+    """Return the parts of ``[start, end]`` outside ``covered`` that hold a bar."""
+    gaps: List[Range] = []
+    cursor = start
+    for lo, hi in _merge_ranges(covered):
+        if hi < cursor:
+            continue
+        if lo > end:
+            break
+        if lo > cursor:
+            gaps.append((cursor, lo - 1))
+        cursor = hi + 1
+    if cursor <= end:
+        gaps.append((cursor, end))
+    # A gap shorter than a bar may not contain any bar open time at all
+    return [(lo, hi) for lo, hi in gaps if -(-lo // step) * step <= hi]
+
+
+def _complete_slots(covered: List[Range], starts: np.ndarray, length: int) -> np.ndarray:
+    """Which ``[start, start + length - 1]`` slots lie inside one covered range."""
+    merged = _merge_ranges(covered)
+    if not merged:
+        return np.zeros(len(starts), dtype=bool)
+    lo, hi = np.array(merged).T
+    pos = np.searchsorted(lo, starts, side="right") - 1
+    return (pos >= 0) & (hi[np.maximum(pos, 0)] >= starts + length - 1)
+
 
 @dataclass
 class OHLCVConfig:
@@ -20,6 +149,10 @@ class OHLCVConfig:
     end: Optional[datetime] = None
     limit: int = 1000
     cache_dir: Path = Path("./data_cache")
+    # Build ``timeframe`` locally from bars of this finer timeframe
+    base_timeframe: Optional[str] = None
+    # Cache and return float32 bars; see ``compact_ohlcv``
+    compact: bool = False
 
 
 class HistoricalDataManager:
@@ -27,10 +160,58 @@ class HistoricalDataManager:
 
     BASE_URL = "https://whitebit.com/api/v4/public/kline"
 
-    def __init__(self, session: aiohttp.ClientSession) -> None:
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        max_concurrency: int = 4,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        requests_per_second: float = 10.0,
+    ) -> None:
         self.session = session
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.requests_per_second = requests_per_second
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._limiters: Dict[str, AsyncTokenBucket] = {}
+        self._store_locks: Dict[Path, asyncio.Lock] = {}
+
+    def _store_lock(self, store: PartitionedOHLCVStore) -> asyncio.Lock:
+        """Lock serializing the coverage read-fetch-write of one store.
+
+        Without it, concurrent requests for one series would each save the
+        manifest they loaded before fetching, and the last one would drop
+        the ranges the others added.
+        """
+        return self._store_locks.setdefault(store.root, asyncio.Lock())
 
-    async def _fetch_chunk(self, cfg: OHLCVConfig, start_ts: int, end_ts: int) -> pd.DataFrame:
+    def _limiter(self, url: str) -> AsyncTokenBucket:
+        host = urlparse(url).netloc
+        if host not in self._limiters:
+            self._limiters[host] = AsyncTokenBucket(self.requests_per_second)
+        return self._limiters[host]
+
+    async def _get_json(self, url: str, params: Dict[str, object]):
+        """GET ``url`` honouring the host rate limit, retrying with backoff."""
+        limiter = self._limiter(url)
+        for attempt in range(self.max_retries + 1):
+            await limiter.acquire()
+            try:
+                async with self.session.get(url, params=params) as resp:
+                    resp.raise_for_status()
+                    return await resp.json()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff * 2 ** attempt
+                logger.warning(f"Request failed ({e}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    @timed("history.fetch_chunk")
+    async def _fetch_chunk(
+        self, cfg: OHLCVConfig, start_ts: int, end_ts: int
+    ) -> Optional[pd.DataFrame]:
+        """Bars of one window; empty if the exchange has none, None on failure."""
         params = {
             "market": cfg.symbol,
             "interval": cfg.timeframe,
@@ -41,13 +222,11 @@ class HistoricalDataManager:
         logger.debug("Fetching OHLCV chunk: %s", params)
 
         try:
-            async with self.session.get(self.BASE_URL, params=params) as resp:
-                resp.raise_for_status()
-                data = await resp.json()
+            data = await self._get_json(self.BASE_URL, params)
 
-            if not data or not isinstance(data, list):
-                logger.warning("Empty or invalid response from API")
-                return pd.DataFrame()
+            if not isinstance(data, list):
+                logger.warning("Invalid response from API")
+                return None
 
             df = pd.DataFrame(data)
             if df.empty:
@@ -56,7 +235,7 @@ class HistoricalDataManager:
             expected_cols = ["timestamp", "open", "high", "low", "close", "volume"]
             if len(df.columns) < len(expected_cols):
                 logger.error(f"Unexpected data format: {df.columns}")
-                return pd.DataFrame()
+                return None
 
             df.columns = expected_cols[: len(df.columns)]
             df["timestamp"] = pd.to_datetime(df["timestamp"], unit="s")
@@ -71,29 +250,247 @@ class HistoricalDataManager:
             
         except Exception as e:
             logger.error(f"Failed to fetch data: {e}")
-            return pd.DataFrame()
+            return None
+
+    def _windows(self, cfg: OHLCVConfig, start_ts: int, end_ts: int) -> List[Tuple[int, int]]:
+        """Split ``[start_ts, end_ts]`` into ranges of at most ``cfg.limit`` bars."""
+        step = timeframe_seconds(cfg.timeframe) * cfg.limit
+        return [(s, min(s + step - 1, end_ts)) for s in range(start_ts, end_ts + 1, step)]
+
+    async def _fetch_windows(
+        self, cfg: OHLCVConfig, start_ts: int, end_ts: int
+    ) -> List[Tuple[Range, Optional[pd.DataFrame]]]:
+        """Fetch ``[start_ts, end_ts]`` as concurrent ``limit``-sized chunks.
+
+        Returns each window with its bars, or with None if its request
+        failed.
+        """
+
+        async def fetch(window: Range) -> Optional[pd.DataFrame]:
+            async with self._semaphore:
+                return await self._fetch_chunk(cfg, *window)
+
+        windows = self._windows(cfg, start_ts, end_ts)
+        return list(zip(windows, await asyncio.gather(*(fetch(w) for w in windows))))
+
+    async def _fetch_range(self, cfg: OHLCVConfig, start_ts: int, end_ts: int) -> pd.DataFrame:
+        """Fetch an arbitrarily long range as concurrent ``limit``-sized chunks."""
+        windows = await self._fetch_windows(cfg, start_ts, end_ts)
+        return _concat_bars([df for _, df in windows if df is not None])
 
     async def fetch_ohlcv(self, cfg: OHLCVConfig) -> pd.DataFrame:
-        """Load OHLCV data, using cached files when possible."""
-        cfg.cache_dir.mkdir(parents=True, exist_ok=True)
-        cache_file = cfg.cache_dir / f"{cfg.symbol}_{cfg.timeframe}.parquet"
+        """Load OHLCV data, fetching only the ranges the cache does not cover.
 
-        if cache_file.exists():
-            logger.debug("Loading OHLCV from cache %s", cache_file)
-            df = pd.read_parquet(cache_file)
-        else:
-            df = pd.DataFrame()
+        Bars are cached in a :class:`PartitionedOHLCVStore` whose manifest
+        records which time ranges have been downloaded, so holes anywhere in
+        the requested range are filled and a fully covered request makes no
+        network calls. Concurrent requests for one series take turns, so each
+        sees the ranges the previous one added.
+
+        With ``cfg.base_timeframe`` set, bars are aggregated from the cached
+        base series instead; see :meth:`_fetch_resampled`. With
+        ``cfg.compact`` the bars are cached and returned as float32, in stores
+        separate from the float64 ones.
+        """
+        if cfg.base_timeframe and cfg.base_timeframe != cfg.timeframe:
+            return await self._fetch_resampled(cfg)
+        store = self._store(cfg, cfg.timeframe)
+        start, end = self._resolve_range(cfg, store)
+
+        async with self._store_lock(store):
+            logger.debug(f"Loading OHLCV from cache {store.root}")
+            df = store.read(start, end)
+            covered = store.load_coverage() or []
+            step = timeframe_seconds(cfg.timeframe)
+            gaps = _missing_ranges(covered, _epoch(start), _epoch(end), step)
+            if gaps:
+                logger.debug(f"Fetching {len(gaps)} missing ranges for {cfg.symbol}")
+                fetched = await asyncio.gather(*(self._fetch_windows(cfg, lo, hi) for lo, hi in gaps))
+                # The bar that is still open must be fetched again next time
+                closed_until = int(time.time()) // step * step - 1
+                # A failed request leaves its hole to be retried by the next
+                # call; a window the exchange has no bars for is covered
+                new_frames = []
+                for (lo, hi), new_df in (w for windows in fetched for w in windows):
+                    if new_df is None:
+                        continue
+                    if not new_df.empty:
+                        new_frames.append(new_df)
+                    if lo <= closed_until:
+                        covered.append((lo, min(hi, closed_until)))
+                if new_frames:
+                    new_df = pd.concat(new_frames)
+                    if cfg.compact:
+                        new_df = compact_ohlcv(new_df)
+                    store.write(new_df)
+                    df = pd.concat([df, new_df]).sort_index()
+                    df = df[~df.index.duplicated(keep="last")]
+                store.save_coverage(_merge_ranges(covered))
+        df = df.rename_axis(PartitionedOHLCVStore.INDEX)
+        if cfg.compact:
+            df = compact_ohlcv(df)
+        return df.loc[(df.index >= start) & (df.index <= end)]
 
-        start = cfg.start or (df.index.max().to_pydatetime() if not df.empty else None)
+    @staticmethod
+    def _store(cfg: OHLCVConfig, key: str) -> PartitionedOHLCVStore:
+        """Store for ``key``; compact bars are kept apart from float64 ones."""
+        return PartitionedOHLCVStore(cfg.cache_dir, cfg.symbol, f"{key}_f32" if cfg.compact else key)
+
+    @staticmethod
+    def _resolve_range(
+        cfg: OHLCVConfig, store: PartitionedOHLCVStore
+    ) -> Tuple[datetime, datetime]:
+        start = cfg.start
+        if start is None:
+            last = store.last_timestamp()
+            start = last.to_pydatetime() if last is not None else None
         end = cfg.end
+        now = datetime.now(timezone.utc)
         if start is None:
-            start = datetime.utcnow()  # default start - no data
+            start = now  # default start - no data
         if end is None:
-            end = datetime.utcnow()
+            end = now
+        return _naive_utc(start), _naive_utc(end)
+
+    async def _fetch_resampled(self, cfg: OHLCVConfig) -> pd.DataFrame:
+        """Build ``cfg.timeframe`` bars from ``cfg.base_timeframe`` bars.
+
+        The base series is loaded through :meth:`fetch_ohlcv`, so it is
+        downloaded and cached once and shared by every higher timeframe.
+        Closed aggregated bars are kept in their own store, keyed
+        ``{symbol}_{timeframe}_from_{base}``, with a coverage manifest, so a
+        repeated request only aggregates the bars that closed since. A bar
+        is only cached once its whole base range is in the base store's
+        coverage; bars over a failed base download, like the bar still in
+        progress, are rebuilt on every call and never cached.
+        """
+        step = timeframe_seconds(cfg.timeframe)
+        base_step = timeframe_seconds(cfg.base_timeframe)
+        if step <= base_step or step % base_step:
+            raise ValueError(
+                f"Cannot build {cfg.timeframe} bars from {cfg.base_timeframe} bars"
+            )
+        store = self._store(cfg, f"{cfg.timeframe}_from_{cfg.base_timeframe}")
+        base_store = self._store(cfg, cfg.base_timeframe)
+        start, end = self._resolve_range(cfg, store)
+        start_ts = bar_start(_epoch(start), step)
+        end_ts = _epoch(end)
 
-        if df.empty or df.index.max() < end:
-            new_df = await self._fetch_chunk(cfg, int(start.timestamp()), int(end.timestamp()))
-            df = pd.concat([df, new_df]).sort_index().drop_duplicates()
-            if not df.empty:
-                df.to_parquet(cache_file)
+        open_bars = []
+        async with self._store_lock(store):
+            covered = store.load_coverage() or []
+            gaps = _missing_ranges(covered, start_ts, end_ts, step)
+            if gaps:
+                base_cfg = replace(cfg, timeframe=cfg.base_timeframe, base_timeframe=None)
+                # Extend each gap to whole bars of the target timeframe. The
+                # base store's lock makes these spans load one after another.
+                spans = [(lo, bar_start(hi, step) + step - 1) for lo, hi in gaps]
+                frames = await asyncio.gather(*(
+                    self.fetch_ohlcv(replace(
+                        base_cfg,
+                        start=datetime.fromtimestamp(lo, timezone.utc),
+                        end=datetime.fromtimestamp(hi, timezone.utc),
+                    ))
+                    for lo, hi in spans
+                ))
+                closed_until = bar_start(int(time.time()), step) - 1
+                base_covered = base_store.load_coverage() or []
+                for (lo, hi), base in zip(spans, frames):
+                    # Closed bars whose base bars were all downloaded
+                    slots = np.arange(bar_start(lo, step), min(hi, closed_until) + 1, step)
+                    slots = slots[_complete_slots(base_covered, slots, step)]
+                    covered.extend((int(t), int(t) + step - 1) for t in slots)
+                    if base.empty:
+                        continue
+                    bars = resample_ohlcv(base, cfg.timeframe)
+                    complete = np.isin(pd.DatetimeIndex(bars.index).asi8 // 10 ** 9, slots)
+                    store.write(bars[complete])
+                    open_bars.append(bars[~complete])
+                store.save_coverage(_merge_ranges(covered))
+
+        frames = [f for f in (store.read(start, end), *open_bars) if not f.empty]
+        if not frames:
+            return pd.DataFrame()
+        df = pd.concat(frames).sort_index()
+        df = df[~df.index.duplicated(keep="last")].rename_axis(PartitionedOHLCVStore.INDEX)
+        if cfg.compact:
+            df = compact_ohlcv(df)
         return df.loc[(df.index >= start) & (df.index <= end)]
+
+
+COLUMNAR_MAGIC = b"OHLCVCOL"
+# magic, dtype string (e.g. "<f8"), element count, reserved
+_COLUMNAR_HEADER = struct.Struct("<8s8sq8x")
+_PRICE_COLUMNS = ("open", "high", "low", "close")
+
+
+def export_columnar(
+    df: pd.DataFrame, directory: Path, price_dtype: np.dtype | str = np.float64
+) -> Path:
+    """Write ``df`` as one fixed-dtype binary file per column.
+
+    The index is stored as int64 epoch nanoseconds in ``timestamp.col``;
+    OHLC columns use ``price_dtype`` and any other column float64. Each file
+    starts with a 32 byte header so :func:`load_columnar` can memory-map it.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    columns = {"timestamp": pd.DatetimeIndex(df.index).asi8}
+    for col in df.columns:
+        dtype = price_dtype if col in _PRICE_COLUMNS else np.float64
+        columns[str(col)] = df[col].to_numpy(dtype=dtype)
+
+    for name, values in columns.items():
+        values = np.ascontiguousarray(values)
+        header = _COLUMNAR_HEADER.pack(
+            COLUMNAR_MAGIC, values.dtype.str.encode(), len(values)
+        )
+
+        def write(path: Path, header=header, values=values) -> None:
+            with open(path, "wb") as fh:
+                fh.write(header)
+                values.tofile(fh)
+
+        _atomic_write(directory / f"{name}.col", write)
+    return directory
+
+
+def _map_column(path: Path) -> np.memmap:
+    with open(path, "rb") as fh:
+        magic, dtype, count = _COLUMNAR_HEADER.unpack(fh.read(_COLUMNAR_HEADER.size))
+    if magic != COLUMNAR_MAGIC:
+        raise ValueError(f"{path} is not a columnar OHLCV file")
+    return np.memmap(
+        path,
+        dtype=np.dtype(dtype.rstrip(b"\0").decode()),
+        mode="r",
+        offset=_COLUMNAR_HEADER.size,
+        shape=(count,),
+    )
+
+
+def load_columnar(
+    directory: Path,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> pd.DataFrame:
+    """Open a :func:`export_columnar` directory without reading it into RAM.
+
+    Columns are read-only views on ``numpy.memmap`` arrays, so processes
+    loading the same files share the OS page cache. ``start``/``end`` are
+    located with a binary search on the timestamp column.
+    """
+    directory = Path(directory)
+    timestamps = _map_column(directory / "timestamp.col")
+    lo = 0 if start is None else int(np.searchsorted(timestamps, pd.Timestamp(start).value, "left"))
+    hi = len(timestamps) if end is None else int(np.searchsorted(timestamps, pd.Timestamp(end).value, "right"))
+
+    columns = {
+        path.stem: _map_column(path)[lo:hi]
+        for path in sorted(directory.glob("*.col"))
+        if path.stem != "timestamp"
+    }
+    index = pd.DatetimeIndex(timestamps[lo:hi].view("datetime64[ns]"), name=PartitionedOHLCVStore.INDEX)
+    ordered = [c for c in ("open", "high", "low", "close", "volume") if c in columns]
+    ordered += [c for c in columns if c not in ordered]
+    return pd.DataFrame({c: columns[c] for c in ordered}, index=index, copy=False)
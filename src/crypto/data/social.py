@@ -0,0 +1,78 @@
+"""Time series of LunarCrush galaxy scores kept next to the OHLCV cache."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from .store import _atomic_write
+
+
+class GalaxyScoreStore:
+    """Galaxy score observations of one symbol in a single parquet file.
+
+    Observations live in ``cache_dir/{symbol}_galaxy_score.parquet`` as a
+    series indexed by observation time. Backtests as-of join it to their
+    bars (see :func:`~crypto.strategy.engine.align_galaxy_score`), so a bar
+    only ever sees scores published before it.
+    """
+
+    INDEX = "timestamp"
+    NAME = "galaxy_score"
+
+    def __init__(self, cache_dir: Path, symbol: str) -> None:
+        self.path = Path(cache_dir) / f"{symbol}_{self.NAME}.parquet"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def read(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> pd.Series:
+        if not self.path.exists():
+            return pd.Series(
+                dtype=float, name=self.NAME, index=pd.DatetimeIndex([], name=self.INDEX)
+            )
+        series = pd.read_parquet(self.path)[self.NAME]
+        # Keep the last observation before ``start`` for the as-of join
+        if start is not None:
+            first = max(series.index.searchsorted(pd.Timestamp(start), side="right") - 1, 0)
+            series = series.iloc[first:]
+        if end is not None:
+            series = series.loc[:pd.Timestamp(end)]
+        return series
+
+    def write(self, series: pd.Series) -> pd.Series:
+        """Merge ``series`` into the stored observations; new values win."""
+        series = pd.Series(series, dtype=float, name=self.NAME).dropna()
+        series.index = pd.DatetimeIndex(series.index, name=self.INDEX)
+        if self.path.exists():
+            series = pd.concat([pd.read_parquet(self.path)[self.NAME], series])
+        series = series[~series.index.duplicated(keep="last")].sort_index()
+        frame = series.to_frame()
+        _atomic_write(self.path, frame.to_parquet)
+        return series
+
+    def record(self, response: Dict[str, Any], at: Optional[datetime] = None) -> pd.Series:
+        """Store the scores of a LunarCrush ``assets`` response.
+
+        The ``timeSeries`` points are used when the response has them,
+        otherwise the asset's current score stamped with its ``time`` (or
+        ``at``, or now).
+        """
+        asset = (response.get("data") or [{}])[0]
+        points = [p for p in asset.get("timeSeries") or [] if p.get(self.NAME) is not None]
+        if points:
+            index = pd.to_datetime([p["time"] for p in points], unit="s")
+            series = pd.Series([p[self.NAME] for p in points], index=index)
+        elif asset.get(self.NAME) is not None:
+            if at is None:
+                at = pd.Timestamp(asset["time"], unit="s") if "time" in asset else pd.Timestamp.utcnow()
+            stamp = pd.Timestamp(at)
+            if stamp.tz is not None:
+                stamp = stamp.tz_convert(None)
+            series = pd.Series([asset[self.NAME]], index=[stamp])
+        else:
+            return self.read()
+        return self.write(series)
@@ -0,0 +1,115 @@
+"""Time-partitioned parquet storage for cached OHLCV bars."""
+
+from __future__ import annotations
+
+import json
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pandas as pd
+from loguru import logger
+
+Range = Tuple[int, int]
+
+
+def _atomic_write(path: Path, write) -> None:
+    """Write through a temporary file and rename it over ``path``."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+class PartitionedOHLCVStore:
+    """OHLCV bars of one symbol and timeframe stored as monthly parquet files.
+
+    Partitions live in ``cache_dir/{symbol}_{timeframe}/YYYY-MM.parquet``.
+    Writes only rewrite the months touched by the new bars, and every file is
+    replaced atomically so readers never see a partial write. Reads open only
+    the partitions overlapping the requested range and push the time filter
+    down to the parquet reader.
+    """
+
+    INDEX = "timestamp"
+
+    def __init__(self, cache_dir: Path, symbol: str, timeframe: str) -> None:
+        self.root = Path(cache_dir) / f"{symbol}_{timeframe}"
+        self.coverage_file = self.root / "coverage.json"
+        self._legacy_file = Path(cache_dir) / f"{symbol}_{timeframe}.parquet"
+        self._legacy_coverage = Path(cache_dir) / f"{symbol}_{timeframe}.coverage.json"
+        self.root.mkdir(parents=True, exist_ok=True)
+        if self._legacy_file.exists():
+            self._migrate()
+
+    def _partition(self, month: pd.Period) -> Path:
+        return self.root / f"{month.strftime('%Y-%m')}.parquet"
+
+    def partitions(self) -> List[Path]:
+        return sorted(self.root.glob("????-??.parquet"))
+
+    def read(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        files = self.partitions()
+        if start is not None:
+            first = self._partition(pd.Timestamp(start).to_period("M")).name
+            files = [f for f in files if f.name >= first]
+        if end is not None:
+            last = self._partition(pd.Timestamp(end).to_period("M")).name
+            files = [f for f in files if f.name <= last]
+        if not files:
+            return pd.DataFrame()
+
+        filters = []
+        if start is not None:
+            filters.append((self.INDEX, ">=", pd.Timestamp(start)))
+        if end is not None:
+            filters.append((self.INDEX, "<=", pd.Timestamp(end)))
+        frames = [pd.read_parquet(f, filters=filters or None) for f in files]
+        return pd.concat(frames).sort_index()
+
+    def last_timestamp(self) -> Optional[pd.Timestamp]:
+        files = self.partitions()
+        if not files:
+            return None
+        return pd.read_parquet(files[-1]).index.max()
+
+    def write(self, df: pd.DataFrame) -> None:
+        """Merge ``df`` into the partitions its bars fall in."""
+        if df.empty:
+            return
+        df = df.rename_axis(self.INDEX)
+        for month, bars in df.groupby(df.index.to_period("M")):
+            path = self._partition(month)
+            if path.exists():
+                bars = pd.concat([pd.read_parquet(path), bars]).sort_index()
+                bars = bars[~bars.index.duplicated(keep="last")]
+            else:
+                bars = bars.sort_index()
+            _atomic_write(path, bars.to_parquet)
+
+    def load_coverage(self) -> Optional[List[Range]]:
+        if not self.coverage_file.exists():
+            return None
+        return [tuple(r) for r in json.loads(self.coverage_file.read_text())["ranges"]]
+
+    def save_coverage(self, ranges: List[Range]) -> None:
+        payload = json.dumps({"ranges": ranges})
+        _atomic_write(self.coverage_file, lambda p: p.write_text(payload))
+
+    def _migrate(self) -> None:
+        """Split a single-file cache from older versions into partitions."""
+        logger.info(f"Migrating {self._legacy_file} to partitioned store")
+        df = pd.read_parquet(self._legacy_file)
+        self.write(df)
+        if self._legacy_coverage.exists():
+            os.replace(self._legacy_coverage, self.coverage_file)
+        elif not df.empty and not self.coverage_file.exists():
+            span = (int(df.index.min().timestamp()), int(df.index.max().timestamp()))
+            self.save_coverage([span])
+        self._legacy_file.unlink()
@@ -0,0 +1,169 @@
+"""Streaming market data ingestion over the WhiteBIT WebSocket API."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+import websockets
+from loguru import logger
+
+from .history import timeframe_seconds
+
+
+@dataclass
+class Bar:
+    market: str
+    start: int  # bar open time, epoch seconds
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+
+class BarAggregator:
+    """Fold trades or candle updates into fixed-interval bars per market.
+
+    A bar is complete once data for a later interval arrives; updates for an
+    interval that was already emitted are counted in ``late`` and dropped.
+    """
+
+    def __init__(self, interval: int) -> None:
+        self.interval = interval
+        self._current: Dict[str, Bar] = {}
+        self.late = 0
+
+    def add_trade(self, market: str, time: float, price: float, amount: float) -> Optional[Bar]:
+        start = int(time) // self.interval * self.interval
+        bar = self._current.get(market)
+        if bar is not None and start == bar.start:
+            bar.high = max(bar.high, price)
+            bar.low = min(bar.low, price)
+            bar.close = price
+            bar.volume += amount
+            return None
+        if bar is not None and start < bar.start:
+            self.late += 1
+            return None
+        self._current[market] = Bar(market, start, price, price, price, price, amount)
+        return bar
+
+    def add_candle(self, market: str, candle: Bar) -> Optional[Bar]:
+        bar = self._current.get(market)
+        if bar is not None and candle.start < bar.start:
+            self.late += 1
+            return None
+        self._current[market] = candle
+        if bar is not None and candle.start > bar.start:
+            return bar
+        return None
+
+    def flush(self) -> List[Bar]:
+        """Return and forget the bars still in progress."""
+        bars = list(self._current.values())
+        self._current.clear()
+        return bars
+
+
+class MarketDataStream:
+    """Subscribe to many markets and publish completed bars on ``queue``.
+
+    ``channel`` is ``"trades"`` (bars are built from individual trades) or
+    ``"candles"`` (exchange klines of ``timeframe``). ``queue`` is bounded, so
+    when consumers fall behind the reader stops pulling from the socket
+    instead of buffering without limit. Dropped connections and protocol
+    errors re-open the connection with exponential backoff and subscribe
+    all markets again. Malformed messages are logged, counted in
+    ``malformed`` and skipped.
+    """
+
+    URL = "wss://api.whitebit.com/ws"
+
+    def __init__(
+        self,
+        markets: Iterable[str],
+        timeframe: str = "1m",
+        channel: str = "trades",
+        url: Optional[str] = None,
+        queue_maxsize: int = 10_000,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+    ) -> None:
+        if channel not in {"trades", "candles"}:
+            raise ValueError(f"Unsupported channel: {channel}")
+        self.markets = list(markets)
+        self.channel = channel
+        self.url = url or self.URL
+        self.interval = timeframe_seconds(timeframe)
+        self.queue: asyncio.Queue[Bar] = asyncio.Queue(maxsize=queue_maxsize)
+        self.aggregator = BarAggregator(self.interval)
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.messages = 0
+        self.reconnects = 0
+        self.malformed = 0
+        self._running = False
+
+    def _subscriptions(self) -> List[Dict[str, Any]]:
+        if self.channel == "trades":
+            return [{"id": 1, "method": "trades_subscribe", "params": self.markets}]
+        return [
+            {"id": n, "method": "candles_subscribe", "params": [m, self.interval]}
+            for n, m in enumerate(self.markets, start=1)
+        ]
+
+    async def run(self) -> None:
+        """Stream until :meth:`stop` is called."""
+        self._running = True
+        delay = self.reconnect_delay
+        while self._running:
+            try:
+                async with websockets.connect(self.url) as ws:
+                    for sub in self._subscriptions():
+                        await ws.send(json.dumps(sub))
+                    logger.info(f"Streaming {self.channel} for {len(self.markets)} markets")
+                    delay = self.reconnect_delay
+                    async for raw in ws:
+                        try:
+                            await self._handle(raw)
+                        except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+                            self.malformed += 1
+                            logger.warning(f"Skipping malformed stream message: {e!r}")
+                        if not self._running:
+                            break
+            except (OSError, asyncio.TimeoutError, websockets.WebSocketException) as e:
+                logger.warning(f"Market data stream disconnected: {e}")
+            if self._running:
+                self.reconnects += 1
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+    def stop(self) -> None:
+        self._running = False
+
+    async def _handle(self, raw: str | bytes) -> None:
+        msg = json.loads(raw)
+        method = msg.get("method")
+        if method == "trades_update":
+            self.messages += 1
+            market, trades = msg["params"]
+            for trade in sorted(trades, key=lambda t: t["time"]):
+                bar = self.aggregator.add_trade(
+                    market, float(trade["time"]), float(trade["price"]), float(trade["amount"])
+                )
+                if bar is not None:
+                    await self.queue.put(bar)
+        elif method == "candles_update":
+            self.messages += 1
+            for ts, open_, close, high, low, volume, _deal, market in msg["params"]:
+                candle = Bar(
+                    market, int(ts), float(open_), float(high), float(low), float(close), float(volume)
+                )
+                bar = self.aggregator.add_candle(market, candle)
+                if bar is not None:
+                    await self.queue.put(bar)
+        elif msg.get("error"):
+            logger.error(f"Stream error: {msg['error']}")
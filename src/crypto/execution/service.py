@@ -1,13 +1,30 @@
 from __future__ import annotations
 
-from typing import Dict, Any
+import asyncio
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterable, List, Optional
 
-import ccxt
 from loguru import logger
 
+from crypto.monitoring.metrics import timed
+from crypto.ratelimit import AsyncTokenBucket
+
+# ccxt takes about half a second to import, so it is only loaded once an
+# exchange client is actually needed.
+
+
+def _retryable_errors() -> tuple:
+    import ccxt
+
+    return (ccxt.RateLimitExceeded, ccxt.DDoSProtection)
+
 
 class ExecutionService:
     def __init__(self, api_key: str, secret: str, sandbox: bool = False) -> None:
+        import ccxt
+
         self.exchange = ccxt.whitebit({
             'apiKey': api_key,
             'secret': secret,
@@ -15,6 +32,7 @@ class ExecutionService:
         if sandbox:
             self.exchange.set_sandbox_mode(True)
 
+    @timed("execution.create_order")
     def create_order(self, symbol: str, side: str, amount: float, price: float | None = None) -> Dict[str, Any]:
         logger.info("Placing %s order for %s %s", side, amount, symbol)
         try:
@@ -24,3 +42,116 @@ class ExecutionService:
         except Exception as exc:  # pragma: no cover - network
             logger.error("Order failed: %s", exc)
             raise
+
+
+@dataclass
+class OrderRequest:
+    symbol: str
+    side: str
+    amount: float
+    price: Optional[float] = None
+
+
+@dataclass
+class OrderReport:
+    request: OrderRequest
+    order: Dict[str, Any]
+    latency: float  # create_order call to exchange ack, seconds
+    exchange_latency: float  # final request round trip, seconds
+    attempts: int
+
+
+class AsyncExecutionService:
+    """Non-blocking order execution on ccxt's asyncio client.
+
+    Requests pass through a token bucket (``rate`` orders per second, bursts
+    of ``burst``) and at most ``max_in_flight`` orders are outstanding at
+    once. Orders for different symbols are submitted concurrently while
+    orders for the same symbol keep their submission order. Only rate-limit
+    rejections are retried; other errors may have reached the matching
+    engine, so they are raised rather than risking a duplicate order.
+    The last ``history`` order reports are kept in :attr:`reports`.
+    """
+
+    def __init__(
+        self,
+        api_key: str = "",
+        secret: str = "",
+        sandbox: bool = False,
+        rate: float = 5.0,
+        burst: Optional[float] = None,
+        max_in_flight: int = 8,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        exchange: Any = None,
+        history: int = 1000,
+    ) -> None:
+        if exchange is None:
+            import ccxt.async_support as ccxt_async
+
+            # Throttling is done here, not by ccxt's own sleep-based limiter
+            exchange = ccxt_async.whitebit({
+                'apiKey': api_key,
+                'secret': secret,
+                'enableRateLimit': False,
+            })
+            if sandbox:
+                exchange.set_sandbox_mode(True)
+        self.exchange = exchange
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._bucket = AsyncTokenBucket(rate, burst)
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._symbol_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self.reports: Deque[OrderReport] = deque(maxlen=history)
+
+    async def __aenter__(self) -> "AsyncExecutionService":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        await self.exchange.close()
+
+    @timed("execution.create_order_async")
+    async def create_order(
+        self, symbol: str, side: str, amount: float, price: float | None = None
+    ) -> OrderReport:
+        request = OrderRequest(symbol, side, amount, price)
+        submitted = time.perf_counter()
+        async with self._symbol_locks[symbol], self._in_flight:
+            for attempt in range(1, self.max_retries + 2):
+                await self._bucket.acquire()
+                sent = time.perf_counter()
+                try:
+                    if price:
+                        order = await self.exchange.create_limit_order(symbol, side, amount, price)
+                    else:
+                        order = await self.exchange.create_market_order(symbol, side, amount)
+                    break
+                except _retryable_errors() as exc:
+                    if attempt > self.max_retries:
+                        logger.error(f"Order for {symbol} rate limited, giving up: {exc}")
+                        raise
+                    delay = self.backoff * 2 ** (attempt - 1)
+                    logger.warning(f"Order for {symbol} rate limited, retrying in {delay:.2f}s")
+                    await asyncio.sleep(delay)
+                except Exception as exc:
+                    logger.error(f"Order failed: {exc}")
+                    raise
+        acked = time.perf_counter()
+        report = OrderReport(request, order, acked - submitted, acked - sent, attempt)
+        self.reports.append(report)
+        logger.info(
+            f"{side} {amount} {symbol} acked in {report.latency * 1000:.1f} ms "
+            f"({attempt} attempt{'s' if attempt > 1 else ''})"
+        )
+        return report
+
+    async def submit_many(self, requests: Iterable[OrderRequest]) -> List[OrderReport | BaseException]:
+        """Submit ``requests`` concurrently; failures are returned in place."""
+        return await asyncio.gather(
+            *(self.create_order(r.symbol, r.side, r.amount, r.price) for r in requests),
+            return_exceptions=True,
+        )
@@ -0,0 +1,6 @@
+"""Long-running live trading loop."""
+
+from .scheduler import CycleReport, LiveScheduler
+from .trader import SymbolTrader
+
+__all__ = ["CycleReport", "LiveScheduler", "SymbolTrader"]
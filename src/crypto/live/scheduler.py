@@ -0,0 +1,172 @@
+"""Bar-aligned scheduler driving many symbols on one HTTP session."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, Optional
+
+import aiohttp
+from loguru import logger
+
+from crypto.data.history import timeframe_seconds
+from crypto.monitoring.metrics import record_cycle, track
+
+Handler = Callable[[str, aiohttp.ClientSession, float], Awaitable[Any]]
+
+
+@dataclass
+class CycleReport:
+    tick: float  # scheduled start, epoch seconds
+    lag: float  # actual start minus ``tick``
+    duration: float
+    skipped: int  # ticks dropped because the loop was behind
+    results: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, BaseException] = field(default_factory=dict)
+
+
+class LiveScheduler:
+    """Run ``handler(symbol, session, tick)`` for every symbol once per bar.
+
+    Ticks fall ``offset`` seconds after each bar boundary of ``timeframe``
+    (or every ``interval`` seconds when given), so the bar that just closed
+    is available from the exchange. All symbols of a cycle run concurrently,
+    at most ``max_concurrency`` at a time, on one keep-alive
+    ``aiohttp.ClientSession`` that lives as long as the scheduler. An
+    exception or ``symbol_timeout`` in one symbol is logged and recorded in
+    the :class:`CycleReport` without affecting the others.
+
+    Cycles never overlap. If a cycle is still running at the next boundary,
+    the missed ticks are coalesced into one cycle that starts as soon as
+    the loop is free (``coalesce=True``) or dropped in favour of the next
+    boundary (``coalesce=False``). Every cycle reports its lag, and a
+    warning is logged whenever a cycle overruns its bar.
+    """
+
+    def __init__(
+        self,
+        symbols: Iterable[str],
+        handler: Handler,
+        timeframe: str = "1m",
+        interval: Optional[float] = None,
+        offset: float = 1.0,
+        max_concurrency: Optional[int] = None,
+        symbol_timeout: Optional[float] = None,
+        coalesce: bool = True,
+        session: Optional[aiohttp.ClientSession] = None,
+        connection_limit: int = 100,
+        keepalive_timeout: float = 75.0,
+        history: int = 1000,
+    ) -> None:
+        self.symbols = list(symbols)
+        self.handler = handler
+        self.interval = float(interval or timeframe_seconds(timeframe))
+        self.offset = offset
+        self.symbol_timeout = symbol_timeout
+        self.coalesce = coalesce
+        self.session = session
+        self.connection_limit = connection_limit
+        self.keepalive_timeout = keepalive_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency or len(self.symbols) or 1)
+        self._stop = asyncio.Event()
+        self.reports: Deque[CycleReport] = deque(maxlen=history)
+        self.cycles = 0
+        self.skipped = 0
+
+    def _tick(self, bar: int) -> float:
+        return bar * self.interval + self.offset
+
+    def _bar(self, now: float) -> int:
+        """Number of the last bar boundary at or before ``now``."""
+        return int((now - self.offset) // self.interval)
+
+    def next_tick(self, now: float) -> float:
+        """The first tick strictly after ``now``."""
+        return self._tick(self._bar(now) + 1)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    async def _sleep_until(self, when: float) -> None:
+        delay = when - time.time()
+        if delay > 0:
+            try:
+                await asyncio.wait_for(self._stop.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def _open_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.connection_limit, keepalive_timeout=self.keepalive_timeout
+        )
+        return aiohttp.ClientSession(connector=connector)
+
+    async def run(self, max_cycles: Optional[int] = None) -> None:
+        """Run cycles until :meth:`stop` is called or ``max_cycles`` is reached."""
+        self._stop.clear()
+        session = self.session or self._open_session()
+        try:
+            # Ticks are derived from bar numbers so they do not drift
+            bar = self._bar(time.time()) + 1
+            cycles = 0
+            while not self._stop.is_set() and (max_cycles is None or cycles < max_cycles):
+                await self._sleep_until(self._tick(bar))
+                if self._stop.is_set():
+                    break
+                missed = self._bar(time.time()) - bar
+                if missed > 0:
+                    if self.coalesce:
+                        bar += missed
+                    else:
+                        self.skipped += missed + 1
+                        record_cycle(time.time() - self._tick(bar), missed + 1)
+                        logger.warning(f"Scheduler {missed + 1} ticks behind, waiting for the next bar")
+                        bar += missed + 1
+                        continue
+                await self.run_cycle(session, self._tick(bar), skipped=missed)
+                cycles += 1
+                bar += 1
+        finally:
+            if self.session is None:
+                await session.close()
+
+    async def run_cycle(
+        self, session: aiohttp.ClientSession, tick: float, skipped: int = 0
+    ) -> CycleReport:
+        """Run every symbol once for ``tick``."""
+        started = time.time()
+        report = CycleReport(tick=tick, lag=started - tick, duration=0.0, skipped=skipped)
+
+        async def one(symbol: str) -> None:
+            async with self._semaphore:
+                try:
+                    with track("scheduler.symbol"):
+                        call = self.handler(symbol, session, tick)
+                        if self.symbol_timeout is not None:
+                            call = asyncio.wait_for(call, self.symbol_timeout)
+                        report.results[symbol] = await call
+                except Exception as exc:
+                    logger.error(f"{symbol} failed in cycle {tick:.0f}: {exc!r}")
+                    report.errors[symbol] = exc
+
+        with track("scheduler.cycle"):
+            await asyncio.gather(*(one(s) for s in self.symbols))
+
+        report.duration = time.time() - started
+        self.cycles += 1
+        self.skipped += skipped
+        self.reports.append(report)
+        record_cycle(report.lag, skipped)
+        if report.lag + report.duration > self.interval:
+            logger.warning(
+                f"Cycle for {tick:.0f} finished {report.lag + report.duration:.2f}s after its tick; "
+                f"the loop cannot keep up with a {self.interval:.0f}s bar"
+            )
+        else:
+            logger.debug(
+                f"Cycle {tick:.0f}: lag {report.lag * 1000:.1f} ms, "
+                f"{report.duration * 1000:.1f} ms, {len(report.errors)} errors"
+            )
+        return report
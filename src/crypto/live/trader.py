@@ -0,0 +1,120 @@
+"""Per-symbol trading step for :class:`~crypto.live.scheduler.LiveScheduler`."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import aiohttp
+from loguru import logger
+
+from crypto.data.cache import AsyncTTLCache
+from crypto.data.collector import DataCollector
+from crypto.data.history import HistoricalDataManager, OHLCVConfig, timeframe_seconds
+from crypto.data.social import GalaxyScoreStore
+from crypto.risk.manager import RiskManager
+from crypto.strategy.engine import StrategyEngine
+
+
+class SymbolTrader:
+    """Load closed bars, generate a signal and place the order for one symbol.
+
+    One instance serves every symbol of a scheduler. The history manager and
+    the collector are bound to the scheduler's session on first use, so all
+    symbols share their rate limiters and the LunarCrush response cache.
+    ``execution`` is an :class:`~crypto.execution.service.AsyncExecutionService`;
+    without one, signals are only returned. Like the backtester it trades
+    long-only with one position per symbol: it buys only when flat and
+    sells the amount it holds, and :attr:`positions` keeps the amounts
+    between cycles. With a
+    :class:`~crypto.monitoring.monitor.Monitor`, every signal and order is
+    logged and kept in its event buffer. Fetched galaxy scores are
+    recorded in a :class:`~crypto.data.social.GalaxyScoreStore` under
+    ``cache_dir`` so later backtests can replay them.
+    """
+
+    def __init__(
+        self,
+        engine: StrategyEngine,
+        risk_manager: RiskManager,
+        timeframe: str = "1h",
+        lunarcrush_key: str = "",
+        execution: Any = None,
+        balance: float = 1000.0,
+        lookback: int = 200,
+        cache_dir: Path = Path("./data_cache"),
+        monitor: Any = None,
+    ) -> None:
+        self.engine = engine
+        self.risk_manager = risk_manager
+        self.timeframe = timeframe
+        self.lunarcrush_key = lunarcrush_key
+        self.execution = execution
+        self.balance = balance
+        self.lookback = lookback
+        self.cache_dir = cache_dir
+        self.monitor = monitor
+        self.positions: Dict[str, float] = {}
+        self._cache = AsyncTTLCache()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.history: Optional[HistoricalDataManager] = None
+        self.collector: Optional[DataCollector] = None
+
+    def _bind(self, session: aiohttp.ClientSession) -> None:
+        if session is not self._session:
+            self._session = session
+            self.history = HistoricalDataManager(session)
+            self.collector = DataCollector(session, cache=self._cache)
+
+    async def galaxy_score(self, symbol: str) -> float:
+        if not self.lunarcrush_key:
+            return 0.0
+        asset = symbol.split("_")[0]
+        data = await self.collector.fetch_lunarcrush_data(asset, self.lunarcrush_key)
+        try:
+            GalaxyScoreStore(self.cache_dir, symbol).record(data)
+        except Exception as exc:
+            logger.warning(f"Could not record galaxy score of {symbol}: {exc!r}")
+        return float(data.get("data", [{}])[0].get("galaxy_score", 0))
+
+    async def __call__(
+        self, symbol: str, session: aiohttp.ClientSession, tick: float
+    ) -> Optional[Dict[str, Any]]:
+        self._bind(session)
+        step = timeframe_seconds(self.timeframe)
+        # Only bars that closed before the tick
+        end = datetime.fromtimestamp(tick // step * step - 1, timezone.utc)
+        cfg = OHLCVConfig(
+            symbol=symbol,
+            timeframe=self.timeframe,
+            start=end - timedelta(seconds=step * self.lookback),
+            end=end,
+            cache_dir=self.cache_dir,
+        )
+        df = await self.history.fetch_ohlcv(cfg)
+        if len(df) < self.engine.config.rsi_period:
+            logger.warning(f"Not enough bars for {symbol}: {len(df)}")
+            return None
+
+        signals = self.engine.generate_signals(df, await self.galaxy_score(symbol))
+        side = signals["signal"]
+        held = self.positions.get(symbol)
+        # Long-only, one position: buy when flat, sell what is held
+        if self.execution is not None and (side == "buy" and not held or side == "sell" and held):
+            if side == "buy":
+                amount = self.risk_manager.position_size(self.balance, float(df["close"].iloc[-1]))
+            else:
+                amount = held
+            report = await self.execution.create_order(symbol.replace("_", "/"), side, amount)
+            if side == "buy":
+                self.positions[symbol] = amount
+            else:
+                del self.positions[symbol]
+            if self.monitor is not None:
+                self.monitor.order(
+                    symbol, side, amount, id=report.order.get("id"), latency=report.latency,
+                )
+        if self.monitor is not None:
+            self.monitor.signal(symbol, signals)
+        return signals
@@ -1,21 +1,25 @@
-import asyncio
-from pathlib import Path
+"""Example trading cycle and backtest.
+
+Dependencies are imported inside the functions so that ``crypto.cli``
+can import this module cheaply; see :mod:`crypto.cli`.
+"""
 
-import aiohttp
-import pandas as pd
-from loguru import logger
+import asyncio
 from datetime import datetime, timedelta
-from crypto.data.history import HistoricalDataManager, OHLCVConfig
-from crypto.config.loader import load_config
-from crypto.data.collector import DataCollector
-from crypto.execution.service import ExecutionService
-from crypto.monitoring.monitor import Monitor
-from crypto.risk.manager import RiskConfig, RiskManager
-from crypto.strategy.engine import StrategyConfig, StrategyEngine
-from crypto.backtesting.service import BacktestingService
+from pathlib import Path
 
 
 async def run(config_path: str) -> None:
+    import aiohttp
+    import pandas as pd
+
+    from crypto.config.loader import load_config
+    from crypto.data.collector import DataCollector
+    from crypto.execution.service import AsyncExecutionService
+    from crypto.monitoring.monitor import Monitor
+    from crypto.risk.manager import RiskConfig, RiskManager
+    from crypto.strategy.engine import StrategyConfig, StrategyEngine
+
     config = load_config(config_path)
     strategy_conf = StrategyConfig(**config.get('strategies', {}))
     risk_conf = RiskConfig(**config.get('risk', {}))
@@ -29,25 +33,30 @@ async def run(config_path: str) -> None:
 
     engine = StrategyEngine(strategy_conf)
     signals = engine.generate_signals(df, galaxy_score)
-    monitor.info(f"Generated signals: {signals}")
+    monitor.signal('BTC_USDT', signals)
 
     risk_mgr = RiskManager(risk_conf)
-    exec_service = ExecutionService(
-        api_key=config['exchange']['api_key'],
-        secret=config['exchange']['secret'],
-        sandbox=config['exchange'].get('sandbox', False),
-    )
-
-    if signals['signal'] == 'buy':
-        amount = risk_mgr.position_size(balance=1000, price=df['close'].astype(float).iloc[-1])
-        exec_service.create_order('BTC/USDT', 'buy', amount)
-    elif signals['signal'] == 'sell':
+    if signals['signal'] in ('buy', 'sell'):
         amount = risk_mgr.position_size(balance=1000, price=df['close'].astype(float).iloc[-1])
-        exec_service.create_order('BTC/USDT', 'sell', amount)
+        async with AsyncExecutionService(
+            api_key=config['exchange']['api_key'],
+            secret=config['exchange']['secret'],
+            sandbox=config['exchange'].get('sandbox', False),
+        ) as exec_service:
+            await exec_service.create_order('BTC/USDT', signals['signal'], amount)
+        monitor.order('BTC_USDT', signals['signal'], amount)
 
 
 async def run_backtest_example(config_path: str) -> None:
     """Example usage of the backtesting service."""
+    import aiohttp
+    from loguru import logger
+
+    from crypto.backtesting.service import BacktestingService
+    from crypto.config.loader import load_config
+    from crypto.data.history import HistoricalDataManager, OHLCVConfig
+    from crypto.strategy.engine import StrategyConfig, StrategyEngine
+
     config = load_config(config_path)
     async with aiohttp.ClientSession() as session:
         hist_mgr = HistoricalDataManager(session)
@@ -73,6 +82,7 @@ async def run_backtest_example(config_path: str) -> None:
         logger.info(f"Sharpe Ratio: {result.sharpe:.2f}")
         logger.info(f"Max Drawdown: {result.max_drawdown:.2%}")
         logger.info(f"Win Rate: {result.win_rate:.2%}")
+        logger.info(f"Profit Factor: {result.profit_factor:.2f}")
         logger.info(f"Number of Trades: {len(result.trades)}")
 
 
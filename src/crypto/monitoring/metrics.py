@@ -0,0 +1,187 @@
+"""Prometheus instrumentation for the data, signal and order hot paths."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Sub-millisecond buckets for signal generation up to tens of seconds for
+# backtests and paginated downloads
+BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+# prometheus_client is imported and the metrics created on first enable(),
+# so importing the instrumented modules does not pay for it
+REGISTRY: Any = None
+LATENCY: Any = None
+CALLS: Any = None
+CYCLE_LAG: Any = None
+SKIPPED_TICKS: Any = None
+DROPPED_LOGS: Any = None
+
+_enabled = False
+_children: Dict[str, Tuple[Any, Any, Any]] = {}
+
+
+def _create_metrics() -> None:
+    global REGISTRY, LATENCY, CALLS, CYCLE_LAG, SKIPPED_TICKS, DROPPED_LOGS
+    if REGISTRY is not None:
+        return
+    try:
+        import prometheus_client  # type: ignore
+    except ModuleNotFoundError:  # pragma: no cover - optional dependency
+        raise RuntimeError("prometheus-client is not installed") from None
+
+    registry = prometheus_client.CollectorRegistry()
+    LATENCY = prometheus_client.Histogram(
+        "crypto_operation_seconds",
+        "Wall-clock duration of instrumented operations",
+        ["operation"],
+        registry=registry,
+        buckets=BUCKETS,
+    )
+    CALLS = prometheus_client.Counter(
+        "crypto_operation_total",
+        "Completed instrumented operations by outcome",
+        ["operation", "status"],
+        registry=registry,
+    )
+    CYCLE_LAG = prometheus_client.Gauge(
+        "crypto_scheduler_lag_seconds",
+        "Delay between a scheduled tick and the start of its cycle",
+        registry=registry,
+    )
+    SKIPPED_TICKS = prometheus_client.Counter(
+        "crypto_scheduler_skipped_ticks_total",
+        "Ticks coalesced or skipped because the previous cycle ran late",
+        registry=registry,
+    )
+    DROPPED_LOGS = prometheus_client.Counter(
+        "crypto_log_records_dropped_total",
+        "Log records discarded because the writer queue was full",
+        registry=registry,
+    )
+    REGISTRY = registry
+
+
+def enable() -> None:
+    """Start recording; instrumented calls are pass-through until then."""
+    global _enabled
+    _create_metrics()
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def start_metrics_server(port: int = 8000, addr: str = "127.0.0.1"):
+    """Enable recording and serve ``/metrics`` from a background thread."""
+    enable()
+    import prometheus_client  # type: ignore
+
+    return prometheus_client.start_http_server(port, addr=addr, registry=REGISTRY)
+
+
+def _metrics_for(operation: str) -> Tuple[Any, Any, Any]:
+    # Resolving label children once keeps the per-call cost to an observe()
+    children = _children.get(operation)
+    if children is None:
+        children = (
+            LATENCY.labels(operation),
+            CALLS.labels(operation, "ok"),
+            CALLS.labels(operation, "error"),
+        )
+        _children[operation] = children
+    return children
+
+
+def _record(operation: str, started: float, ok: bool) -> None:
+    latency, ok_count, error_count = _metrics_for(operation)
+    latency.observe(time.perf_counter() - started)
+    (ok_count if ok else error_count).inc()
+
+
+def record_cycle(lag: float, skipped: int) -> None:
+    """Report a scheduler cycle's start lag and the ticks it skipped."""
+    if not _enabled:
+        return
+    CYCLE_LAG.set(lag)
+    if skipped:
+        SKIPPED_TICKS.inc(skipped)
+
+
+def record_dropped_logs(count: int) -> None:
+    if _enabled:
+        DROPPED_LOGS.inc(count)
+
+
+@contextmanager
+def track(operation: str) -> Iterator[None]:
+    """Time the enclosed block as ``operation``."""
+    if not _enabled:
+        yield
+        return
+    started = time.perf_counter()
+    ok = False
+    try:
+        yield
+        ok = True
+    finally:
+        _record(operation, started, ok)
+
+
+def timed(operation: Optional[str] = None) -> Callable[[F], F]:
+    """Decorate a sync or async function so each call is timed.
+
+    ``operation`` defaults to the function's qualified name. While recording
+    is disabled the wrapper only checks a module flag before delegating.
+    """
+
+    def decorator(func: F) -> F:
+        name = operation or func.__qualname__
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not _enabled:
+                    return await func(*args, **kwargs)
+                started = time.perf_counter()
+                ok = False
+                try:
+                    result = await func(*args, **kwargs)
+                    ok = True
+                    return result
+                finally:
+                    _record(name, started, ok)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            ok = False
+            try:
+                result = func(*args, **kwargs)
+                ok = True
+                return result
+            finally:
+                _record(name, started, ok)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
@@ -1,12 +1,248 @@
+"""Trading log and recent-event buffer for the signal and order path."""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Mapping, Optional
+
 from loguru import logger
 
+from .metrics import record_dropped_logs
+
+_STOP = object()
+
+
+def _serialize(record: Dict[str, Any]) -> str:
+    entry: Dict[str, Any] = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "message": record["message"],
+        "module": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+    }
+    if record["extra"]:
+        entry["extra"] = record["extra"]
+    if record["exception"] is not None:
+        entry["exception"] = "".join(traceback.format_exception(*record["exception"]))
+    return json.dumps(entry, default=str)
+
+
+class JSONLogSink:
+    """Loguru sink writing JSON lines from a background thread.
+
+    Calling the sink only puts the record on a bounded queue; it never
+    blocks. When the queue is full the record is dropped and counted in
+    :attr:`dropped`, and the writer notes the loss in the log. After the
+    first record of a batch the writer waits ``flush_interval`` seconds for
+    more, then drains up to ``batch_size`` records, serializes them and
+    writes them with one call. The file is rotated once it exceeds
+    ``rotation`` bytes.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_queue: int = 10_000,
+        batch_size: int = 512,
+        flush_interval: float = 0.05,
+        rotation: int = 1_000_000,
+    ) -> None:
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.rotation = rotation
+        self.dropped = 0
+        self.written = 0
+        self.handler_id: Optional[int] = None
+        self._reported = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name="json-log-writer", daemon=True)
+        self._thread.start()
+
+    def __call__(self, message: Any) -> None:
+        try:
+            self._queue.put_nowait(message.record)
+        except queue.Full:
+            self.dropped += 1
+            record_dropped_logs(1)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            if batch[0] is not _STOP and self._queue.qsize() < self.batch_size:
+                time.sleep(self.flush_interval)
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(r is _STOP for r in batch)
+            try:
+                self._write([r for r in batch if r is not _STOP])
+            except Exception as exc:  # keep the writer alive
+                print(f"JSON log writer failed: {exc!r}", file=sys.stderr)
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, records: List[Dict[str, Any]]) -> None:
+        lines = [_serialize(r) for r in records]
+        dropped = self.dropped
+        if dropped > self._reported:
+            lines.append(json.dumps({
+                "time": datetime.now().astimezone().isoformat(),
+                "level": "WARNING",
+                "message": f"{dropped - self._reported} log records dropped, queue full",
+            }))
+            self._reported = dropped
+        if not lines:
+            return
+        self._file.write("\n".join(lines) + "\n")
+        self._file.flush()
+        self.written += len(records)
+        if self._file.tell() >= self.rotation:
+            self._rotate()
+
+    def _rotate(self) -> None:
+        self._file.close()
+        stamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S_%f")
+        os.replace(self.path, self.path.with_name(f"{self.path.stem}.{stamp}{self.path.suffix}"))
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def flush(self) -> None:
+        """Block until every queued record is on disk."""
+        if self._thread.is_alive():
+            self._queue.join()
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        self._file.close()
+
+
+# One sink per file however many monitors write to it
+_SINKS: Dict[Path, JSONLogSink] = {}
+_SINKS_LOCK = threading.Lock()
+
+
+def json_sink(path: Path, level: str = "DEBUG", **options: Any) -> JSONLogSink:
+    """Return the :class:`JSONLogSink` for ``path``, adding it on first use."""
+    key = Path(path).resolve()
+    with _SINKS_LOCK:
+        sink = _SINKS.get(key)
+        if sink is None:
+            if not _SINKS:
+                atexit.register(close_sinks)
+            sink = _SINKS[key] = JSONLogSink(key, **options)
+            sink.handler_id = logger.add(sink, level=level, format="{message}", catch=True)
+        return sink
+
+
+def close_sinks() -> None:
+    """Flush, detach and close every sink added by :func:`json_sink`."""
+    with _SINKS_LOCK:
+        sinks = list(_SINKS.values())
+        _SINKS.clear()
+    for sink in sinks:
+        try:
+            logger.remove(sink.handler_id)
+        except ValueError:
+            pass
+        sink.close()
+
+
+@dataclass(frozen=True)
+class Event:
+    kind: str  # "signal" or "order"
+    symbol: str
+    time: float  # epoch seconds
+    data: Dict[str, Any] = field(default_factory=dict)
+
+
+class EventBuffer:
+    """The most recent ``maxlen`` events, oldest first."""
+
+    def __init__(self, maxlen: int = 1000) -> None:
+        self._events: Deque[Event] = deque(maxlen=maxlen)
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def append(self, event: Event) -> None:
+        self._events.append(event)
+
+    def recent(
+        self, kind: Optional[str] = None, symbol: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[Event]:
+        events = [
+            e for e in list(self._events)
+            if (kind is None or e.kind == kind) and (symbol is None or e.symbol == symbol)
+        ]
+        return events[-limit:] if limit else events
+
 
 class Monitor:
-    def __init__(self) -> None:
-        logger.add("trading.log", rotation="1 MB")
+    """Trading log plus an in-memory buffer of recent signals and orders.
+
+    Every loguru record, at ``level`` and above, goes to ``path`` as JSON
+    lines through a shared :class:`JSONLogSink`, so logging on the trading
+    path costs a queue put rather than a disk write. Monitors writing to
+    the same file share one sink. :meth:`signal` and :meth:`order` also keep
+    the event in :attr:`events` for queries without reading the log.
+    """
+
+    def __init__(
+        self,
+        path: Path = Path("trading.log"),
+        level: str = "DEBUG",
+        history: int = 1000,
+        **sink_options: Any,
+    ) -> None:
+        self.sink = json_sink(path, level, **sink_options)
+        self.events = EventBuffer(history)
+
+    @property
+    def dropped(self) -> int:
+        return self.sink.dropped
 
     def info(self, message: str) -> None:
         logger.info(message)
 
     def error(self, message: str) -> None:
         logger.error(message)
+
+    def signal(self, symbol: str, signal: Mapping[str, Any]) -> None:
+        data = dict(signal)
+        self.events.append(Event("signal", symbol, time.time(), data))
+        logger.info("Signal {signal} for {symbol}", event="signal", symbol=symbol,
+                    signal=data.get("signal"), data=data)
+
+    def order(self, symbol: str, side: str, amount: float, **details: Any) -> None:
+        data = {"side": side, "amount": amount, **details}
+        self.events.append(Event("order", symbol, time.time(), data))
+        logger.info("Order {side} {amount} {symbol}", event="order", symbol=symbol,
+                    side=side, amount=amount, data=data)
+
+    def recent(
+        self, kind: Optional[str] = None, symbol: Optional[str] = None, limit: Optional[int] = None
+    ) -> List[Event]:
+        return self.events.recent(kind, symbol, limit)
+
+    def flush(self) -> None:
+        self.sink.flush()
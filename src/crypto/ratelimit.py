@@ -0,0 +1,37 @@
+"""Rate limiting primitives shared by the async clients."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Optional
+
+
+class AsyncTokenBucket:
+    """Token bucket that delays callers once ``rate`` per second is exceeded.
+
+    ``capacity`` tokens may be spent in a burst; afterwards tokens refill
+    continuously at ``rate``.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
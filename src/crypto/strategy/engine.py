@@ -1,15 +1,48 @@
 from __future__ import annotations
 
+import numbers
 from dataclasses import dataclass
-from typing import Dict, Any
+from typing import Any, Dict, Mapping, Optional, Union
 
 import numpy as np
 import pandas as pd
 
-try:
-    import talib  # type: ignore
-except ModuleNotFoundError:  # pragma: no cover - optional dependency
-    talib = None
+from crypto.monitoring.metrics import timed
+from . import indicators
+from .indicators import IndicatorCache
+
+
+# A constant, an array aligned with the bars, or a time series of observations
+GalaxyScore = Union[float, np.ndarray, pd.Series]
+
+
+def align_galaxy_score(galaxy_score: GalaxyScore, index: pd.Index) -> Union[float, np.ndarray]:
+    """Per-bar galaxy score for the bars in ``index``.
+
+    Scalars are returned unchanged and arrays must already have one value
+    per bar. A series of timed observations is as-of joined to the bars
+    with one ``searchsorted``: each bar gets the latest observation at or
+    before its timestamp, and bars before the first observation get 0.
+    """
+    if np.ndim(galaxy_score) == 0:
+        return float(galaxy_score)
+    if isinstance(galaxy_score, pd.Series):
+        if galaxy_score.index.equals(index):
+            return galaxy_score.to_numpy(dtype=float)
+        if not galaxy_score.index.is_monotonic_increasing:
+            galaxy_score = galaxy_score.sort_index()
+        times = pd.DatetimeIndex(galaxy_score.index)
+        bars = pd.DatetimeIndex(index)
+        if times.tz is not None and bars.tz is None:
+            times = times.tz_convert(None)
+        pos = np.searchsorted(times.asi8, bars.asi8, side="right") - 1
+        values = np.append(galaxy_score.to_numpy(dtype=float), 0.0)
+        # Position -1 picks the appended 0 for bars before any observation
+        return values[pos]
+    values = np.asarray(galaxy_score, dtype=float)
+    if len(values) != len(index):
+        raise ValueError(f"Expected {len(index)} galaxy scores, got {len(values)}")
+    return values
 
 
 @dataclass
@@ -19,23 +52,40 @@ class StrategyConfig:
 
 
 class StrategyEngine:
-    def __init__(self, config: StrategyConfig) -> None:
+    """RSI and galaxy score strategy.
+
+    With an ``indicator_cache`` the whole-series methods memoize the RSI by
+    input identity (see :class:`~crypto.strategy.indicators.IndicatorCache`),
+    so only pass one when the frames are not modified in place.
+    """
+
+    def __init__(
+        self, config: StrategyConfig, indicator_cache: Optional[IndicatorCache] = None
+    ) -> None:
         self.config = config
+        self.indicator_cache = indicator_cache
 
-    def generate_signals(self, df: pd.DataFrame, galaxy_score: float) -> Dict[str, Any]:
-        close = df['close'].astype(float)
-        
-        if talib:
-            rsi = talib.RSI(close, timeperiod=self.config.rsi_period)
-        else:
-            # Fallback RSI calculation without TA-Lib
-            delta = close.diff().fillna(0)
-            gain = delta.clip(lower=0).ewm(alpha=1 / self.config.rsi_period, adjust=False).mean()
-            loss = (-delta.clip(upper=0)).ewm(alpha=1 / self.config.rsi_period, adjust=False).mean()
-            rs = gain / loss
-            rsi = 100 - 100 / (1 + rs)
-        
-        last_rsi = rsi.iloc[-1]
+    def _rsi(self, close: np.ndarray, cached: bool = False) -> np.ndarray:
+        """RSI of ``close`` (time on axis 0).
+
+        Whole-series callers memoize through the engine's indicator cache, if
+        any; the live path sees a new window on every call and computes
+        directly.
+        """
+        if cached and self.indicator_cache is not None:
+            return self.indicator_cache.get(indicators.rsi, close, period=self.config.rsi_period)
+        return indicators.rsi(close, self.config.rsi_period)
+
+    @timed("strategy.generate_signals")
+    def generate_signals(self, df: pd.DataFrame, galaxy_score: GalaxyScore) -> Dict[str, Any]:
+        rsi = self._rsi(df['close'].to_numpy(dtype=float))
+        if isinstance(galaxy_score, pd.Series):
+            galaxy_score = float(align_galaxy_score(galaxy_score, df.index[-1:])[0])
+        elif np.ndim(galaxy_score):
+            galaxy_score = float(align_galaxy_score(galaxy_score, df.index)[-1])
+        return self._signal(float(rsi[-1]), galaxy_score)
+
+    def _signal(self, last_rsi: float, galaxy_score: float) -> Dict[str, Any]:
         signal = None
         
         if last_rsi < 30 and galaxy_score > self.config.galaxy_score_threshold:
@@ -44,7 +94,145 @@ class StrategyEngine:
             signal = 'sell'
             
         return {
-            'rsi': float(last_rsi),
+            'rsi': last_rsi,
             'galaxy_score': galaxy_score,
             'signal': signal,
         }
+
+    def generate_signal_series(self, df: pd.DataFrame, galaxy_score: GalaxyScore) -> pd.DataFrame:
+        """Return the signal :meth:`generate_signals` would emit at every bar.
+
+        Both RSI implementations are causal, so row ``i`` equals the result of
+        calling :meth:`generate_signals` on ``df.iloc[:i + 1]``.
+        ``galaxy_score`` may vary per bar; see :func:`align_galaxy_score`.
+        """
+        rsi = self._rsi(df['close'].to_numpy(), cached=True)
+        galaxy_score = align_galaxy_score(galaxy_score, df.index)
+
+        buy = (rsi < 30) & (galaxy_score > self.config.galaxy_score_threshold)
+        sell = ~buy & (rsi > 70)
+        signal = np.full(len(rsi), None, dtype=object)
+        signal[buy] = 'buy'
+        signal[sell] = 'sell'
+
+        return pd.DataFrame(
+            {'rsi': rsi, 'galaxy_score': galaxy_score, 'signal': signal},
+            index=df.index,
+        )
+
+    def generate_signal_panel(
+        self,
+        closes: pd.DataFrame,
+        galaxy_score: GalaxyScore | Mapping[str, GalaxyScore],
+    ) -> pd.DataFrame:
+        """Signals for a time x symbol panel of closes in one pass.
+
+        ``galaxy_score`` is either one value for all symbols or a mapping keyed
+        by column whose values may vary per bar (see
+        :func:`align_galaxy_score`). Signals are encoded as int8: 1 buy,
+        -1 sell, 0 none.
+        """
+        rsi = self._rsi(closes.to_numpy(), cached=True)
+        if isinstance(galaxy_score, Mapping):
+            columns = [
+                align_galaxy_score(galaxy_score.get(c, 0.0), closes.index)
+                for c in closes.columns
+            ]
+            if any(np.ndim(c) for c in columns):
+                scores = np.column_stack([np.broadcast_to(c, len(closes)) for c in columns])
+            else:
+                scores = np.array(columns, dtype=float)
+        else:
+            scores = align_galaxy_score(galaxy_score, closes.index)
+            scores = scores[:, None] if np.ndim(scores) else np.full(closes.shape[1], scores)
+
+        buy = (rsi < 30) & (scores > self.config.galaxy_score_threshold)
+        codes = np.zeros(rsi.shape, dtype=np.int8)
+        codes[rsi > 70] = -1
+        codes[buy] = 1
+        return pd.DataFrame(codes, index=closes.index, columns=closes.columns)
+
+
+class IncrementalStrategyEngine(StrategyEngine):
+    """Strategy engine that keeps the Wilder RSI state between bars.
+
+    Seed it once with :meth:`seed` and feed each new bar to :meth:`update`,
+    which costs O(1) regardless of how much history was loaded. The recursion
+    follows whichever batch implementation :meth:`generate_signals` uses:
+    TA-Lib's SMA-seeded Wilder average, or the ``ewm`` fallback.
+    """
+
+    def __init__(self, config: StrategyConfig) -> None:
+        super().__init__(config)
+        self.reset()
+
+    def reset(self) -> None:
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.last_close: Optional[float] = None
+        self.bars = 0
+        self.rsi = float('nan')
+
+    def seed(self, df: pd.DataFrame) -> "IncrementalStrategyEngine":
+        """Rebuild the state from ``df``'s full close history."""
+        self.reset()
+        for close in df['close'].to_numpy(dtype=float):
+            self._advance(float(close))
+        return self
+
+    @timed("strategy.update")
+    def update(self, bar: Any, galaxy_score: float) -> Dict[str, Any]:
+        """Advance by one closed bar and return its signal.
+
+        ``bar`` is a close price or anything with a ``close`` attribute or
+        key: a :class:`~crypto.data.stream.Bar`, a row of an OHLCV frame or
+        a mapping.
+        """
+        if isinstance(bar, numbers.Real):
+            close = float(bar)
+        elif hasattr(bar, 'close'):
+            close = float(bar.close)
+        else:
+            close = float(bar['close'])
+        return self._signal(self._advance(close), galaxy_score)
+
+    def _advance(self, close: float) -> float:
+        period = self.config.rsi_period
+        if self.last_close is None:
+            delta = 0.0
+        else:
+            delta = close - self.last_close
+        self.last_close = close
+        self.bars += 1
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+
+        if indicators.talib:
+            # TA-Lib seeds with the mean of the first ``period`` changes and
+            # only reports RSI from then on.
+            if self.bars == 1:
+                return self.rsi
+            if self.bars <= period + 1:
+                self.avg_gain += gain / period
+                self.avg_loss += loss / period
+                if self.bars <= period:
+                    return self.rsi
+            else:
+                self.avg_gain = (self.avg_gain * (period - 1) + gain) / period
+                self.avg_loss = (self.avg_loss * (period - 1) + loss) / period
+            total = self.avg_gain + self.avg_loss
+            self.rsi = 100 * self.avg_gain / total if total else 0.0
+            return self.rsi
+
+        alpha = 1 / period
+        if self.bars == 1:
+            self.avg_gain, self.avg_loss = gain, loss
+        else:
+            self.avg_gain = (1 - alpha) * self.avg_gain + alpha * gain
+            self.avg_loss = (1 - alpha) * self.avg_loss + alpha * loss
+        if self.avg_loss:
+            self.rsi = 100 - 100 / (1 + self.avg_gain / self.avg_loss)
+        else:
+            # Same convention as indicators.rsi
+            self.rsi = 100.0 if self.avg_gain else 50.0
+        return self.rsi
@@ -0,0 +1,266 @@
+"""Vectorized technical indicators with an optional TA-Lib backend.
+
+Every function takes 1-D arrays (or 2-D arrays with time on axis 0 and one
+column per series) and returns arrays of the same length, NaN where the
+indicator is not defined yet. TA-Lib is used when installed; otherwise the
+pure-numpy implementations below apply.
+"""
+
+from __future__ import annotations
+
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Tuple
+
+import numpy as np
+
+try:
+    import talib  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    talib = None
+
+# Blocks of the closed-form EWM are sized so that w ** -k stays below e ** 20
+_EWM_RANGE = 20.0
+
+
+def _as_float(values: Any) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def _per_column(func: Callable[..., Any], *arrays: np.ndarray, **params: Any):
+    """Apply a 1-D TA-Lib function to each column of 2-D inputs."""
+    if arrays[0].ndim == 1:
+        return func(*(np.ascontiguousarray(a) for a in arrays), **params)
+    results = [
+        func(*(np.ascontiguousarray(a[:, i]) for a in arrays), **params)
+        for i in range(arrays[0].shape[1])
+    ]
+    if isinstance(results[0], tuple):
+        return tuple(np.column_stack(parts) for parts in zip(*results))
+    return np.column_stack(results)
+
+
+def ewm(values: Any, alpha: float) -> np.ndarray:
+    """Exponential moving average ``y[t] = (1 - alpha) * y[t-1] + alpha * x[t]``.
+
+    Seeded with ``y[0] = x[0]`` like ``pandas.Series.ewm(adjust=False)``. The
+    recursion is evaluated in closed form over blocks,
+    ``y[lo + j] = w**j * (w * y[lo - 1] + alpha * cumsum(w**-k * x[lo + k]))``,
+    so the Python loop runs once per block instead of once per element.
+    """
+    x = _as_float(values)
+    out = np.empty_like(x)
+    n = x.shape[0]
+    if n == 0:
+        return out
+    w = 1.0 - alpha
+    if w <= 0.0:
+        out[:] = x
+        return out
+    block = min(n, max(1, int(_EWM_RANGE / -np.log(w))))
+    shape = (block,) + (1,) * (x.ndim - 1)
+    exponents = np.arange(block, dtype=np.float64).reshape(shape)
+    decay = w ** exponents
+    growth = w ** -exponents
+
+    prev = x[0]
+    for lo in range(0, n, block):
+        hi = min(lo + block, n)
+        m = hi - lo
+        acc = np.cumsum(x[lo:hi] * growth[:m], axis=0)
+        out[lo:hi] = decay[:m] * (w * prev + alpha * acc)
+        prev = out[hi - 1]
+    return out
+
+
+def sma(values: Any, period: int) -> np.ndarray:
+    x = _as_float(values)
+    if talib:
+        return _per_column(talib.SMA, x, timeperiod=period)
+    out = np.full_like(x, np.nan)
+    if len(x) >= period:
+        windows = np.lib.stride_tricks.sliding_window_view(x, period, axis=0)
+        out[period - 1:] = windows.mean(axis=-1)
+    return out
+
+
+def ema(values: Any, period: int) -> np.ndarray:
+    x = _as_float(values)
+    if talib:
+        return _per_column(talib.EMA, x, timeperiod=period)
+    return ewm(x, 2.0 / (period + 1))
+
+
+def rsi(close: Any, period: int = 14) -> np.ndarray:
+    """Wilder RSI.
+
+    The fallback smooths gains and losses with ``alpha = 1 / period``. Where
+    the average loss is zero the RSI is 100, or 50 if price did not move at
+    all, instead of the NaN a plain ``gain / loss`` produces.
+    """
+    x = _as_float(close)
+    if talib:
+        return _per_column(talib.RSI, x, timeperiod=period)
+    delta = np.diff(x, axis=0, prepend=x[:1])
+    gain = ewm(np.clip(delta, 0.0, None), 1.0 / period)
+    loss = ewm(np.clip(-delta, 0.0, None), 1.0 / period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = 100 - 100 / (1 + gain / loss)
+    return np.where(loss == 0, np.where(gain > 0, 100.0, 50.0), out)
+
+
+def macd(
+    close: Any, fast: int = 12, slow: int = 26, signal: int = 9
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return ``(macd, signal, histogram)``."""
+    x = _as_float(close)
+    if talib:
+        return _per_column(
+            talib.MACD, x, fastperiod=fast, slowperiod=slow, signalperiod=signal
+        )
+    line = ema(x, fast) - ema(x, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def bollinger(
+    close: Any, period: int = 20, num_std: float = 2.0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return ``(upper, middle, lower)`` bands using the population std."""
+    x = _as_float(close)
+    if talib:
+        return _per_column(
+            talib.BBANDS, x, timeperiod=period, nbdevup=num_std, nbdevdn=num_std
+        )
+    middle = sma(x, period)
+    std = np.full_like(x, np.nan)
+    if len(x) >= period:
+        windows = np.lib.stride_tricks.sliding_window_view(x, period, axis=0)
+        std[period - 1:] = windows.std(axis=-1)
+    return middle + num_std * std, middle, middle - num_std * std
+
+
+def atr(high: Any, low: Any, close: Any, period: int = 14) -> np.ndarray:
+    h, l, c = _as_float(high), _as_float(low), _as_float(close)
+    if talib:
+        return _per_column(talib.ATR, h, l, c, timeperiod=period)
+    prev_close = np.concatenate((c[:1], c[:-1]), axis=0)
+    true_range = np.maximum(h - l, np.maximum(np.abs(h - prev_close), np.abs(l - prev_close)))
+    return ewm(true_range, 1.0 / period)
+
+
+def _owner(array: np.ndarray) -> Any:
+    while isinstance(array.base, np.ndarray):
+        array = array.base
+    return array.base if array.base is not None else array
+
+
+def _identity(array: np.ndarray) -> Hashable:
+    return (
+        array.__array_interface__["data"][0],
+        array.shape,
+        array.strides,
+        array.dtype.str,
+    )
+
+
+class IndicatorCache:
+    """Bounded LRU memo of indicator results.
+
+    Entries are keyed by the indicator, its parameters and the identity of
+    the input arrays: their memory address and the exact range (shape and
+    strides) they cover. Several strategies or sweep runs over the same data
+    therefore compute each indicator once. Values are not compared, so the
+    inputs must not be modified in place while cached; callers opt in by
+    passing a cache to :class:`~crypto.strategy.engine.StrategyEngine`, as
+    the sweep and walk-forward workers do for their read-only shared frame.
+    An entry is dropped as soon as the buffer it was computed from dies, so
+    a recycled address cannot return stale values. The cache holds at most
+    ``maxsize`` entries and ``max_bytes`` of results. Inputs are keyed as
+    given, so float32 columns hit without being copied to float64 first.
+    Results are returned read-only.
+    """
+
+    def __init__(self, maxsize: int = 128, max_bytes: int = 256 * 2 ** 20) -> None:
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Any, int]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.nbytes = 0
+
+    def _pop(self, key: Hashable) -> None:
+        self.nbytes -= self._entries.pop(key)[2]
+
+    def _discard(self, key: Hashable, ref: Any) -> None:
+        entry = self._entries.get(key)
+        if entry is not None and ref in entry[0]:
+            self._pop(key)
+
+    def get(self, func: Callable[..., Any], *arrays: Any, **params: Any) -> Any:
+        inputs = [np.asarray(a) for a in arrays]
+        key = (
+            func.__module__,
+            func.__qualname__,
+            tuple(_identity(a) for a in inputs),
+            tuple(sorted(params.items())),
+        )
+        entry = self._entries.get(key)
+        if entry is not None:
+            refs, result, _ = entry
+            if all(ref() is not None for ref in refs):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self._pop(key)
+
+        self.misses += 1
+        result = func(*inputs, **params)
+        parts = result if isinstance(result, tuple) else (result,)
+        for part in parts:
+            part.setflags(write=False)
+        size = sum(part.nbytes for part in parts)
+        if size > self.max_bytes:
+            return result
+        self._entries[key] = (tuple(self._ref(a, key) for a in inputs), result, size)
+        self.nbytes += size
+        while len(self._entries) > self.maxsize or self.nbytes > self.max_bytes:
+            self._pop(next(iter(self._entries)))
+        return result
+
+    def _ref(self, array: np.ndarray, key: Hashable) -> Callable[[], Any]:
+        owner = _owner(array)
+        cache = weakref.ref(self)
+
+        def died(ref: Any) -> None:
+            alive = cache()
+            if alive is not None:
+                alive._discard(key, ref)
+
+        try:
+            return weakref.ref(owner, died)
+        except TypeError:
+            # Buffers that cannot be weakly referenced are kept alive instead
+            return lambda: owner
+
+
+INDICATOR_CACHE = IndicatorCache()
+
+__all__ = [
+    "INDICATOR_CACHE",
+    "IndicatorCache",
+    "atr",
+    "bollinger",
+    "ema",
+    "ewm",
+    "macd",
+    "rsi",
+    "sma",
+]
@@ -1,10 +1,40 @@
+import os
 import sys
 from pathlib import Path
+
+import numpy as np
 import pandas as pd
+import pytest
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 
+from crypto.backtesting import (
+    ResumableBacktest,
+    Trade,
+    TradeLog,
+    run_monte_carlo,
+    run_sweep,
+    run_walk_forward,
+    sweep,
+    validate_compact,
+    walk_forward_windows,
+)
+from crypto.backtesting.montecarlo import trade_returns
 from crypto.backtesting.service import BacktestingService
+from crypto.benchmarks import synthetic_ohlcv
+from crypto.data.history import compact_ohlcv
+from crypto.risk.manager import RiskConfig, RiskManager
+from crypto.strategy.engine import StrategyConfig, StrategyEngine
+from crypto.strategy.indicators import IndicatorCache
+
+
+def _wave(n, seed, period=15.0, tz=None):
+    """Hourly closes on a sine wave plus a random walk, so RSI keeps crossing."""
+    rng = np.random.default_rng(seed)
+    prices = 100 + 10 * np.sin(np.arange(n) / period) + np.cumsum(rng.normal(0, 0.5, n))
+    return pd.DataFrame(
+        {"close": prices}, index=pd.date_range("2024-01-01", periods=n, freq="h", tz=tz)
+    )
 
 
 class DummyEngine:
@@ -24,3 +54,285 @@ def test_backtest_basic():
     result = service.run_backtest(df, engine)
     assert result.total_return != 0
     assert len(result.trades) == 2
+
+
+def test_vectorized_matches_per_bar():
+    df = _wave(600, seed=0)
+    engine = StrategyEngine(StrategyConfig(rsi_period=14, galaxy_score_threshold=70))
+    service = BacktestingService(fee=0.001, slippage=0.0005)
+
+    fast = service.run_backtest(df, engine, galaxy_score=75.0)
+    slow = service.run_backtest(df, engine, galaxy_score=75.0, vectorized=False)
+
+    assert len(fast.trades) > 2
+    assert fast.trades == slow.trades
+    pd.testing.assert_series_equal(fast.equity_curve, slow.equity_curve, check_exact=True)
+    assert fast.sharpe == slow.sharpe
+    assert fast.total_return == slow.total_return
+
+
+def test_backtest_sees_in_place_edits():
+    df = _wave(600, seed=0)
+    engine = StrategyEngine(StrategyConfig(rsi_period=14, galaxy_score_threshold=70))
+    service = BacktestingService()
+    before = service.run_backtest(df, engine, galaxy_score=75.0)
+
+    df.loc[df.index[300]:, "close"] = 40.0
+    fast = service.run_backtest(df, engine, galaxy_score=75.0)
+    slow = service.run_backtest(df, engine, galaxy_score=75.0, vectorized=False)
+    assert fast.trades == slow.trades
+    assert fast.trades != before.trades
+
+
+def test_run_sweep_matches_sequential_backtests():
+    df = _wave(300, seed=2, period=10)
+    df["volume"] = np.random.default_rng(2).integers(1, 100, len(df))
+    grid = {"rsi_period": [7, 14], "galaxy_score_threshold": [50, 80], "fee": [0.0, 0.001]}
+
+    table = run_sweep(df, grid, galaxy_score=75.0, max_workers=2)
+
+    assert len(table) == 8
+    assert table["sharpe"].is_monotonic_decreasing
+    for row in table.itertuples():
+        engine = StrategyEngine(StrategyConfig(row.rsi_period, row.galaxy_score_threshold))
+        expected = BacktestingService(fee=row.fee).run_backtest(df, engine, 75.0)
+        assert row.total_return == expected.total_return
+        assert row.trades == len(expected.trades)
+
+
+def test_portfolio_backtest_matches_single_symbol_runs():
+    symbols = ["BTC_USDT", "ETH_USDT", "SOL_USDT"]
+    closes = pd.concat(
+        [_wave(400, seed=3 + i, period=period)["close"].rename(symbol)
+         for i, (symbol, period) in enumerate(zip(symbols, [9.0, 13.0, 17.0]))],
+        axis=1,
+    )
+    engine = StrategyEngine(StrategyConfig())
+    service = BacktestingService(fee=0.001, slippage=0.0005)
+    risk = RiskManager(RiskConfig(max_position_size=0.25))
+
+    result = service.run_portfolio_backtest(
+        closes, engine, risk, galaxy_score=75.0, initial_balance=1200.0, symbol_chunk=2
+    )
+
+    assert np.allclose(result.allocations, 300.0)
+    expected = pd.Series(1200.0, index=closes.index[14:])
+    for symbol in symbols:
+        single = service.run_backtest(closes[[symbol]].rename(columns={symbol: "close"}), engine, 75.0, 300.0)
+        assert [t.exit_time for t in result.trades[symbol]] == [t.exit_time for t in single.trades]
+        expected += single.equity_curve - 300.0
+    assert np.allclose(result.portfolio.equity_curve, expected, rtol=1e-10)
+
+
+def test_intrabar_stop_loss_and_take_profit_exits():
+    class SeriesEngine:
+        def __init__(self, signals):
+            self.signals = signals
+
+        def generate_signal_series(self, df, galaxy_score):
+            return pd.DataFrame({"signal": self.signals}, index=df.index)
+
+    index = pd.date_range("2024-01-01", periods=20, freq="h")
+    close = [100.0] * 20
+    high = [101.0] * 20
+    low = [99.0] * 20
+    high[16] = 105.0  # take-profit of the first trade (entry at 14)
+    low[18] = 90.0  # stop of the second trade (entry at 17)
+    df = pd.DataFrame({"open": close, "high": high, "low": low, "close": close}, index=index)
+    signals = [None] * 20
+    signals[14] = "buy"
+    signals[17] = "buy"
+    service = BacktestingService(fee=0.0, slippage=0.0)
+    risk = RiskManager(RiskConfig(stop_loss=0.02, take_profit=0.04))
+
+    result = service.run_backtest(df, SeriesEngine(signals), risk_manager=risk)
+
+    assert [(t.entry_time, t.exit_time, t.exit_reason) for t in result.trades] == [
+        (index[14], index[16], "take_profit"),
+        (index[17], index[18], "stop_loss"),
+    ]
+    assert [t.exit_price for t in result.trades] == [104.0, 98.0]
+    assert result.equity_curve.iloc[-1] == pytest.approx(1000.0 * 1.04 * 0.98)
+
+
+def test_risk_mode_without_reachable_levels_matches_signal_exits():
+    df = _wave(500, seed=4)
+    df["high"] = df["close"] + 1
+    df["low"] = df["close"] - 1
+    engine = StrategyEngine(StrategyConfig())
+    service = BacktestingService()
+    wide = RiskManager(RiskConfig(stop_loss=0.99, take_profit=10.0))
+
+    plain = service.run_backtest(df, engine, 75.0)
+    risky = service.run_backtest(df, engine, 75.0, risk_manager=wide)
+    tight = service.run_backtest(df, engine, 75.0, risk_manager=RiskManager(RiskConfig()))
+
+    assert risky.trades == plain.trades
+    pd.testing.assert_series_equal(risky.equity_curve, plain.equity_curve, check_exact=True)
+    assert {t.exit_reason for t in tight.trades} & {"stop_loss", "take_profit"}
+
+
+def test_trade_log_metrics_and_parquet(tmp_path):
+    index = pd.date_range("2024-01-01", periods=10, freq="h")
+    log = TradeLog.from_arrays(
+        index, [0, 3, 6], [2, 5, 9], [100.0, 100.0, 100.0], [110.0, 95.0, 105.0],
+        ["signal", "stop_loss", "end_of_data"],
+    )
+    assert isinstance(log[0], Trade)
+    assert [t.exit_reason for t in log] == ["signal", "stop_loss", "end_of_data"]
+    assert log.win_rate == pytest.approx(2 / 3)
+    assert log.profit_factor == pytest.approx(0.15 / 0.05)
+    assert log.expectancy == pytest.approx(0.10 / 3)
+    assert log.average_hold == pd.Timedelta(hours=7) / 3
+    assert TradeLog.from_trades(list(log), index) == log
+
+    path = tmp_path / "trades.parquet"
+    log.to_parquet(path)
+    frame = pd.read_parquet(path)
+    assert list(frame["exit_time"]) == list(log.exit_time)
+    assert list(frame["exit_reason"].astype(str)) == list(log.exit_reason)
+
+
+def test_walk_forward_parallel_matches_serial():
+    assert walk_forward_windows(10, 4, 3) == [(0, 4, 7), (3, 7, 10)]
+    assert walk_forward_windows(10, 4, 4, anchored=True) == [(0, 4, 8), (0, 8, 10)]
+
+    df = _wave(500, seed=5, period=12)
+    grid = {"rsi_period": [7, 14], "galaxy_score_threshold": [50, 80]}
+
+    serial = run_walk_forward(df, grid, 200, 100, galaxy_score=75.0, max_workers=1)
+    parallel = run_walk_forward(df, grid, 200, 100, galaxy_score=75.0, max_workers=2)
+
+    pd.testing.assert_frame_equal(serial.windows, parallel.windows)
+    pd.testing.assert_series_equal(serial.equity_curve, parallel.equity_curve)
+    assert len(serial.windows) == 3
+    assert serial.equity_curve.index[0] == df.index[200]
+    assert serial.equity_curve.iloc[0] == 1000.0
+    # Positions never straddle a window boundary
+    window = np.searchsorted(serial.windows["test_start"], serial.out_of_sample.trades.entry_time, "right")
+    assert (window == np.searchsorted(serial.windows["test_start"], serial.out_of_sample.trades.exit_time, "right")).all()
+    assert len(serial.out_of_sample.trades) == serial.windows["trades"].sum()
+
+
+def test_monte_carlo_paths():
+    df = _wave(600, seed=4)
+    result = BacktestingService().run_backtest(df, StrategyEngine(StrategyConfig()), 75.0)
+
+    returns = trade_returns(result, 1000.0)
+    assert len(returns) == len(result.trades)
+    assert np.prod(1 + returns) - 1 == pytest.approx(result.total_return)
+
+    shuffled = run_monte_carlo(result, 500, method="permutation", seed=0)
+    assert np.allclose(shuffled.total_return, result.total_return)
+
+    paths = run_monte_carlo(returns, 300, seed=1)
+    chunked = run_monte_carlo(returns, 300, seed=1, max_memory=8 * len(returns) * 7)
+    np.testing.assert_array_equal(paths.max_drawdown, chunked.max_drawdown)
+
+    # Drawdown of the resampled paths against a direct computation
+    idx = np.random.default_rng(1).integers(0, len(returns), (300, len(returns)))
+    wealth = np.cumprod(1 + returns[idx], axis=1)
+    peak = np.maximum.accumulate(np.maximum(wealth, 1.0), axis=1)
+    np.testing.assert_allclose(paths.max_drawdown, (wealth / peak - 1).min(axis=1), atol=1e-12)
+    assert list(paths.percentiles().index) == ["total_return", "max_drawdown", "sharpe"]
+
+
+def test_resumable_backtest_matches_full_rerun(tmp_path):
+    n = 700
+    df = _wave(n, seed=8)
+    engine = StrategyEngine(StrategyConfig(rsi_period=14, galaxy_score_threshold=70))
+    service = BacktestingService(fee=0.001, slippage=0.0005)
+
+    resumable = ResumableBacktest(service, engine, galaxy_score=75.0)
+    assert resumable.extend(df.iloc[:10]) is None
+    bounds = [10, 20, 21, 200, 201, 202, 450, 451, n]
+    for lo, hi in zip(bounds, bounds[1:]):
+        if lo == 450:
+            resumable.save(tmp_path / "checkpoint.pkl")
+            resumable = ResumableBacktest.load(tmp_path / "checkpoint.pkl")
+        result = resumable.extend(df.iloc[lo:hi])
+        full = service.run_backtest(df.iloc[:hi], engine, galaxy_score=75.0)
+
+        assert result.trades == full.trades
+        pd.testing.assert_series_equal(result.equity_curve, full.equity_curve, rtol=1e-12, check_freq=False)
+        for metric in ("sharpe", "volatility", "max_drawdown", "total_return", "calmar_ratio", "win_rate"):
+            assert getattr(result, metric) == pytest.approx(getattr(full, metric), rel=1e-9)
+
+    with pytest.raises(ValueError):
+        resumable.extend(df.iloc[-5:])
+
+    tail = ResumableBacktest(service, engine, galaxy_score=75.0, max_curve=50)
+    for lo in range(0, n, 37):
+        tail.extend(df.iloc[lo:lo + 37])
+    pd.testing.assert_series_equal(tail.result.equity_curve, full.equity_curve.iloc[-50:], rtol=1e-12, check_freq=False)
+    assert tail.result.sharpe == pytest.approx(full.sharpe, rel=1e-9)
+
+
+def test_backtest_with_galaxy_score_series():
+    n = 600
+    df = _wave(n, seed=4)
+    engine = StrategyEngine(StrategyConfig(rsi_period=14, galaxy_score_threshold=70))
+    service = BacktestingService(fee=0.001, slippage=0.0005)
+
+    constant = service.run_backtest(df, engine, 75.0)
+    daily = pd.Series(75.0, index=pd.date_range("2023-12-31", periods=30, freq="D"))
+    assert service.run_backtest(df, engine, daily).trades == constant.trades
+
+    # Scores drop below the threshold for the second half: no entries there
+    daily[daily.index >= df.index[n // 2]] = 40.0
+    fast = service.run_backtest(df, engine, daily)
+    slow = service.run_backtest(df, engine, daily, vectorized=False)
+    assert fast.trades == slow.trades
+    pd.testing.assert_series_equal(fast.equity_curve, slow.equity_curve, check_exact=True)
+    assert len(fast.trades) < len(constant.trades)
+    assert (fast.trades.to_frame()["entry_time"] < df.index[n // 2]).all()
+
+
+def test_compact_bars_stay_within_tolerance():
+    df = synthetic_ohlcv(50_000, seed=0)
+    engine = StrategyEngine(StrategyConfig())
+    report = validate_compact(df, engine, 75.0)
+    assert report.rsi_error < 0.01 and report.trades == report.compact_trades
+    with pytest.raises(ValueError):
+        validate_compact(df, engine, 75.0, metric_tolerance=0.0)
+
+    # float32 columns are cached by identity rather than copied every call
+    compact = compact_ohlcv(df)
+    assert (compact.dtypes == np.float32).all()
+    cache = IndicatorCache()
+    cached = StrategyEngine(StrategyConfig(), indicator_cache=cache)
+    cached.generate_signal_series(compact, 75.0)
+    cached.generate_signal_series(compact, 75.0)
+    assert cache.hits == 1
+
+    # Sweep workers share the float32 matrix and match in-process runs
+    table = run_sweep(compact, {"rsi_period": [7, 14]}, galaxy_score=75.0, max_workers=2)
+    for row in table.itertuples():
+        expected = BacktestingService().run_backtest(
+            compact, StrategyEngine(StrategyConfig(rsi_period=row.rsi_period)), 75.0
+        )
+        assert row.total_return == expected.total_return
+
+
+def test_sweep_shares_tz_aware_index_and_galaxy_series(monkeypatch):
+    n = 400
+    df = _wave(n, seed=5, period=12, tz="Europe/Berlin")
+    index = df.index
+    scores = pd.Series(np.where(np.arange(n // 24) % 2, 40.0, 80.0), index=index[::24][: n // 24])
+
+    table = run_sweep(df, {"rsi_period": [7, 14]}, galaxy_score=scores, max_workers=2)
+    for row in table.itertuples():
+        engine = StrategyEngine(StrategyConfig(rsi_period=row.rsi_period))
+        expected = BacktestingService().run_backtest(df, engine, scores)
+        assert row.total_return == expected.total_return
+        assert row.trades == len(expected.trades)
+
+    # A failure while filling the block still unlinks it
+    def broken(*args):
+        raise RuntimeError("copy failed")
+
+    before = set(os.listdir("/dev/shm"))
+    monkeypatch.setattr(sweep, "_views", broken)
+    with pytest.raises(RuntimeError):
+        run_sweep(df, {"rsi_period": [7]}, max_workers=1)
+    assert set(os.listdir("/dev/shm")) <= before
@@ -0,0 +1,57 @@
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from crypto.benchmarks import (
+    compare,
+    load_baseline,
+    memory_footprint,
+    run_suite,
+    save_baseline,
+    synthetic_ohlcv,
+)
+
+
+def test_synthetic_ohlcv_is_seeded_and_consistent():
+    df = synthetic_ohlcv(10_000, seed=7)
+    pd.testing.assert_frame_equal(df, synthetic_ohlcv(10_000, seed=7))
+    assert not df.equals(synthetic_ohlcv(10_000, seed=8))
+    assert (df["high"] >= df[["open", "close"]].max(axis=1)).all()
+    assert (df["low"] <= df[["open", "close"]].min(axis=1)).all()
+    assert (df["volume"] > 0).all()
+    assert np.allclose(df["open"].iloc[1:].to_numpy(), df["close"].iloc[:-1].to_numpy())
+
+
+def test_suite_baseline_roundtrip_flags_regressions(tmp_path):
+    results = run_suite(sizes=[2_000], names=["generate_signals", "fetch_ohlcv_hit"], repeat=1)
+    assert set(results) == {"generate_signals[2000]", "fetch_ohlcv_hit[2000]"}
+
+    path = tmp_path / "baseline.json"
+    save_baseline(results, path)
+    baseline = load_baseline(path)
+    assert compare(results, baseline) == []
+
+    slower = dict(results, **{"generate_signals[2000]": results["generate_signals[2000]"] * 2})
+    regressions = compare(slower, baseline, threshold=0.5)
+    assert [r[0] for r in regressions] == ["generate_signals[2000]"]
+    assert regressions[0][3] == 2.0
+
+
+def test_memory_footprint_reports_compact_savings():
+    report = memory_footprint(sizes=[5_000])
+    row = report.loc[5_000]
+    # 5 float32 columns and the int64 index against 5 float64 columns
+    assert row["compact_memory"] == 5_000 * (5 * 4 + 8)
+    assert row["memory_ratio"] < 0.6
+    assert row["cache_ratio"] < 1
+
+
+def test_fetch_benchmarks_remove_their_cache_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    run_suite(sizes=[1_000], names=["fetch_ohlcv_miss", "fetch_ohlcv_hit", "fetch_ohlcv_hit_compact"], repeat=2)
+    assert list(tmp_path.iterdir()) == []
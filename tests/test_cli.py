@@ -0,0 +1,106 @@
+import os
+import subprocess
+import sys
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(SRC))
+
+from crypto import cli
+from crypto.data.store import PartitionedOHLCVStore
+from crypto.monitoring import metrics
+
+# Seconds of module import time (``-X importtime``) allowed per invocation
+HELP_BUDGET = 0.5
+COMMAND_BUDGET = 2.5
+
+
+def _run(*args):
+    """Run ``python -m crypto`` and return (process, import seconds, modules)."""
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "crypto", *args],
+        capture_output=True, text=True, env=env,
+    )
+    rows = [
+        line.split("|")
+        for line in proc.stderr.splitlines()
+        if line.startswith("import time:") and "self [us]" not in line
+    ]
+    seconds = sum(int(row[0].split(":")[1]) for row in rows) / 1e6
+    modules = {row[2].strip() for row in rows}
+    return proc, seconds, modules
+
+
+@pytest.fixture
+def ohlcv_file(tmp_path):
+    n = 300
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {"close": 100 + np.cumsum(rng.normal(0, 1, n))},
+        index=pd.date_range("2024-01-01", periods=n, freq="h"),
+    )
+    path = tmp_path / "bars.parquet"
+    df.to_parquet(path)
+    return path
+
+
+@pytest.mark.parametrize("command", [[], ["fetch"], ["backtest"], ["sweep"], ["live"]])
+def test_help_imports_no_heavy_dependencies(command):
+    proc, seconds, modules = _run(*command, "--help")
+    assert proc.returncode == 0
+    assert not modules & {"pandas", "numpy", "aiohttp", "ccxt", "loguru"}
+    assert seconds < HELP_BUDGET
+
+
+@pytest.mark.parametrize("command", [["backtest"], ["sweep", "--workers", "1"]])
+def test_offline_commands_stay_within_import_budget(command, ohlcv_file):
+    proc, seconds, modules = _run(*command, "--data", str(ohlcv_file))
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert "ccxt" not in modules
+    assert seconds < COMMAND_BUDGET
+
+
+def test_fetch_served_from_cache_stays_within_import_budget(tmp_path):
+    bars = pd.DataFrame(
+        {"open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0, "volume": 1.0},
+        index=pd.date_range(pd.Timestamp.utcnow().tz_localize(None).floor("h") - pd.Timedelta("2d"),
+                            periods=24, freq="h", name="timestamp"),
+    )
+    store = PartitionedOHLCVStore(tmp_path, "BTC_USDT", "1h")
+    store.write(bars)
+    store.save_coverage([(0, 2 ** 40)])
+
+    output = tmp_path / "out.parquet"
+    proc, seconds, modules = _run(
+        "fetch", "--days", "3", "--cache-dir", str(tmp_path), "--output", str(output)
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert len(pd.read_parquet(output)) == 24
+    assert "ccxt" not in modules
+    assert seconds < COMMAND_BUDGET
+
+
+def test_metrics_port_serves_command_metrics(ohlcv_file, monkeypatch):
+    servers = []
+    start = metrics.start_metrics_server
+
+    def start_and_keep(port, addr):
+        servers.append(start(port, addr)[0])
+        return servers[-1]
+
+    monkeypatch.setattr(metrics, "start_metrics_server", start_and_keep)
+    try:
+        assert cli.main(["--metrics-port", "0", "backtest", "--data", str(ohlcv_file)]) == 0
+        url = f"http://127.0.0.1:{servers[0].server_port}/metrics"
+        body = urllib.request.urlopen(url, timeout=5).read().decode()
+    finally:
+        metrics.disable()
+        for server in servers:
+            server.shutdown()
+    assert 'crypto_operation_total{operation="backtesting.run_backtest",status="ok"}' in body
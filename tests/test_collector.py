@@ -0,0 +1,107 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from crypto.data.cache import AsyncTTLCache
+from crypto.data.collector import DataCollector
+
+
+@pytest.mark.asyncio
+async def test_collect_coalesces_and_caches_requests(monkeypatch):
+    calls = []
+
+    async def fake_get_json(self, url, params=None):
+        calls.append(url)
+        await asyncio.sleep(0.01)
+        return {"url": url}
+
+    monkeypatch.setattr(DataCollector, "_get_json", fake_get_json)
+    collector = DataCollector(session=None)
+
+    await asyncio.gather(*(collector.collect(s, "key") for s in ["BTC", "ETH"] * 10))
+    await collector.collect("BTC", "key")
+
+    assert calls.count(DataCollector.WHITEBIT_URL) == 1
+    assert len(calls) == 3
+    assert collector.cache.stats() == {"hits": 2, "misses": 3, "coalesced": 37, "size": 3}
+
+
+@pytest.mark.asyncio
+async def test_ttl_cache_expires_evicts_and_skips_failures():
+    cache = AsyncTTLCache(maxsize=2, ttl=60.0)
+    calls = []
+
+    def fetcher(value):
+        async def fetch():
+            calls.append(value)
+            return value
+        return fetch
+
+    await cache.get_or_fetch("a", fetcher(1))
+    await cache.get_or_fetch("b", fetcher(2), ttl=0.01)
+    await cache.get_or_fetch("a", fetcher(99))
+    await cache.get_or_fetch("c", fetcher(3))  # evicts "b", the least recently used
+    assert await cache.get_or_fetch("a", fetcher(99)) == 1
+    assert await cache.get_or_fetch("b", fetcher(4)) == 4
+
+    async def boom():
+        raise RuntimeError("down")
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_fetch("d", boom)
+    assert await cache.get_or_fetch("d", fetcher(5)) == 5
+    assert calls == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_coalesced_waiters():
+    cache = AsyncTTLCache()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "value"
+
+    leader = asyncio.ensure_future(cache.get_or_fetch("k", fetch))
+    await asyncio.sleep(0)
+    waiter = asyncio.ensure_future(cache.get_or_fetch("k", fetch))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    assert await waiter == "value"
+    assert leader.cancelled()
+    assert await cache.get_or_fetch("k", fetch) == "value"
+    assert calls == [1]
+
+
+@pytest.mark.asyncio
+async def test_error_responses_raise_and_are_not_cached():
+    status = [500]
+
+    async def handler(request):
+        return web.json_response({"ok": status[0] == 200}, status=status[0])
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        async with aiohttp.ClientSession() as session:
+            collector = DataCollector(session)
+            collector.WHITEBIT_URL = f"http://127.0.0.1:{port}/"
+            with pytest.raises(aiohttp.ClientResponseError):
+                await collector.fetch_whitebit_markets()
+            status[0] = 200
+            assert await collector.fetch_whitebit_markets() == {"ok": True}
+    finally:
+        await runner.cleanup()
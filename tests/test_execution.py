@@ -0,0 +1,64 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import ccxt
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from crypto.execution.service import AsyncExecutionService, OrderRequest
+
+
+class FakeExchange:
+    """Stand-in exchange with fixed latency that answers 429 under load."""
+
+    def __init__(self, latency: float, max_concurrent: int) -> None:
+        self.latency = latency
+        self.max_concurrent = max_concurrent
+        self.active = 0
+        self.rejected = 0
+        self.filled = []
+
+    async def create_market_order(self, symbol, side, amount):
+        if self.active >= self.max_concurrent:
+            self.rejected += 1
+            raise ccxt.RateLimitExceeded("429 Too Many Requests")
+        self.active += 1
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.active -= 1
+        self.filled.append((symbol, side, amount))
+        return {"id": str(len(self.filled)), "symbol": symbol, "status": "closed"}
+
+    async def close(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_async_execution_throttles_retries_and_reports_latency():
+    exchange = FakeExchange(latency=0.05, max_concurrent=3)
+    service = AsyncExecutionService(
+        exchange=exchange, rate=200, burst=10, max_in_flight=4, backoff=0.01, max_retries=10,
+        history=4,
+    )
+    symbols = ["BTC/USDT", "ETH/USDT", "SOL/USDT", "XRP/USDT", "ADA/USDT"]
+    requests = [OrderRequest(s, "buy", float(n)) for n in range(1, 4) for s in symbols]
+
+    t0 = time.perf_counter()
+    async with service:
+        reports = await service.submit_many(requests)
+    elapsed = time.perf_counter() - t0
+
+    assert all(not isinstance(r, BaseException) for r in reports)
+    assert exchange.rejected > 0
+    assert max(r.attempts for r in reports) > 1
+    assert all(r.latency >= r.exchange_latency >= 0.05 for r in reports)
+    # Only the most recent reports are kept
+    assert len(service.reports) == 4 and all(r in reports for r in service.reports)
+    # Sequential submission would take at least len(requests) * latency
+    assert elapsed < len(requests) * exchange.latency
+    for symbol in symbols:
+        assert [a for s, _, a in exchange.filled if s == symbol] == [1.0, 2.0, 3.0]
@@ -2,6 +2,7 @@ import sys
 import pandas as pd
 import pytest
 import asyncio
+import aiohttp
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
@@ -40,3 +41,372 @@ async def test_history_cache(tmp_path, monkeypatch):
             # second call should hit cache
             df2 = await mgr.fetch_ohlcv(cfg)
             pd.testing.assert_frame_equal(df, df2)
+
+
+async def _start_kline_server(delay: float, fail_once: set):
+    from aiohttp import web
+
+    async def kline(request):
+        start = int(request.query["start"])
+        end = int(request.query["end"])
+        limit = int(request.query["limit"])
+        if start in fail_once:
+            fail_once.discard(start)
+            return web.Response(status=429)
+        await asyncio.sleep(delay)
+        first = -(-start // 60) * 60
+        rows = [
+            [ts, ts / 60, ts / 60 + 1, ts / 60 - 1, ts / 60 + 0.5, 10]
+            for ts in range(first, end + 1, 60)
+        ][:limit]
+        return web.json_response(rows)
+
+    app = web.Application()
+    app.router.add_get("/kline", kline)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/kline"
+
+
+@pytest.mark.asyncio
+async def test_fetch_range_paginates_concurrently():
+    import time
+
+    start_ts, bars = 1_700_000_040, 4000
+    end_ts = start_ts + (bars - 1) * 60
+    runner, url = await _start_kline_server(delay=0.05, fail_once={start_ts + 1500 * 60})
+    try:
+        cfg = OHLCVConfig(symbol="BTC_USDT", timeframe="1m", limit=250)
+        timings = {}
+        async with aiohttp.ClientSession() as session:
+            for concurrency in (1, 8):
+                mgr = HistoricalDataManager(
+                    session, max_concurrency=concurrency, backoff=0.01, requests_per_second=1000
+                )
+                mgr.BASE_URL = url
+                t0 = time.perf_counter()
+                df = await mgr._fetch_range(cfg, start_ts, end_ts)
+                timings[concurrency] = time.perf_counter() - t0
+
+                assert len(df) == bars
+                assert df.index.is_monotonic_increasing and df.index.is_unique
+                assert df.index[0] == pd.Timestamp(start_ts, unit="s")
+                assert df.index[-1] == pd.Timestamp(end_ts, unit="s")
+    finally:
+        await runner.cleanup()
+
+    assert timings[8] < timings[1] / 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_ohlcv_only_fetches_missing_ranges(tmp_path, monkeypatch):
+    calls = []
+
+    async def fake_fetch(self, cfg, start_ts, end_ts):
+        calls.append((start_ts, end_ts))
+        index = pd.date_range(
+            pd.Timestamp(start_ts, unit="s").ceil("h"), pd.Timestamp(end_ts, unit="s"), freq="h"
+        )
+        return pd.DataFrame({"close": range(len(index))}, index=index, dtype=float)
+
+    monkeypatch.setattr(HistoricalDataManager, "_fetch_chunk", fake_fetch)
+    day = pd.Timestamp("2024-01-01")
+
+    def cfg(first, last):
+        return OHLCVConfig(
+            symbol="BTC_USDT",
+            timeframe="1h",
+            cache_dir=tmp_path,
+            start=(day + pd.Timedelta(days=first)).to_pydatetime(),
+            end=(day + pd.Timedelta(days=last)).to_pydatetime(),
+        )
+
+    async with aiohttp.ClientSession() as session:
+        mgr = HistoricalDataManager(session)
+        await mgr.fetch_ohlcv(cfg(0, 1))
+        await mgr.fetch_ohlcv(cfg(3, 4))
+        assert len(calls) == 2
+
+        calls.clear()
+        df = await mgr.fetch_ohlcv(cfg(0, 4))
+        # Only the hole between the two cached days is requested
+        assert calls == [(int((day + pd.Timedelta(days=1)).timestamp()) + 1,
+                          int((day + pd.Timedelta(days=3)).timestamp()) - 1)]
+        assert len(df) == 4 * 24 + 1 and df.index.is_unique
+
+        calls.clear()
+        await mgr.fetch_ohlcv(cfg(0, 4))
+        assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_failed_chunks_are_not_marked_covered(tmp_path, monkeypatch):
+    failed = set()
+    calls = []
+
+    async def flaky_fetch(self, cfg, start_ts, end_ts):
+        calls.append(start_ts)
+        if len(calls) == 2 and not failed:
+            failed.add(start_ts)
+            return None  # what _fetch_chunk returns on errors
+        index = pd.date_range(
+            pd.Timestamp(start_ts, unit="s").ceil("h"), pd.Timestamp(end_ts, unit="s"), freq="h"
+        )
+        return pd.DataFrame({"close": range(len(index))}, index=index, dtype=float)
+
+    monkeypatch.setattr(HistoricalDataManager, "_fetch_chunk", flaky_fetch)
+    day = pd.Timestamp("2024-01-01")
+    cfg = OHLCVConfig(
+        symbol="BTC_USDT", timeframe="1h", limit=24, cache_dir=tmp_path,
+        start=day.to_pydatetime(), end=(day + pd.Timedelta(hours=71)).to_pydatetime(),
+    )
+
+    async with aiohttp.ClientSession() as session:
+        mgr = HistoricalDataManager(session)
+        assert len(await mgr.fetch_ohlcv(cfg)) == 48
+        calls.clear()
+        # Only the failed day is requested again, and the hole is filled
+        df = await mgr.fetch_ohlcv(cfg)
+        assert calls == list(failed)
+        assert len(df) == 72
+
+
+@pytest.mark.asyncio
+async def test_windows_without_bars_are_covered(tmp_path, monkeypatch):
+    calls = []
+    listed = pd.Timestamp("2024-01-02")
+
+    async def fake_fetch(self, cfg, start_ts, end_ts):
+        calls.append(start_ts)
+        index = pd.date_range(
+            max(pd.Timestamp(start_ts, unit="s").ceil("h"), listed), pd.Timestamp(end_ts, unit="s"), freq="h"
+        )
+        return pd.DataFrame({"close": range(len(index))}, index=index, dtype=float)
+
+    monkeypatch.setattr(HistoricalDataManager, "_fetch_chunk", fake_fetch)
+    cfg = OHLCVConfig(
+        symbol="BTC_USDT", timeframe="1h", limit=24, cache_dir=tmp_path,
+        start=(listed - pd.Timedelta(days=1)).to_pydatetime(),
+        end=(listed + pd.Timedelta(hours=23)).to_pydatetime(),
+    )
+
+    async with aiohttp.ClientSession() as session:
+        mgr = HistoricalDataManager(session)
+        assert len(await mgr.fetch_ohlcv(cfg)) == 24
+        calls.clear()
+        # The day before the listing returned no bars but is not asked again
+        assert len(await mgr.fetch_ohlcv(cfg)) == 24
+        assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_fetch_chunk_tells_failures_from_empty_windows(monkeypatch):
+    responses = [[], {"message": "bad request"}, aiohttp.ClientError("down")]
+
+    async def fake_get_json(self, url, params):
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(HistoricalDataManager, "_get_json", fake_get_json)
+    mgr = HistoricalDataManager(session=None)
+    cfg = OHLCVConfig(symbol="BTC_USDT", timeframe="1h")
+    assert (await mgr._fetch_chunk(cfg, 0, 3600)).empty
+    assert await mgr._fetch_chunk(cfg, 0, 3600) is None
+    assert await mgr._fetch_chunk(cfg, 0, 3600) is None
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_keep_each_others_coverage(tmp_path, monkeypatch):
+    calls = []
+
+    async def fake_fetch(self, cfg, start_ts, end_ts):
+        calls.append((start_ts, end_ts))
+        await asyncio.sleep(0.01)
+        index = pd.date_range(
+            pd.Timestamp(start_ts, unit="s").ceil("h"), pd.Timestamp(end_ts, unit="s"), freq="h"
+        )
+        return pd.DataFrame({"close": range(len(index))}, index=index, dtype=float)
+
+    monkeypatch.setattr(HistoricalDataManager, "_fetch_chunk", fake_fetch)
+    day = pd.Timestamp("2024-01-01")
+
+    def cfg(first, last):
+        return OHLCVConfig(
+            symbol="BTC_USDT", timeframe="1h", cache_dir=tmp_path,
+            start=(day + pd.Timedelta(days=first)).to_pydatetime(),
+            end=(day + pd.Timedelta(days=last, hours=-1)).to_pydatetime(),
+        )
+
+    async with aiohttp.ClientSession() as session:
+        mgr = HistoricalDataManager(session)
+        await asyncio.gather(mgr.fetch_ohlcv(cfg(0, 1)), mgr.fetch_ohlcv(cfg(2, 3)))
+        assert len(calls) == 2
+
+        calls.clear()
+        assert len(await mgr.fetch_ohlcv(cfg(0, 1))) == 24
+        assert len(await mgr.fetch_ohlcv(cfg(2, 3))) == 24
+        assert calls == []
+
+
+def test_columnar_export_is_memory_mapped(tmp_path):
+    import numpy as np
+    from crypto.data.history import export_columnar, load_columnar
+
+    index = pd.date_range("2024-01-01", periods=1000, freq="min")
+    df = pd.DataFrame(
+        {"open": np.arange(1000.0), "close": np.arange(1000.0) + 0.5, "volume": np.ones(1000)},
+        index=index,
+    )
+    export_columnar(df, tmp_path / "btc", price_dtype="float32")
+
+    sliced = load_columnar(tmp_path / "btc", index[100], index[199])
+
+    assert len(sliced) == 100
+    assert sliced.index[0] == index[100] and sliced.index[-1] == index[199]
+    assert sliced["close"].dtype == np.float32
+    assert isinstance(sliced["close"].to_numpy().base, np.memmap)
+    np.testing.assert_allclose(sliced["close"], df["close"].iloc[100:200])
+
+
+@pytest.mark.asyncio
+async def test_higher_timeframes_are_built_from_base_cache(tmp_path, monkeypatch):
+    import numpy as np
+    from crypto.data.history import bar_start, resample_ohlcv
+
+    calls = []
+
+    async def fake_fetch(self, cfg, start_ts, end_ts):
+        calls.append((cfg.timeframe, start_ts, end_ts))
+        index = pd.date_range(
+            pd.Timestamp(start_ts, unit="s").ceil("min"), pd.Timestamp(end_ts, unit="s"), freq="min"
+        )
+        minute = (index.asi8 // 60 // 10 ** 9).astype(float)
+        return pd.DataFrame(
+            {"open": minute, "high": minute + np.sin(minute) + 2, "low": minute - 2,
+             "close": minute + 0.5, "volume": minute % 7},
+            index=index,
+        )
+
+    monkeypatch.setattr(HistoricalDataManager, "_fetch_chunk", fake_fetch)
+    day = pd.Timestamp("2024-01-01")
+
+    def cfg(timeframe, hours):
+        return OHLCVConfig(
+            symbol="BTC_USDT", timeframe=timeframe, base_timeframe="1m", cache_dir=tmp_path,
+            start=day.to_pydatetime(), end=(day + pd.Timedelta(hours=hours, seconds=-1)).to_pydatetime(),
+        )
+
+    async with aiohttp.ClientSession() as session:
+        mgr = HistoricalDataManager(session)
+        hourly = await mgr.fetch_ohlcv(cfg("1h", 6))
+        base = await mgr.fetch_ohlcv(OHLCVConfig(
+            symbol="BTC_USDT", timeframe="1m", cache_dir=tmp_path,
+            start=day.to_pydatetime(), end=(day + pd.Timedelta(hours=6, seconds=-1)).to_pydatetime(),
+        ))
+        expected = base.resample("1h").agg(
+            {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+        )
+        pd.testing.assert_frame_equal(hourly, expected, check_freq=False)
+        assert {c[0] for c in calls} == {"1m"}
+
+        # Other timeframes and repeated requests reuse the cached base bars
+        calls.clear()
+        five = await mgr.fetch_ohlcv(cfg("5m", 6))
+        assert len(five) == 72 and calls == []
+        pd.testing.assert_frame_equal(await mgr.fetch_ohlcv(cfg("1h", 6)), hourly)
+        assert calls == []
+
+        # Growing the range only downloads and aggregates the new hours
+        longer = await mgr.fetch_ohlcv(cfg("1h", 8))
+        assert [(lo, hi) for _, lo, hi in calls] == [
+            (int((day + pd.Timedelta(hours=6)).timestamp()), int((day + pd.Timedelta(hours=8)).timestamp()) - 1)
+        ]
+        pd.testing.assert_frame_equal(longer.iloc[:6], hourly)
+        assert len(longer) == 8
+
+        with pytest.raises(ValueError):
+            await mgr.fetch_ohlcv(OHLCVConfig(
+                symbol="BTC_USDT", timeframe="1h", base_timeframe="7m", cache_dir=tmp_path
+            ))
+
+    wednesday = int(pd.Timestamp("2024-01-03 12:00").timestamp())
+    assert bar_start(wednesday, 604800) == int(pd.Timestamp("2024-01-01").timestamp())
+    assert resample_ohlcv(base, "1w").index.tolist() == [pd.Timestamp("2024-01-01")]
+
+
+@pytest.mark.asyncio
+async def test_higher_timeframe_bars_wait_for_complete_base_bars(tmp_path, monkeypatch):
+    calls = []
+
+    async def flaky_fetch(self, cfg, start_ts, end_ts):
+        calls.append(start_ts)
+        if len(calls) == 3:
+            return None  # what _fetch_chunk returns on errors
+        index = pd.date_range(
+            pd.Timestamp(start_ts, unit="s").ceil("min"), pd.Timestamp(end_ts, unit="s"), freq="min"
+        )
+        return pd.DataFrame({"close": 1.0, "volume": 1.0}, index=index)
+
+    monkeypatch.setattr(HistoricalDataManager, "_fetch_chunk", flaky_fetch)
+    day = pd.Timestamp("2024-01-01")
+    cfg = OHLCVConfig(
+        symbol="BTC_USDT", timeframe="1h", base_timeframe="1m", limit=90, cache_dir=tmp_path,
+        start=day.to_pydatetime(), end=(day + pd.Timedelta(hours=48, seconds=-1)).to_pydatetime(),
+    )
+
+    async with aiohttp.ClientSession() as session:
+        mgr = HistoricalDataManager(session)
+        # The failed minutes 180-269 drop one hour and cut the next short
+        first = await mgr.fetch_ohlcv(cfg)
+        assert len(first) == 47 and (first["volume"] < 60).sum() == 1
+
+        for _ in range(2):
+            df = await mgr.fetch_ohlcv(cfg)
+            assert len(df) == 48 and (df["volume"] == 60).all()
+        assert len(calls) == 33
+
+
+@pytest.mark.asyncio
+async def test_compact_bars_are_cached_as_float32(tmp_path, monkeypatch):
+    import numpy as np
+
+    calls = []
+
+    async def fake_fetch(self, cfg, start_ts, end_ts):
+        calls.append(cfg.compact)
+        index = pd.date_range(
+            pd.Timestamp(start_ts, unit="s").ceil("h"), pd.Timestamp(end_ts, unit="s"), freq="h"
+        )
+        values = np.linspace(100, 200, len(index)) / 3
+        return pd.DataFrame(
+            {"open": values, "high": values, "low": values, "close": values, "volume": values},
+            index=index,
+        )
+
+    monkeypatch.setattr(HistoricalDataManager, "_fetch_chunk", fake_fetch)
+    day = pd.Timestamp("2024-01-01")
+
+    def cfg(compact):
+        return OHLCVConfig(
+            symbol="BTC_USDT", timeframe="1h", cache_dir=tmp_path, compact=compact,
+            start=day.to_pydatetime(), end=(day + pd.Timedelta(days=2)).to_pydatetime(),
+        )
+
+    async with aiohttp.ClientSession() as session:
+        mgr = HistoricalDataManager(session)
+        full = await mgr.fetch_ohlcv(cfg(False))
+        compact = await mgr.fetch_ohlcv(cfg(True))
+        assert calls == [False, True]
+        assert (compact.dtypes == np.float32).all() and (full.dtypes == np.float64).all()
+        assert compact.index.equals(full.index) and compact.index.dtype == "datetime64[ns]"
+        np.testing.assert_allclose(compact, full, rtol=1e-7)
+
+        # Both caches hit afterwards and keep their own precision
+        pd.testing.assert_frame_equal(await mgr.fetch_ohlcv(cfg(True)), compact, check_freq=False)
+        pd.testing.assert_frame_equal(await mgr.fetch_ohlcv(cfg(False)), full, check_freq=False)
+        assert len(calls) == 2
@@ -0,0 +1,98 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from crypto.strategy import indicators
+from crypto.strategy.indicators import IndicatorCache
+
+
+@pytest.fixture
+def numpy_only(monkeypatch):
+    monkeypatch.setattr(indicators, "talib", None)
+
+
+@pytest.fixture
+def close():
+    rng = np.random.default_rng(5)
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, 5000))))
+
+
+def test_numpy_fallbacks_match_pandas(numpy_only, close):
+    np.testing.assert_allclose(indicators.ewm(close, 0.05), close.ewm(alpha=0.05, adjust=False).mean(), rtol=1e-12)
+    np.testing.assert_allclose(indicators.ema(close, 26), close.ewm(span=26, adjust=False).mean(), rtol=1e-12)
+    np.testing.assert_allclose(indicators.sma(close, 20), close.rolling(20).mean(), rtol=1e-12)
+
+    upper, middle, lower = indicators.bollinger(close, 20, 2.0)
+    std = close.rolling(20).std(ddof=0)
+    np.testing.assert_allclose(upper, close.rolling(20).mean() + 2 * std, rtol=1e-10)
+    np.testing.assert_allclose(lower, close.rolling(20).mean() - 2 * std, rtol=1e-10)
+
+    delta = close.diff().fillna(0)
+    gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+    loss = (-delta.clip(upper=0)).ewm(alpha=1 / 14, adjust=False).mean()
+    expected = 100 - 100 / (1 + gain / loss)
+    np.testing.assert_allclose(indicators.rsi(close, 14)[1:], expected[1:], rtol=1e-10)
+
+    high, low = close * 1.01, close * 0.99
+    true_range = pd.concat(
+        [high - low, (high - close.shift()).abs(), (low - close.shift()).abs()], axis=1
+    ).max(axis=1).fillna(high - low)
+    np.testing.assert_allclose(
+        indicators.atr(high, low, close, 14), true_range.ewm(alpha=1 / 14, adjust=False).mean(), rtol=1e-10
+    )
+
+    line, signal, hist = indicators.macd(close)
+    np.testing.assert_allclose(line, close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean(), rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(hist, line - signal)
+
+
+def test_rsi_has_no_nan_without_losses(numpy_only):
+    flat_then_up = np.array([10.0] * 5 + list(range(11, 20)))
+    values = indicators.rsi(flat_then_up, 3)
+    assert not np.isnan(values).any()
+    assert values[4] == 50.0 and values[-1] == 100.0
+
+
+def test_indicators_accept_panels(numpy_only, close):
+    panel = np.column_stack([close, close[::-1], close * 2])
+    for func in (indicators.rsi, indicators.ema, indicators.sma):
+        np.testing.assert_allclose(
+            func(panel, 10), np.column_stack([func(panel[:, i], 10) for i in range(3)]), rtol=1e-12
+        )
+
+
+def test_indicator_cache_memoizes_by_identity_range_and_params(close):
+    cache = IndicatorCache(maxsize=8)
+    values = close.to_numpy()
+
+    first = cache.get(indicators.rsi, values, period=14)
+    assert cache.get(indicators.rsi, close.to_numpy(), period=14) is first
+    assert cache.get(indicators.rsi, values, period=7) is not first
+    assert cache.get(indicators.rsi, values[:100], period=14) is not first
+    assert (cache.hits, cache.misses) == (1, 3)
+    assert not first.flags.writeable
+
+    copy = values.copy()
+    assert cache.get(indicators.rsi, copy, period=14) is not first
+    assert cache.misses == 4
+
+
+def test_indicator_cache_drops_dead_inputs_and_bounds_bytes(close):
+    cache = IndicatorCache(max_bytes=3 * close.nbytes)
+    copy = close.to_numpy().copy()
+    cache.get(indicators.rsi, copy, period=14)
+    assert (len(cache), cache.nbytes) == (1, copy.nbytes)
+    del copy
+    assert (len(cache), cache.nbytes) == (0, 0)
+
+    inputs = [close.to_numpy() + i for i in range(5)]
+    for values in inputs:
+        cache.get(indicators.rsi, values, period=14)
+    assert len(cache) == 3 and cache.nbytes <= cache.max_bytes
+    cache.get(indicators.rsi, inputs[-1], period=14)
+    assert cache.hits == 1
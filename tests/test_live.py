@@ -0,0 +1,121 @@
+import asyncio
+import sys
+import time
+from datetime import timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import pandas as pd
+
+from crypto.live import LiveScheduler, SymbolTrader
+from crypto.risk.manager import RiskConfig, RiskManager
+
+
+def _aligned(tick, interval):
+    return abs(tick - round(tick / interval) * interval) < 1e-6
+
+
+def test_next_tick_follows_bar_boundaries():
+    scheduler = LiveScheduler(["BTC_USDT"], None, timeframe="1m", offset=1.0)
+    assert scheduler.next_tick(120.5) == 121.0
+    assert scheduler.next_tick(121.0) == 181.0
+    assert scheduler.next_tick(119.0) == 121.0
+
+
+@pytest.mark.asyncio
+async def test_scheduler_isolates_symbols_on_one_session():
+    calls = []
+
+    async def handler(symbol, session, tick):
+        calls.append((symbol, session, tick))
+        if symbol == "BAD_USDT":
+            raise RuntimeError("exchange down")
+        if symbol == "SLOW_USDT":
+            await asyncio.sleep(10)
+        return symbol.lower()
+
+    symbols = ["BTC_USDT", "BAD_USDT", "SLOW_USDT", "ETH_USDT"]
+    scheduler = LiveScheduler(symbols, handler, interval=0.2, offset=0.0, symbol_timeout=0.05)
+    await scheduler.run(max_cycles=3)
+
+    assert scheduler.cycles == 3
+    assert len({id(session) for _, session, _ in calls}) == 1
+    assert calls[0][1].closed
+    for report in scheduler.reports:
+        assert _aligned(report.tick, 0.2)
+        assert 0 <= report.lag < 0.1
+        assert report.results == {"BTC_USDT": "btc_usdt", "ETH_USDT": "eth_usdt"}
+        assert isinstance(report.errors["BAD_USDT"], RuntimeError)
+        assert isinstance(report.errors["SLOW_USDT"], asyncio.TimeoutError)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("coalesce", [True, False])
+async def test_late_cycles_do_not_pile_up(coalesce):
+    running = 0
+    overlapped = False
+
+    async def handler(symbol, session, tick):
+        nonlocal running, overlapped
+        running += 1
+        overlapped |= running > 1
+        await asyncio.sleep(0.45)
+        running -= 1
+
+    scheduler = LiveScheduler(["BTC_USDT"], handler, interval=0.2, offset=0.0, coalesce=coalesce)
+    started = time.time()
+    await scheduler.run(max_cycles=3)
+
+    assert not overlapped
+    reports = list(scheduler.reports)
+    assert scheduler.skipped >= 2
+    # Three 0.45 s cycles would need at least seven ticks if they queued up
+    assert time.time() - started < 3 * 0.45 + 4 * 0.2
+    if coalesce:
+        assert all(r.skipped >= 1 for r in reports[1:])
+        assert all(r.lag < 0.2 for r in reports)
+    else:
+        assert all(r.skipped == 0 and r.lag < 0.1 for r in reports)
+
+
+@pytest.mark.asyncio
+async def test_trader_holds_one_position_per_symbol(tmp_path):
+    orders, ends = [], []
+    signals = iter(["sell", "buy", "buy", "hold", "sell", "sell", "buy"])
+
+    class History:
+        async def fetch_ohlcv(self, cfg):
+            ends.append(cfg.end)
+            return pd.DataFrame({"close": [100.0] * 20})
+
+    class Execution:
+        async def create_order(self, symbol, side, amount):
+            orders.append((symbol, side, amount))
+            return SimpleNamespace(order={"id": len(orders)}, latency=0.0)
+
+    engine = SimpleNamespace(
+        config=SimpleNamespace(rsi_period=14),
+        generate_signals=lambda df, score: {"signal": next(signals)},
+    )
+    trader = SymbolTrader(
+        engine, RiskManager(RiskConfig()), timeframe="1h",
+        execution=Execution(), balance=1000.0, cache_dir=tmp_path,
+    )
+    session = object()
+    trader._bind(session)
+    trader.history = History()
+
+    for _ in range(7):
+        await trader("BTC_USDT", session, 7200.5)
+
+    assert orders == [
+        ("BTC/USDT", "buy", 0.5),
+        ("BTC/USDT", "sell", 0.5),
+        ("BTC/USDT", "buy", 0.5),
+    ]
+    assert trader.positions == {"BTC_USDT": 0.5}
+    assert ends[0].tzinfo is timezone.utc and ends[0].timestamp() == 7199
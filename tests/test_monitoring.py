@@ -0,0 +1,135 @@
+import os
+import subprocess
+import sys
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from crypto.monitoring import metrics
+from crypto.strategy.engine import StrategyConfig, StrategyEngine
+
+
+def _count(operation, status="ok"):
+    if metrics.REGISTRY is None:
+        return 0.0
+    value = metrics.REGISTRY.get_sample_value(
+        "crypto_operation_total", {"operation": operation, "status": status}
+    )
+    return value or 0.0
+
+
+@pytest.fixture
+def recording():
+    metrics.enable()
+    yield
+    metrics.disable()
+
+
+def test_timed_records_only_when_enabled():
+    df = pd.DataFrame({"close": np.linspace(100, 110, 50)})
+    engine = StrategyEngine(StrategyConfig())
+    before = _count("strategy.generate_signals")
+
+    engine.generate_signals(df, 75.0)
+    assert _count("strategy.generate_signals") == before
+
+    metrics.enable()
+    try:
+        engine.generate_signals(df, 75.0)
+        with pytest.raises(KeyError):
+            engine.generate_signals(df.rename(columns={"close": "price"}), 75.0)
+    finally:
+        metrics.disable()
+    assert _count("strategy.generate_signals") == before + 1
+    assert _count("strategy.generate_signals", "error") >= 1
+
+
+def test_instrumented_modules_load_prometheus_only_when_enabled():
+    code = (
+        "import sys; import crypto.strategy.engine, crypto.backtesting.service, crypto.data.history; "
+        "assert 'prometheus_client' not in sys.modules; "
+        "from crypto.monitoring import metrics; metrics.enable(); "
+        "assert 'prometheus_client' in sys.modules"
+    )
+    src = str(Path(__file__).resolve().parents[1] / "src")
+    subprocess.run([sys.executable, "-c", code], check=True, env=dict(os.environ, PYTHONPATH=src))
+
+
+def test_metrics_endpoint_serves_histograms(recording):
+    with metrics.track("test.block"):
+        pass
+    server, thread = metrics.start_metrics_server(port=0)
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/metrics"
+        body = urllib.request.urlopen(url, timeout=5).read().decode()
+    finally:
+        server.shutdown()
+    assert 'crypto_operation_seconds_count{operation="test.block"} 1.0' in body
+
+
+@pytest.fixture
+def sinks():
+    from crypto.monitoring.monitor import close_sinks
+
+    yield
+    close_sinks()
+
+
+def test_monitor_writes_json_in_background(tmp_path, sinks):
+    import json
+    from crypto.monitoring.monitor import Monitor
+
+    monitor = Monitor(tmp_path / "trading.log", history=3)
+    assert Monitor(tmp_path / "trading.log").sink is monitor.sink
+
+    monitor.info("started")
+    for i in range(5):
+        monitor.signal("BTC_USDT", {"signal": "buy", "rsi": 20.0 + i})
+    monitor.order("BTC_USDT", "buy", 0.5, id="42")
+    monitor.flush()
+
+    lines = [json.loads(line) for line in (tmp_path / "trading.log").read_text().splitlines()]
+    # One sink however many monitors were created, so no line is repeated
+    assert [l["message"] for l in lines].count("started") == 1
+    assert lines[-1]["extra"]["event"] == "order" and lines[-1]["extra"]["data"]["id"] == "42"
+    assert sum(l.get("extra", {}).get("event") == "signal" for l in lines) == 5
+
+    events = monitor.recent()
+    assert len(events) == 3 and events[-1].kind == "order"
+    assert [e.data["rsi"] for e in monitor.recent("signal")] == [23.0, 24.0]
+    assert monitor.recent("signal", symbol="ETH_USDT") == []
+
+
+def test_full_queue_drops_records_without_blocking(tmp_path, sinks, monkeypatch):
+    import threading
+    import time
+    from crypto.monitoring.monitor import JSONLogSink, Monitor
+
+    release = threading.Event()
+    write = JSONLogSink._write
+
+    def slow_write(self, records):
+        release.wait(5)  # a stalled disk
+        write(self, records)
+
+    monkeypatch.setattr(JSONLogSink, "_write", slow_write)
+    monitor = Monitor(tmp_path / "trading.log", max_queue=10)
+
+    durations = []
+    for i in range(200):
+        started = time.perf_counter()
+        monitor.signal("BTC_USDT", {"signal": "sell", "rsi": 80.0})
+        durations.append(time.perf_counter() - started)
+    assert np.median(durations) < 0.001
+    assert monitor.dropped >= 200 - 11
+    assert len(monitor.recent()) == 200
+
+    release.set()
+    monitor.flush()
+    text = (tmp_path / "trading.log").read_text()
+    assert f"{monitor.dropped} log records dropped" in text
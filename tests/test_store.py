@@ -0,0 +1,63 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from crypto.data.social import GalaxyScoreStore
+from crypto.data.store import PartitionedOHLCVStore
+
+
+def _bars(start, periods):
+    index = pd.date_range(start, periods=periods, freq="D", name="timestamp")
+    return pd.DataFrame({"close": range(periods)}, index=index, dtype=float)
+
+
+def test_partitioned_store_writes_only_touched_months(tmp_path):
+    store = PartitionedOHLCVStore(tmp_path, "BTC_USDT", "1d")
+    store.write(_bars("2024-01-01", 70))
+    assert [p.name for p in store.partitions()] == ["2024-01.parquet", "2024-02.parquet", "2024-03.parquet"]
+
+    january = store.partitions()[0].stat().st_mtime_ns
+    store.write(_bars("2024-03-01", 10).assign(close=-1.0))
+    assert store.partitions()[0].stat().st_mtime_ns == january
+
+    df = store.read(pd.Timestamp("2024-02-28"), pd.Timestamp("2024-03-02"))
+    assert list(df.index.strftime("%m-%d")) == ["02-28", "02-29", "03-01", "03-02"]
+    assert (df.loc["2024-03"]["close"] == -1.0).all()
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_partitioned_store_migrates_single_file_cache(tmp_path):
+    legacy = _bars("2024-01-30", 5)
+    legacy.to_parquet(tmp_path / "BTC_USDT_1d.parquet")
+
+    store = PartitionedOHLCVStore(tmp_path, "BTC_USDT", "1d")
+
+    assert not (tmp_path / "BTC_USDT_1d.parquet").exists()
+    pd.testing.assert_frame_equal(store.read(), legacy, check_freq=False)
+    assert store.load_coverage() == [
+        (int(legacy.index[0].timestamp()), int(legacy.index[-1].timestamp()))
+    ]
+
+
+def test_galaxy_score_store_records_responses(tmp_path):
+    store = GalaxyScoreStore(tmp_path, "BTC_USDT")
+    assert store.read().empty
+
+    day = int(pd.Timestamp("2024-01-01").timestamp())
+    store.record({"data": [{"galaxy_score": 60, "timeSeries": [
+        {"time": day + h * 3600, "galaxy_score": 50 + h} for h in range(5)
+    ]}]})
+    store.record({"data": [{"galaxy_score": 71, "time": day + 4 * 3600}]})
+    store.record({"data": [{"galaxy_score": 72}]}, at=pd.Timestamp("2024-01-02", tz="UTC"))
+    store.record({"data": []})
+
+    series = store.read()
+    assert series.tolist() == [50, 51, 52, 53, 71, 72]
+    assert series.index.is_monotonic_increasing and series.index.name == "timestamp"
+    # The observation in force at ``start`` is kept for the as-of join
+    window = store.read(pd.Timestamp("2024-01-01 02:30"), pd.Timestamp("2024-01-01 04:00"))
+    assert window.tolist() == [52, 53, 71]
+    assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,73 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from crypto.data.stream import BarAggregator
+from crypto.strategy.engine import (
+    IncrementalStrategyEngine,
+    StrategyConfig,
+    StrategyEngine,
+    align_galaxy_score,
+)
+
+
+def test_incremental_engine_matches_batch():
+    rng = np.random.default_rng(1)
+    n = 400
+    prices = 100 + 8 * np.sin(np.arange(n) / 12) + np.cumsum(rng.normal(0, 0.4, n))
+    df = pd.DataFrame({"close": prices}, index=pd.date_range("2024-01-01", periods=n, freq="min"))
+    config = StrategyConfig(rsi_period=14, galaxy_score_threshold=70)
+
+    batch = StrategyEngine(config).generate_signal_series(df, 75.0)
+    engine = IncrementalStrategyEngine(config).seed(df.iloc[:50])
+    for i in range(50, n):
+        out = engine.update(df.iloc[i], 75.0)
+        assert np.isclose(out["rsi"], batch["rsi"].iloc[i], rtol=1e-9, atol=1e-9)
+        assert out["signal"] == batch["signal"].iloc[i]
+
+
+def test_incremental_engine_consumes_stream_bars():
+    rng = np.random.default_rng(3)
+    prices = 100 + 8 * np.sin(np.arange(3000) / 90) + np.cumsum(rng.normal(0, 0.1, 3000))
+    aggregator = BarAggregator(60)
+    bars = [aggregator.add_trade("BTC_USDT", 1_700_000_040 + 5 * i, p, 1.0) for i, p in enumerate(prices)]
+    bars = [b for b in bars if b is not None]
+    df = pd.DataFrame({"close": [b.close for b in bars]})
+
+    batch = StrategyEngine(StrategyConfig()).generate_signal_series(df, 75.0)
+    engine = IncrementalStrategyEngine(StrategyConfig()).seed(df.iloc[:20])
+    for i, bar in enumerate(bars[20:], start=20):
+        out = engine.update(bar, 75.0)
+        assert np.isclose(out["rsi"], batch["rsi"].iloc[i], rtol=1e-9, atol=1e-9)
+        assert out["signal"] == batch["signal"].iloc[i]
+
+
+def test_galaxy_score_as_of_join_matches_pandas():
+    import time
+
+    rng = np.random.default_rng(2)
+    bars = pd.date_range("2024-01-01", periods=1_000_000, freq="min")
+    stamps = np.sort(rng.choice(bars.asi8 + 17 * 10**9, 5000, replace=False))
+    scores = pd.Series(rng.uniform(0, 100, 5000), index=pd.DatetimeIndex(stamps))
+
+    started = time.perf_counter()
+    aligned = align_galaxy_score(scores, bars)
+    elapsed = time.perf_counter() - started
+
+    expected = pd.merge_asof(
+        pd.DataFrame(index=bars), scores.rename("score").to_frame(),
+        left_index=True, right_index=True,
+    )["score"].fillna(0.0)
+    np.testing.assert_array_equal(aligned, expected.to_numpy())
+    # Observations stamped mid-bar only count from the next bar
+    assert aligned[0] == 0.0
+    assert elapsed < 0.5
+
+    # Unsorted and tz-aware observations align the same way
+    shuffled = scores.sample(frac=1, random_state=0).tz_localize("UTC")
+    np.testing.assert_array_equal(align_galaxy_score(shuffled, bars[:1000]), aligned[:1000])
+    assert align_galaxy_score(80, bars) == 80.0
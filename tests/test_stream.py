@@ -0,0 +1,110 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+import websockets
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from crypto.data.stream import MarketDataStream
+
+START = 1_700_000_040  # minute aligned
+
+
+def _recorded_trades(markets, seconds):
+    rng = np.random.default_rng(0)
+    messages, trades = [], []
+    for offset in range(0, seconds, 5):
+        for market in markets:
+            batch = [
+                {
+                    "id": len(trades) + i,
+                    "time": START + offset + i + 0.25,
+                    "price": f"{100 + rng.normal():.4f}",
+                    "amount": f"{rng.uniform(0.1, 2):.4f}",
+                    "type": "buy",
+                }
+                for i in range(5)
+            ]
+            trades += [dict(t, market=market) for t in batch]
+            # WhiteBIT sends the newest trade first
+            messages.append(json.dumps({"id": None, "method": "trades_update", "params": [market, batch[::-1]]}))
+    return messages, pd.DataFrame(trades)
+
+
+@pytest.mark.asyncio
+async def test_stream_aggregates_bars_and_reconnects():
+    markets = ["BTC_USDT", "ETH_USDT"]
+    messages, trades = _recorded_trades(markets, 600)
+    subscriptions = []
+
+    async def replay(ws):
+        subscriptions.append(json.loads(await ws.recv()))
+        half = len(messages) // 2
+        if len(subscriptions) == 1:
+            for msg in messages[:half]:
+                await ws.send(msg)
+            return  # drop the connection mid-stream
+        for msg in messages[half:]:
+            await ws.send(msg)
+        await ws.wait_closed()
+
+    async with websockets.serve(replay, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        stream = MarketDataStream(
+            markets, url=f"ws://127.0.0.1:{port}", queue_maxsize=4, reconnect_delay=0.01
+        )
+        task = asyncio.create_task(stream.run())
+        bars = []
+        async with asyncio.timeout(10):
+            while len(bars) < 18:
+                bars.append(await stream.queue.get())
+        stream.stop()
+        task.cancel()
+
+    assert stream.reconnects >= 1
+    assert [s["method"] for s in subscriptions] == ["trades_subscribe"] * 2
+    trades["ts"] = pd.to_datetime(trades["time"].astype(int), unit="s")
+    trades[["price", "amount"]] = trades[["price", "amount"]].astype(float)
+    for market in markets:
+        expected = trades[trades.market == market].set_index("ts").resample("1min").agg(
+            {"price": ["first", "max", "min", "last"], "amount": "sum"}
+        ).iloc[:9]
+        got = [b for b in bars if b.market == market]
+        assert [b.start for b in got] == list(range(START, START + 540, 60))
+        np.testing.assert_allclose(
+            [[b.open, b.high, b.low, b.close, b.volume] for b in got], expected.to_numpy()
+        )
+
+
+@pytest.mark.asyncio
+async def test_stream_skips_malformed_messages_and_survives_protocol_errors():
+    messages, _ = _recorded_trades(["BTC_USDT"], 180)
+    bad = ["not json", json.dumps({"method": "trades_update", "params": ["BTC_USDT", [{"time": 1}]]})]
+    connections = []
+
+    async def replay(ws):
+        connections.append(await ws.recv())
+        if len(connections) == 1:
+            await ws.close(code=1002)  # protocol error
+            return
+        for msg in bad + messages:
+            await ws.send(msg)
+        await ws.wait_closed()
+
+    async with websockets.serve(replay, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        stream = MarketDataStream(["BTC_USDT"], url=f"ws://127.0.0.1:{port}", reconnect_delay=0.01)
+        task = asyncio.create_task(stream.run())
+        async with asyncio.timeout(10):
+            bars = [await stream.queue.get() for _ in range(2)]
+        stream.stop()
+        task.cancel()
+
+    assert stream.reconnects >= 1
+    assert stream.malformed == 2
+    assert [b.start for b in bars] == [START, START + 60]